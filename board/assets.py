@@ -0,0 +1,87 @@
+import posixpath
+import re
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+
+# 페이지마다 CSS 하나, JS 하나만 받도록 vendor 파일과 사이트 CSS를 묶은 번들.
+# build_assets 명령으로 board/static 아래에 만들어 커밋해 두고, collectstatic이 해시 이름과 .gz/.br을 만듦
+BUNDLES = {
+    'board/dist/site.css': [
+        'board/bootstrap/bootstrap.min.css',
+        'board/vendor/fontawesome/css/all.min.css',
+        'single_pages/css/about_site.css',
+        'single_pages/css/landing.css',
+    ],
+    'board/dist/site.js': [
+        'board/vendor/jquery/jquery.slim.min.js',
+        # Popper가 들어 있는 번들 (bootstrap 4.5.3)
+        'board/vendor/bootstrap/bootstrap.bundle.min.js',
+    ],
+}
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+SOURCE_MAP_RE = re.compile(r'/\*# sourceMappingURL=[^*]*\*/|^//# sourceMappingURL=.*$', re.MULTILINE)
+
+
+def find_source(path):
+    found = finders.find(path)
+    if not found:
+        raise ImproperlyConfigured(f'번들에 넣을 static 파일이 없습니다: {path}')
+    return found
+
+
+def is_relative_url(url):
+    return not url.startswith(('/', '#', 'data:', 'http:', 'https:'))
+
+
+def rewrite_css_urls(content, source, target):
+    # 원래 파일 기준의 상대 경로를 번들 파일 기준으로 바꿈 (collectstatic이 해시 이름으로 다시 바꿈)
+    def rewrite(match):
+        quote, url = match.groups()
+        if not is_relative_url(url):
+            return match.group(0)
+        path, suffix = re.match(r'([^?#]*)(.*)', url).groups()
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+        return f'url({quote}{posixpath.relpath(resolved, posixpath.dirname(target))}{suffix}{quote})'
+    return CSS_URL_RE.sub(rewrite, content)
+
+
+def build_bundle(name):
+    # 소스 맵은 원래 파일 기준이라 번들에서는 맞지 않으므로 뺌
+    parts = []
+    for source in BUNDLES[name]:
+        with open(find_source(source), encoding='utf-8') as f:
+            content = SOURCE_MAP_RE.sub('', f.read()).strip()
+        if name.endswith('.css'):
+            content = rewrite_css_urls(content, source, name)
+        else:
+            # 세미콜론 없이 끝나는 파일이 다음 파일과 붙지 않게 함
+            content += ';'
+        parts.append(f'/* {source} */\n{content}\n')
+    return '\n'.join(parts)
+
+
+def bundle_path(name):
+    return STATIC_DIR / name
+
+
+def outdated_bundles():
+    # 커밋된 번들이 소스와 다른 것들
+    outdated = []
+    for name in BUNDLES:
+        path = bundle_path(name)
+        if not path.exists() or path.read_text(encoding='utf-8') != build_bundle(name):
+            outdated.append(name)
+    return outdated
+
+
+def write_bundles():
+    for name in BUNDLES:
+        path = bundle_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(build_bundle(name), encoding='utf-8')
+    return list(BUNDLES)
@@ -0,0 +1,78 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.shortcuts import render
+
+from . import pages
+from .caching import cache_anonymous_page, board_page_condition, post_page_condition
+from .pages import render_page, run_all
+
+
+def run_in_own_connection(func):
+    # 워커 스레드에서 연 DB 연결은 요청이 끝나도 닫히지 않으므로 직접 닫음
+    try:
+        return func()
+    finally:
+        connections.close_all()
+
+
+def parallel_queries_enabled():
+    # 조회마다 스레드와 DB 연결을 따로 쓰는 것은 PostgreSQL에서만 의미가 있음.
+    # SQLite는 같은 프로세스 안에서 동시에 읽어도 빨라지지 않고 스레드 전환 비용만 늘어남
+    return getattr(settings, 'BOARD_ASYNC_PARALLEL_QUERIES', False) and connections['default'].vendor == 'postgresql'
+
+
+async def gather_queries(*funcs):
+    # 서로 관계없는 조회를 실행하고 결과를 순서대로 돌려줌.
+    # Django 3.2에는 async ORM이 없어서 sync_to_async로 감쌈. 병렬 모드가 아니면 sync 스레드로 한 번만 넘어가
+    # 차례로 실행함 (조회마다 넘어가면 매번 다른 요청의 작업 뒤에 줄을 서서 지연 시간이 늘어남)
+    if parallel_queries_enabled():
+        calls = [sync_to_async(run_in_own_connection, thread_sensitive=False)(func) for func in funcs]
+        return await asyncio.gather(*calls)
+    return await sync_to_async(run_all)(funcs)
+
+
+async def render_gathered(request, page):
+    # pages.Page를 async로 렌더링함. 병렬 모드가 아니면 조회와 렌더링을 sync 스레드에 한 번 넘어가서 함
+    if parallel_queries_enabled():
+        results = await gather_queries(*page.queries)
+        return await sync_to_async(render)(request, page.template_name, page.make_context(*results))
+    return await sync_to_async(render_page)(request, page)
+
+
+def page_view(sync_view, async_view):
+    # urls.py에서 읽기 페이지에 연결할 뷰. ASGI 서버(asgi.py가 BOARD_ASYNC_VIEWS를 켬)에서는 async 뷰
+    return async_view if settings.BOARD_ASYNC_VIEWS else sync_view
+
+
+# ASGI용 async 뷰. 조회와 컨텍스트는 sync 뷰(views.py)와 같은 pages.py의 것을 씀
+@board_page_condition
+@cache_anonymous_page
+async def post_list(request):
+    return await render_gathered(request, pages.post_list_page(request))
+
+
+@board_page_condition
+@cache_anonymous_page
+async def category_page(request, slug):
+    return await render_gathered(request, pages.category_page(request, slug))
+
+
+@board_page_condition
+@cache_anonymous_page
+async def tag_page(request, slug):
+    return await render_gathered(request, pages.tag_page(request, slug))
+
+
+@post_page_condition
+@cache_anonymous_page
+async def post_detail(request, pk):
+    return await render_gathered(request, pages.post_detail_page(request, pk))
+
+
+@board_page_condition
+@cache_anonymous_page
+async def post_search(request, q):
+    return await render_gathered(request, pages.search_page(request, q))
@@ -0,0 +1,72 @@
+import hashlib
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.utils.html import escape
+
+AVATAR_CACHE_KEY = 'board:avatar:{}'
+AVATAR_CACHE_TIMEOUT = 60 * 60 * 24
+
+AVATAR_COLORS = ['#007bff', '#6610f2', '#e83e8c', '#fd7e14', '#28a745', '#20c997', '#17a2b8', '#6c757d']
+
+
+def default_avatar_url(username):
+    # 외부 placeholder 서버 대신 이니셜이 들어간 SVG를 data URI로 만듦
+    username = username or '?'
+    digest = hashlib.md5(username.encode('utf-8')).digest()
+    color = AVATAR_COLORS[digest[0] % len(AVATAR_COLORS)]
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="50" height="50" viewBox="0 0 50 50">'
+        f'<rect width="50" height="50" fill="{color}"/>'
+        '<text x="50%" y="50%" dy=".35em" text-anchor="middle" font-family="sans-serif" '
+        f'font-size="24" fill="#fff">{escape(username[0].upper())}</text>'
+        '</svg>'
+    )
+    return 'data:image/svg+xml;charset=utf-8,' + quote(svg)
+
+
+def resolve_avatar_url(user):
+    # socialaccount_set이 prefetch 되어 있으면 추가 쿼리 없음
+    for account in user.socialaccount_set.all():
+        url = account.get_avatar_url()
+        if url:
+            return url
+    return default_avatar_url(user.username)
+
+
+def prefetch_avatar_urls(users):
+    # 페이지에 나오는 작성자들의 아바타를 캐시에서 한 번에 읽고,
+    # 캐시에 없는 사용자만 socialaccount_set을 한 번에 prefetch 함
+    users = [user for user in users if user is not None and not hasattr(user, '_avatar_url')]
+    if not users:
+        return
+
+    keys = {user.pk: AVATAR_CACHE_KEY.format(user.pk) for user in users}
+    cached = cache.get_many(list(keys.values()))
+
+    missing = [user for user in users if keys[user.pk] not in cached]
+    if missing:
+        prefetch_related_objects(missing, 'socialaccount_set')
+
+    resolved = {}
+    for user in users:
+        if keys[user.pk] in cached:
+            user._avatar_url = cached[keys[user.pk]]
+        else:
+            user._avatar_url = resolve_avatar_url(user)
+            resolved[keys[user.pk]] = user._avatar_url
+
+    if resolved:
+        cache.set_many(resolved, AVATAR_CACHE_TIMEOUT)
+
+
+def get_avatar_url(user):
+    if user is None:
+        return default_avatar_url(None)
+    prefetch_avatar_urls([user])
+    return user._avatar_url
+
+
+def invalidate_avatar_url(user_id):
+    cache.delete(AVATAR_CACHE_KEY.format(user_id))
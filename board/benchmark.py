@@ -0,0 +1,288 @@
+import json
+import platform
+import random
+import re
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, reset_queries, transaction
+from django.db.models import Count, Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .caching import bump_board_version
+from .models import Post, Category, Tag, Comment
+from .pagination import encode_cursor
+from .search import get_search_backend
+
+# scale=1 일 때의 데이터 양
+VOLUMES = {
+    'users': 200,
+    'categories': 30,
+    'tags': 500,
+    'posts': 10000,
+    'comments': 100000,
+}
+
+WORDS = [
+    '풋살', '경기', '팀원', '모집', '구장', '예약', '주말', '저녁', '골키퍼', '수비',
+    '공격', '패스', '슈팅', '리그', '친선전', 'futsal', 'match', 'team', 'league', 'goal',
+]
+
+# 시간/메모리는 작은 값에서 흔들림이 크므로 비율과 함께 최소 차이도 넘어야 회귀로 봄
+MIN_TIME_DIFF_MS = 5
+MIN_MEMORY_DIFF_KB = 64
+
+TIME_METRICS = ('time_ms', 'template_ms', 'warm_time_ms', 'warm_template_ms')
+
+
+def scaled(scale):
+    return {name: max(int(count * scale), 1) for name, count in VOLUMES.items()}
+
+
+def make_content(rng, words):
+    paragraphs = []
+    for _ in range(rng.randint(1, 4)):
+        paragraphs.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, words))))
+    return '## ' + rng.choice(WORDS) + '\n\n' + '\n\n'.join(paragraphs)
+
+
+def seed(scale=1.0, random_seed=0):
+    # bulk_create로 빠르게 넣고, save()에서 하던 Markdown 렌더링과 검색 색인은 직접 처리함
+    rng = random.Random(random_seed)
+    volumes = scaled(scale)
+
+    User.objects.bulk_create([
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password='!', is_staff=i == 0)
+        for i in range(volumes['users'])
+    ])
+    user_pks = list(User.objects.filter(username__startswith='bench').values_list('pk', flat=True))
+
+    Category.objects.bulk_create([
+        Category(name=f'category {i}', slug=f'category-{i}') for i in range(volumes['categories'])
+    ])
+    category_pks = list(Category.objects.filter(slug__startswith='category-').values_list('pk', flat=True))
+
+    Tag.objects.bulk_create([Tag(name=f'tag {i}', slug=f'tag-{i}') for i in range(volumes['tags'])])
+    tag_pks = list(Tag.objects.filter(slug__startswith='tag-').values_list('pk', flat=True))
+
+    # 같은 본문을 여러 포스트가 나눠 쓰도록 미리 렌더링 (렌더링 시간을 줄이기 위함)
+    templates = []
+    for _ in range(50):
+        post = Post(content=make_content(rng, 80))
+        post.render_markdown()
+        templates.append(post)
+
+    posts = []
+    for i in range(volumes['posts']):
+        template = rng.choice(templates)
+        posts.append(Post(
+            title=f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}'[:30],
+            hook_text=' '.join(rng.choice(WORDS) for _ in range(5)),
+            content=template.content,
+            content_html=template.content_html,
+            excerpt_html=template.excerpt_html,
+            content_hash=template.content_hash,
+            author_id=rng.choice(user_pks),
+            category_id=rng.choice(category_pks) if rng.random() > 0.1 else None,
+        ))
+    last_pk = Post.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+    Post.objects.bulk_create(posts, batch_size=500)
+    post_pks = list(Post.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+
+    PostTag = Post.tags.through
+    links = []
+    for pk in post_pks:
+        for tag_pk in rng.sample(tag_pks, rng.randint(0, min(4, len(tag_pks)))):
+            links.append(PostTag(post_id=pk, tag_id=tag_pk))
+    PostTag.objects.bulk_create(links, batch_size=1000)
+
+    # 댓글은 일부 포스트에 몰리도록 (인기 글)
+    hot = post_pks[-max(len(post_pks) // 100, 1):]
+    comments = []
+    for i in range(volumes['comments']):
+        pk = rng.choice(hot) if rng.random() < 0.3 else rng.choice(post_pks)
+        comments.append(Comment(
+            post_id=pk,
+            author_id=rng.choice(user_pks),
+            content=' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))),
+        ))
+    Comment.objects.bulk_create(comments, batch_size=1000)
+
+    # 첨부파일 다운로드 측정용
+    post = Post.objects.get(pk=post_pks[-1])
+    post.file_upload.save('benchmark.txt', ContentFile(b'benchmark\n' * 10000), save=False)
+    Post.objects.filter(pk=post.pk).update(file_upload=post.file_upload.name)
+
+    get_search_backend().rebuild()
+    return volumes
+
+
+def get_targets():
+    # (이름, method, url, data, 요청하는 사용자) - board/urls.py, single_pages/urls.py의 모든 URL
+    # 사용자: None(비로그인), 'staff', 'author'(post 작성자), 'commenter'(comment 작성자)
+    post = Post.objects.annotate(comment_count=Count('comment')).order_by('-comment_count').first()
+    comment = post.comment_set.order_by('created_at', 'pk').first()
+    category = Category.objects.annotate(post_count=Count('post')).order_by('-post_count').first()
+    tag = Tag.objects.annotate(post_count=Count('post')).order_by('-post_count').first()
+    attachment = Post.objects.exclude(file_upload='').only('pk').first()
+    middle = Post.objects.order_by('-pk').values_list('pk', flat=True)[Post.objects.count() // 2]
+
+    targets = [
+        ('landing', 'get', '/', None, None),
+        ('about_site', 'get', '/about_site/', None, None),
+        ('matches', 'get', '/matches/', None, None),
+        ('post_list', 'get', '/board/', None, None),
+        ('post_list_cursor', 'get', f'/board/?after={encode_cursor(middle)}', None, None),
+        ('post_list_logged_in', 'get', '/board/', None, 'author'),
+        ('post_detail', 'get', f'/board/{post.pk}/', None, None),
+        ('comment_page', 'get', f'/board/{post.pk}/comments/', None, None),
+        ('category_page', 'get', f'/board/category/{category.slug}/', None, None),
+        ('no_category_page', 'get', '/board/category/no_category/', None, None),
+        ('tag_page', 'get', f'/board/tag/{tag.slug}/', None, None),
+        ('search', 'get', '/board/search/풋살/', None, None),
+        ('feed', 'get', '/board/feed/atom/', None, None),
+        ('tag_feed', 'get', f'/board/tag/{tag.slug}/feed/json/', None, None),
+        ('download_file', 'get', f'/board/{attachment.pk}/download/', None, None),
+        ('create_post', 'get', '/board/create_post/', None, 'staff'),
+        ('update_post', 'get', f'/board/update_post/{post.pk}/', None, 'author'),
+        ('new_comment', 'post', f'/board/{post.pk}/new_comment/', {'content': 'benchmark'}, 'author'),
+        ('update_comment', 'get', f'/board/update_comment/{comment.pk}/', None, 'commenter'),
+        ('delete_comment', 'get', f'/board/delete_comment/{comment.pk}/', None, 'commenter'),
+    ]
+    users = {
+        'staff': User.objects.filter(is_staff=True).first(),
+        'author': post.author,
+        'commenter': comment.author,
+    }
+    return targets, users
+
+
+def request(client, method, url, data):
+    response = getattr(client, method)(url, data) if data else getattr(client, method)(url)
+    if getattr(response, 'streaming', False):
+        b''.join(response.streaming_content)
+    return response
+
+
+def template_ms(response):
+    # PerformanceMiddleware가 붙인 Server-Timing의 템플릿 렌더링 시간
+    match = re.search(r'tpl;dur=([\d.]+)', response.get('Server-Timing', ''))
+    return float(match.group(1)) if match else 0.0
+
+
+def measure(client, method, url, data, repeat):
+    # 매번 캐시를 비운 상태(cold)에서 실행하고, 쓰기 요청도 되돌림.
+    # 첫 실행은 버리고 시간은 가장 빠른 값을 씀 (다른 프로세스의 영향이 가장 적은 값)
+    times = []
+    template_times = []
+    queries = status = None
+    for _ in range(repeat + 1):
+        cache.clear()
+        # 쿼리 로그가 가득 차 있으면(9000개) CaptureQueriesContext가 새 쿼리를 세지 못함
+        reset_queries()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = request(client, method, url, data)
+                times.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+        template_times.append(template_ms(response))
+        queries = len(context.captured_queries)
+        status = response.status_code
+
+    # 글이 바뀐 직후처럼 페이지 캐시만 비우고 포스트 카드/댓글 fragment 캐시는 남겨 둔 상태(warm)
+    warm_times = []
+    warm_template_times = []
+    for _ in range(repeat):
+        bump_board_version()
+        reset_queries()
+        with transaction.atomic():
+            start = time.perf_counter()
+            response = request(client, method, url, data)
+            warm_times.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+        warm_template_times.append(template_ms(response))
+
+    # tracemalloc은 실행을 느리게 하므로 메모리는 따로 한 번 잼
+    cache.clear()
+    with transaction.atomic():
+        tracemalloc.start()
+        try:
+            request(client, method, url, data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        transaction.set_rollback(True)
+
+    return {
+        'url': url,
+        'status': status,
+        'queries': queries,
+        'time_ms': round(min(times[1:]), 2),
+        'template_ms': round(min(template_times[1:]), 2),
+        'warm_time_ms': round(min(warm_times), 2),
+        'warm_template_ms': round(min(warm_template_times), 2),
+        'memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run(repeat=5, only=None):
+    targets, users = get_targets()
+    clients = {None: Client()}
+    for role, user in users.items():
+        clients[role] = Client()
+        clients[role].force_login(user)
+
+    results = {}
+    for name, method, url, data, role in targets:
+        if only and name not in only:
+            continue
+        results[name] = measure(clients[role], method, url, data, repeat)
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def compare(baseline, results, threshold):
+    # 쿼리 수는 하나라도 늘면, 시간(전체/템플릿, cold/warm)/메모리는 threshold(비율) 이상 늘면 회귀
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['queries'] > base['queries']:
+            regressions.append((name, 'queries', base['queries'], result['queries']))
+        for metric in TIME_METRICS:
+            # 예전 기준값에는 템플릿/warm 시간이 없음
+            if metric not in base:
+                continue
+            if (result[metric] > base[metric] * (1 + threshold)
+                    and result[metric] - base[metric] > MIN_TIME_DIFF_MS):
+                regressions.append((name, metric, base[metric], result[metric]))
+        if (result['memory_kb'] > base['memory_kb'] * (1 + threshold)
+                and result['memory_kb'] - base['memory_kb'] > MIN_MEMORY_DIFF_KB):
+            regressions.append((name, 'memory_kb', base['memory_kb'], result['memory_kb']))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, volumes, results):
+    data = {'environment': environment(), 'volumes': volumes, 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
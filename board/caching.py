@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import uuid
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import Post
+
+BOARD_VERSION_KEY = 'board:version'
+# 포스트 카드/댓글 fragment용 버전. 글/댓글마다 바뀌는 board 버전과 달리
+# 여러 fragment에 같이 나오는 값(태그/카테고리 이름, 사용자 이름)이 바뀔 때만 올림
+FRAGMENT_VERSION_KEY = 'board:fragment-version'
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_version(key):
+    # 숫자를 1씩 올리면 캐시가 비워졌을 때 예전 버전과 겹칠 수 있으므로 매번 새 값을 씀
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def get_board_version():
+    return get_version(BOARD_VERSION_KEY)
+
+
+def bump_board_version():
+    bump_version(BOARD_VERSION_KEY)
+
+
+def get_fragment_version():
+    return get_version(FRAGMENT_VERSION_KEY)
+
+
+def bump_fragment_version():
+    bump_version(FRAGMENT_VERSION_KEY)
+
+
+def get_page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+    return f'board:page:{path}'
+
+
+def lookup_cached_page(request):
+    # 캐시할 수 없는 요청이면 None, 아니면 (key, version, 캐시된 응답 또는 None)
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return None
+
+    key = get_page_cache_key(request)
+    version = get_board_version()
+    cached = cache.get(key, version=version)
+    if cached is not None:
+        content, content_type = cached
+        return key, version, HttpResponse(content, content_type=content_type)
+    return key, version, None
+
+
+def store_cached_page(key, version, response):
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        timeout = getattr(settings, 'BOARD_PAGE_CACHE_TIMEOUT', PAGE_CACHE_TIMEOUT)
+        cache.set(key, (response.content, response['Content-Type']), timeout, version=version)
+
+
+def cache_anonymous_page(view_func):
+    # 로그인하지 않은 사용자의 GET 요청은 board 버전별로 전체 페이지를 캐시함
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            lookup = await sync_to_async(lookup_cached_page)(request)
+            if lookup is None:
+                return await view_func(request, *args, **kwargs)
+
+            key, version, cached = lookup
+            if cached is not None:
+                return cached
+            response = await view_func(request, *args, **kwargs)
+            await sync_to_async(store_cached_page)(key, version, response)
+            return response
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        lookup = lookup_cached_page(request)
+        if lookup is None:
+            return view_func(request, *args, **kwargs)
+
+        key, version, cached = lookup
+        if cached is not None:
+            return cached
+        response = view_func(request, *args, **kwargs)
+        store_cached_page(key, version, response)
+        return response
+
+    return wrapper
+
+
+def get_board_etag(request, *args, **kwargs):
+    # 목록 페이지는 board 버전만으로 판단 (쿼리 없음). 로그인 사용자마다 화면이 다르므로 사용자도 포함
+    user = request.user.pk if request.user.is_authenticated else 'anonymous'
+    return f'{get_board_version()}-{user}'
+
+
+def get_post_last_modified(request, pk, *args, **kwargs):
+    # 포스트 수정 시각과 마지막 댓글 수정 시각을 쿼리 한 번으로 가져옴 (요청 안에서 재사용)
+    if not hasattr(request, '_post_last_modified'):
+        rows = Post.objects.filter(pk=pk).values('updated_at').annotate(
+            last_comment_at=Max('comment__modified_at')
+        ).values_list('updated_at', 'last_comment_at')
+        row = next(iter(rows), None)
+        request._post_last_modified = max(t for t in row if t) if row else None
+    return request._post_last_modified
+
+
+def get_post_etag(request, pk, *args, **kwargs):
+    last_modified = get_post_last_modified(request, pk)
+    if last_modified is None:
+        return None
+    return f'{get_board_etag(request)}-{last_modified.timestamp()}'
+
+
+def check_conditions(request, etag_func, last_modified_func, *args, **kwargs):
+    # django.views.decorators.http.condition과 같은 규칙으로 검증값을 계산하고,
+    # 바뀐 것이 없으면 304 응답을 돌려줌
+    etag = etag_func(request, *args, **kwargs) if etag_func else None
+    etag = quote_etag(etag) if etag else None
+    last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return etag, last_modified, request.user.is_authenticated, response
+
+
+def finish_conditional_response(request, response, etag, last_modified, is_authenticated):
+    if request.method in ('GET', 'HEAD') and response.status_code == 200:
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        if etag and not response.has_header('ETag'):
+            response['ETag'] = etag
+    if is_authenticated:
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    else:
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def conditional_page(etag_func, last_modified_func=None):
+    # 검증값이 같으면 템플릿을 렌더링하지 않고 304를 돌려줌
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                etag, last_modified, is_authenticated, response = await sync_to_async(check_conditions)(
+                    request, etag_func, last_modified_func, *args, **kwargs
+                )
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return finish_conditional_response(request, response, etag, last_modified, is_authenticated)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified, is_authenticated, response = check_conditions(
+                request, etag_func, last_modified_func, *args, **kwargs
+            )
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return finish_conditional_response(request, response, etag, last_modified, is_authenticated)
+
+        return wrapper
+
+    return decorator
+
+
+board_page_condition = conditional_page(get_board_etag)
+post_page_condition = conditional_page(get_post_etag, get_post_last_modified)
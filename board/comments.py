@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+from .avatars import prefetch_avatar_urls
+from .fragments import attach_comment_bodies
+from .pagination import CursorPage, decode_cursor, encode_cursor
+
+COMMENTS_PER_PAGE = 20
+
+
+def get_comments_per_page():
+    return getattr(settings, 'BOARD_COMMENTS_PER_PAGE', COMMENTS_PER_PAGE)
+
+
+def comment_key(comment):
+    return f'{comment.created_at.isoformat()}|{comment.pk}'
+
+
+def parse_comment_key(value):
+    created_at, pk = value.split('|')
+    return datetime.fromisoformat(created_at), int(pk)
+
+
+def get_comment_page(post, after=None, page_size=None):
+    # (post, created_at) 인덱스를 타도록 작성 순서대로 읽고, 마지막 댓글 기준으로 다음 페이지를 가져옴
+    page_size = page_size or get_comments_per_page()
+    comments = post.comment_set.select_related('author').order_by('created_at', 'pk')
+
+    if after:
+        created_at, pk = decode_cursor(after, parse=parse_comment_key)
+        comments = comments.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+
+    comments = list(comments[:page_size + 1])
+    page = CursorPage(comments[:page_size], len(comments) > page_size, bool(after), key=comment_key)
+    prefetch_avatar_urls([comment.author for comment in page.object_list])
+    attach_comment_bodies(page.object_list)
+    return page
+
+
+def get_comment_page_cursor(comment, page_size=None):
+    # 댓글이 들어 있는 페이지의 after 커서 (첫 페이지면 None). 페이지는 처음부터 page_size개씩 끊으므로
+    # 앞에 있는 댓글 수로 페이지를 정하고 바로 앞 페이지의 마지막 댓글을 커서로 씀 ((post, created_at) 인덱스)
+    page_size = page_size or get_comments_per_page()
+    comments = comment.post.comment_set.order_by('created_at', 'pk')
+    before = comments.filter(
+        Q(created_at__lt=comment.created_at) | Q(created_at=comment.created_at, pk__lt=comment.pk)
+    ).count()
+    start = before - before % page_size
+    if not start:
+        return None
+    return encode_cursor(comment_key(comments[start - 1]))
+
+
+def get_comment_url(comment):
+    # 새로 쓰거나 고친 댓글이 보이는 상세 페이지 주소 (긴 스레드에서는 첫 댓글 페이지에 없음)
+    cursor = get_comment_page_cursor(comment)
+    query = f'?after={cursor}' if cursor else ''
+    return f'{comment.post.get_absolute_url()}{query}#comment-{comment.pk}'
@@ -0,0 +1,46 @@
+from django.utils.functional import cached_property
+
+from .models import Post
+from .search import search_posts
+from .sidebar import get_category_counts
+
+
+class BoardContext:
+    # 요청 하나 동안 여러 뷰/템플릿/위젯이 같이 쓰는 값. 처음 필요할 때 한 번만 계산함
+    # (템플릿에서는 context processor가 넣어 준 board로 접근)
+    def __init__(self):
+        self.tag = None
+        self.searches = {}
+
+    @cached_property
+    def sidebar(self):
+        return get_category_counts()
+
+    @property
+    def categories(self):
+        return self.sidebar['categories']
+
+    @property
+    def no_category_post_count(self):
+        return self.sidebar['no_category_post_count']
+
+    @cached_property
+    def tag_post_count(self):
+        # 중간 테이블의 (tag_id, post_id) 인덱스만 읽음
+        if self.tag is None:
+            return 0
+        return Post.tags.through.objects.filter(tag_id=self.tag.pk).count()
+
+    def search(self, q):
+        if q not in self.searches:
+            self.searches[q] = search_posts(q)
+        return self.searches[q]
+
+    def search_count(self, q):
+        return len(self.search(q))
+
+
+def get_board_context(request):
+    if not hasattr(request, '_board_context'):
+        request._board_context = BoardContext()
+    return request._board_context
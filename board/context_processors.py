@@ -0,0 +1,11 @@
+from .caching import get_board_version
+from .context import get_board_context
+
+
+def board(request):
+    # 사이드바 등은 템플릿에서 실제로 쓸 때 계산됨 (캐시된 fragment 안에서는 계산하지 않음)
+    return {'board': get_board_context(request)}
+
+
+def board_version(request):
+    return {'board_version': get_board_version()}
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import connections
+
+SQLITE_PRAGMAS = {
+    # 읽기와 쓰기가 서로 막지 않도록 WAL 모드 사용
+    'journal_mode': 'WAL',
+    # WAL 모드에서는 NORMAL이어도 손상되지 않음 (전원이 꺼지면 마지막 트랜잭션만 잃을 수 있음)
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'foreign_keys': 'ON',
+}
+
+
+def get_sqlite_pragmas():
+    return {**SQLITE_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+
+
+def configure_sqlite(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connection_health():
+    # Django 3.2에는 CONN_HEALTH_CHECKS가 없으므로, 재사용하는 연결은 요청 시작 때
+    # 한 번 확인하고 끊겨 있으면 닫음 (다음 쿼리에서 새로 연결됨)
+    for connection in connections.all():
+        if connection.connection is None or not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if connection.in_atomic_block or connection.is_usable():
+            continue
+        connection.close()
@@ -0,0 +1,109 @@
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def content_disposition(filename):
+    try:
+        filename.encode('ascii')
+        return 'attachment; filename="{}"'.format(filename.replace('\\', '\\\\').replace('"', r'\"'))
+    except UnicodeEncodeError:
+        return f"attachment; filename*=utf-8''{quote(filename)}"
+
+
+def parse_range(header, size):
+    # 'bytes=start-end' 하나만 지원. 형식이 맞지 않거나 end < start이면 None
+    # (RFC 7233: 잘못된 Range는 무시하고 전체 파일을 보냄).
+    # 만족할 수 없는 범위(시작이 파일 크기 이상, 길이 0인 suffix)는 시작이 size인 범위로 돌려줌 (416)
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        suffix = int(end)
+        return (max(size - suffix, 0), size - 1) if suffix and size else (size, size - 1)
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        return size, size - 1
+    return start, min(int(end), size - 1) if end else size - 1
+
+
+def iter_range(f, start, end):
+    f.seek(start)
+    remaining = end - start + 1
+    try:
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def serve_attachment(request, field_file, filename):
+    storage = field_file.storage
+    try:
+        size = storage.size(field_file.name)
+        last_modified = storage.get_modified_time(field_file.name)
+    except OSError:
+        # DB에는 있지만 저장소에서 지워진 파일
+        raise Http404('첨부파일이 없습니다.')
+    last_modified_ts = int(last_modified.timestamp())
+    etag = quote_etag(f'{size:x}-{last_modified_ts:x}')
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is not None:
+        return response
+
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    sendfile = getattr(settings, 'BOARD_ATTACHMENT_SENDFILE', None)
+
+    if sendfile == 'x-accel-redirect':
+        # nginx가 파일을 직접 보내도록 넘김 (Range도 nginx가 처리)
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, 'BOARD_ATTACHMENT_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = quote(prefix + field_file.name)
+    elif sendfile == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = storage.path(field_file.name)
+    else:
+        byte_range = None
+        if_range = request.headers.get('If-Range')
+        if if_range is None or if_range == etag:
+            byte_range = parse_range(request.headers.get('Range'), size)
+
+        if byte_range and byte_range[0] >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                iter_range(storage.open(field_file.name, 'rb'), start, end),
+                status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+        else:
+            response = FileResponse(storage.open(field_file.name, 'rb'), content_type=content_type)
+            response['Content-Length'] = str(size)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = content_disposition(filename)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified_ts)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
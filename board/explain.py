@@ -0,0 +1,162 @@
+import json
+import re
+
+from django.conf import settings
+from django.db import connection as default_connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+# 행 수가 적어 전체를 읽어도 되는 테이블 (카테고리 목록 등)
+SMALL_TABLES = {'board_category', 'django_site', 'django_content_type', 'socialaccount_socialapp'}
+
+# 캐시된 페이지가 나오면 쿼리가 실행되지 않으므로 확인하는 동안에는 캐시를 끔
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(.*)$')
+SQLITE_INDEX_RE = re.compile(r'USING INDEX (\w+)')
+# Django는 컬럼을 항상 "테이블"."컬럼" (별칭이면 T3."컬럼") 으로 씀
+COLUMN_RE = re.compile(r'"?(\w+)"?\."(\w+)"')
+CLAUSE_RE = re.compile(r'\b(WHERE|GROUP BY|ORDER BY|LIMIT)\b')
+
+
+def get_small_tables():
+    return SMALL_TABLES | set(getattr(settings, 'BOARD_EXPLAIN_SMALL_TABLES', ()))
+
+
+def is_select(sql):
+    return sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+
+
+def mask_nested(sql):
+    # 괄호(서브쿼리/함수 인자)와 문자열 안을 같은 길이의 공백으로 바꿔 바깥 쿼리의 절만 찾을 수 있게 함
+    masked, depth, quoted = [], 0, False
+    for char in sql:
+        if char == "'":
+            quoted = not quoted
+            masked.append(' ')
+        elif quoted:
+            masked.append(' ')
+        elif char == '(':
+            depth += 1
+            masked.append(' ')
+        elif char == ')':
+            depth -= 1
+            masked.append(' ')
+        else:
+            masked.append(char if depth == 0 else ' ')
+    return ''.join(masked)
+
+
+def split_clauses(sql):
+    # 바깥 쿼리의 {'WHERE': ..., 'ORDER BY': ..., 'LIMIT': ...} (원래 SQL 조각, 서브쿼리 포함)
+    matches = list(CLAUSE_RE.finditer(mask_nested(sql)))
+    clauses = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        clauses[match.group(1)] = sql[match.end():following.start() if following else len(sql)]
+    return clauses
+
+
+def referenced_columns(sql, name):
+    return {column for table, column in COLUMN_RE.findall(sql) if table == name}
+
+
+def sqlite_index_columns(cursor, table, index):
+    # 인덱스 컬럼 목록. index가 None이면 rowid(INTEGER PRIMARY KEY) 순서로 읽는 스캔
+    if index is None:
+        cursor.execute(f'PRAGMA table_info("{table}")')
+        return [row[1] for row in cursor.fetchall() if row[5] == 1 and row[2].upper() == 'INTEGER']
+    cursor.execute(f'PRAGMA index_info("{index}")')
+    return [row[2] for row in sorted(cursor.fetchall())]
+
+
+def is_ordered_limit_scan(cursor, clauses, table, name, index):
+    # ORDER BY 순서대로 인덱스(또는 rowid)를 읽다가 LIMIT에서 멈추는 스캔만 전체 스캔이 아님.
+    # 이 테이블에 대한 WHERE 조건이 남아 있으면 조건에 맞는 행을 찾을 때까지 테이블 전체를 읽을 수 있으므로 허용하지 않음
+    if 'LIMIT' not in clauses or 'ORDER BY' not in clauses:
+        return False
+    order_by = COLUMN_RE.findall(clauses['ORDER BY'])
+    columns = sqlite_index_columns(cursor, table, index)
+    if not order_by or not columns or order_by[0] != (name, columns[0]):
+        return False
+    return not referenced_columns(clauses.get('WHERE', ''), name)
+
+
+def sqlite_full_scans(cursor, sql, small_tables):
+    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+    details = [row[3] for row in cursor.fetchall()]
+    # 정렬을 따로 하면 (TEMP B-TREE) 인덱스 순서로 읽다가 멈출 수 없음
+    clauses = split_clauses(sql) if not any('TEMP B-TREE FOR ORDER BY' in d for d in details) else {}
+
+    scans = []
+    for detail in details:
+        match = SQLITE_SCAN_RE.match(detail)
+        if not match:
+            continue
+        table, alias, rest = match.groups()
+        # 인덱스만 읽는 스캔(COUNT/GROUP BY)과 FTS 가상 테이블은 허용
+        if table in small_tables or 'COVERING INDEX' in rest or 'VIRTUAL TABLE' in rest:
+            continue
+        index = SQLITE_INDEX_RE.search(rest)
+        if is_ordered_limit_scan(cursor, clauses, table, alias or table, index and index.group(1)):
+            continue
+        scans.append(detail)
+    return scans
+
+
+def postgresql_plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from postgresql_plan_nodes(child)
+
+
+def postgresql_full_scans(cursor, sql, small_tables):
+    # 테스트 데이터는 작아서 항상 Seq Scan이 싸게 나오므로, 쓸 수 있는 인덱스가 있는지만 봄
+    cursor.execute('SET LOCAL enable_seqscan = off')
+    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [
+        f'Seq Scan on {node["Relation Name"]}'
+        for node in postgresql_plan_nodes(plan[0]['Plan'])
+        if node['Node Type'] == 'Seq Scan' and node['Relation Name'] not in small_tables
+    ]
+
+
+def find_full_scans(sql, connection=None):
+    # sql은 값이 채워진 상태여야 함 (CaptureQueriesContext가 기록한 쿼리)
+    connection = connection or default_connection
+    if not is_select(sql):
+        return []
+
+    small_tables = get_small_tables()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            return sqlite_full_scans(cursor, sql, small_tables)
+        if connection.vendor == 'postgresql':
+            # SET LOCAL은 트랜잭션 안에서만 적용됨
+            with transaction.atomic(using=connection.alias):
+                return postgresql_full_scans(cursor, sql, small_tables)
+    return []
+
+
+def capture_queries(url, client=None, connection=None):
+    # 페이지 하나를 요청하면서 실행된 쿼리 목록
+    connection = connection or default_connection
+    client = client or Client()
+    with override_settings(CACHES=NO_CACHE, ALLOWED_HOSTS=['testserver']), \
+            CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+def explain_url(url, client=None, connection=None):
+    # [(sql, [전체 스캔 설명, ...]), ...] 전체 스캔이 있는 쿼리만 돌려줌
+    connection = connection or default_connection
+    response, queries = capture_queries(url, client, connection)
+    problems = []
+    for sql in queries:
+        scans = find_full_scans(sql, connection=connection)
+        if scans:
+            problems.append((sql, scans))
+    return response, problems
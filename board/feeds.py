@@ -0,0 +1,166 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.contrib.syndication.views import add_domain
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+
+from .caching import get_version, bump_version
+from .models import Post, Category, Tag
+
+FEED_ENTRIES = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+# 포스트/태그/카테고리/사용자 이름이 바뀌면 올려서 모든 스냅샷을 버림 (자주 읽는 것은 바로 다시 만듦)
+FEED_VERSION_KEY = 'board:feed-version'
+NO_CATEGORY = 'no_category'
+
+FEED_CONTENT_TYPES = {
+    'atom': 'application/atom+xml; charset=utf-8',
+    'json': 'application/feed+json; charset=utf-8',
+}
+
+FEED_TITLE = '풋살매니저 자유게시판'
+
+
+def get_feed_entries():
+    return getattr(settings, 'BOARD_FEED_ENTRIES', FEED_ENTRIES)
+
+
+def absolute_url(url):
+    # 스냅샷은 요청 밖(저장 직후)에서도 만들므로 주소는 Sites 도메인으로 만듦
+    return add_domain(Site.objects.get_current().domain, url, getattr(settings, 'BOARD_FEED_SECURE', False))
+
+
+def aware(value):
+    # USE_TZ=False라 DB 시각에는 시간대가 없음. 피드에는 TIME_ZONE 기준으로 오프셋을 붙임
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+def feed_source(kind=None, slug=None):
+    # (제목, 페이지 주소, 포스트 queryset). 없는 카테고리/태그는 404
+    posts = Post.objects.for_list()
+    if kind is None:
+        return FEED_TITLE, '/board/', posts
+    if kind == 'category' and slug == NO_CATEGORY:
+        return f'{FEED_TITLE} - 미분류', f'/board/category/{NO_CATEGORY}/', posts.filter(category=None)
+    if kind == 'category':
+        category = get_object_or_404(Category, slug=slug)
+        return f'{FEED_TITLE} - {category}', category.get_absolute_url(), posts.filter(category=category)
+    if kind == 'tag':
+        tag = get_object_or_404(Tag, slug=slug)
+        return f'{FEED_TITLE} - #{tag}', tag.get_absolute_url(), posts.filter(tags=tag)
+    raise Http404
+
+
+def feed_entry(post):
+    # 본문은 저장해 둔 Markdown 요약(excerpt_html)을 그대로 씀
+    return {
+        'url': absolute_url(post.get_absolute_url()),
+        'title': post.title,
+        'summary': post.hook_text,
+        'content_html': post.get_content_excerpt(),
+        'author': post.author.username if post.author else '',
+        'tags': [tag.name for tag in post.tags.all()],
+        'published': aware(post.created_at),
+        'updated': aware(post.updated_at),
+    }
+
+
+def render_atom(title, link, feed_url, entries):
+    feed = Atom1Feed(title=title, link=link, description='', feed_url=feed_url, language='ko')
+    for entry in entries:
+        feed.add_item(
+            title=entry['title'],
+            link=entry['url'],
+            unique_id=entry['url'],
+            description=entry['content_html'],
+            author_name=entry['author'] or None,
+            pubdate=entry['published'],
+            updateddate=entry['updated'],
+            categories=entry['tags'],
+        )
+    return feed.writeString('utf-8').encode('utf-8')
+
+
+def render_json(title, link, feed_url, entries):
+    # JSON Feed 1.1 (https://jsonfeed.org/version/1.1)
+    feed = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': title,
+        'home_page_url': link,
+        'feed_url': feed_url,
+        'language': 'ko',
+        'items': [
+            {
+                'id': entry['url'],
+                'url': entry['url'],
+                'title': entry['title'],
+                'summary': entry['summary'],
+                'content_html': entry['content_html'],
+                'date_published': entry['published'].isoformat(),
+                'date_modified': entry['updated'].isoformat(),
+                'authors': [{'name': entry['author']}] if entry['author'] else [],
+                'tags': entry['tags'],
+            }
+            for entry in entries
+        ],
+    }
+    return json.dumps(feed, ensure_ascii=False).encode('utf-8')
+
+
+def feed_path(kind, slug, feed_format):
+    prefix = '/board/' if kind is None else f'/board/{kind}/{slug}/'
+    return f'{prefix}feed/{feed_format}/'
+
+
+def build_snapshot(kind=None, slug=None):
+    # 최근 N개 포스트로 두 형식을 모두 렌더링해 둠. 요청은 캐시에서 꺼내 그대로 보냄
+    title, page_url, posts = feed_source(kind, slug)
+    entries = [feed_entry(post) for post in posts.order_by('-pk')[:get_feed_entries()]]
+    link = absolute_url(page_url)
+
+    snapshot = {'updated': max((entry['updated'] for entry in entries), default=None), 'etags': {}}
+    for feed_format, render in (('atom', render_atom), ('json', render_json)):
+        content = render(title, link, absolute_url(feed_path(kind, slug, feed_format)), entries)
+        snapshot[feed_format] = content
+        snapshot['etags'][feed_format] = hashlib.md5(content).hexdigest()
+    return snapshot
+
+
+def feed_cache_key(kind, slug):
+    scope = hashlib.md5(f'{kind}:{slug}'.encode('utf-8')).hexdigest()
+    return f'board:feed:{scope}'
+
+
+def get_feed_snapshot(kind=None, slug=None):
+    version = get_version(FEED_VERSION_KEY)
+    key = feed_cache_key(kind, slug)
+    snapshot = cache.get(key, version=version)
+    if snapshot is None:
+        snapshot = build_snapshot(kind, slug)
+        cache.set(key, snapshot, FEED_CACHE_TIMEOUT, version=version)
+    return snapshot
+
+
+def refresh_feeds(post_pk=None):
+    # 모든 스냅샷을 버리고, 전체 피드와 바뀐 포스트가 들어가는 카테고리/태그 피드는 바로 다시 만듦
+    # (나머지는 처음 요청될 때 만듦)
+    bump_version(FEED_VERSION_KEY)
+    scopes = [(None, None)]
+    post = Post.objects.select_related('category').prefetch_related('tags').filter(pk=post_pk).first() if post_pk else None
+    if post is not None:
+        scopes.append(('category', post.category.slug if post.category else NO_CATEGORY))
+        scopes += [('tag', tag.slug) for tag in post.tags.all()]
+    for kind, slug in scopes:
+        get_feed_snapshot(kind, slug)
+
+
+def schedule_feed_refresh(post_pk=None):
+    # 커밋 전에 다시 만들면 다른 요청이 예전 내용을 새 버전으로 캐시할 수 있으므로 커밋 뒤에 함
+    transaction.on_commit(lambda: refresh_feeds(post_pk))
@@ -0,0 +1,68 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.template import Context
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .caching import get_fragment_version
+from .metrics import record_template_time
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+POST_CARD_TEMPLATE = 'board/post_card.html'
+COMMENT_BODY_TEMPLATE = 'board/comment_body.html'
+
+
+def post_card_cache_key(post):
+    # 검색 결과 카드는 본문 대신 검색어가 들어간 snippet을 보여주므로 snippet도 키에 넣음
+    key = f'board:fragment:post_card:{post.pk}:{post.updated_at.timestamp()}'
+    snippet = getattr(post, 'search_snippet', '')
+    if snippet:
+        key += ':' + hashlib.md5(snippet.encode('utf-8')).hexdigest()
+    return key
+
+
+def comment_cache_key(comment):
+    return f'board:fragment:comment:{comment.pk}:{comment.modified_at.timestamp()}'
+
+
+def render_fragments(template_name, name, objects, key_func):
+    # 객체마다 (pk, 수정 시각) 키로 렌더링한 HTML을 캐시에서 한 번에 읽고, 없는 것만 렌더링함.
+    # fragment는 요청/사용자와 관계없는 부분만 담으므로 목록/카테고리/태그/검색 페이지가 같이 씀.
+    # 최상위 템플릿 렌더링 안에서 불리므로 렌더링 시간은 TimedTemplate에 이미 들어감 (엔진 템플릿을 직접 씀)
+    objects = list(objects)
+    if not objects:
+        return []
+
+    version = get_fragment_version()
+    keys = [key_func(obj) for obj in objects]
+    cached = cache.get_many(keys, version=version)
+
+    template = get_template(template_name).template
+    missing = {}
+    fragments = []
+    for obj, key in zip(objects, keys):
+        fragment = cached.get(key)
+        if fragment is None:
+            fragment = missing[key] = template.render(Context({name: obj}))
+        fragments.append(mark_safe(fragment))
+
+    if missing:
+        cache.set_many(missing, FRAGMENT_CACHE_TIMEOUT, version=version)
+    return fragments
+
+
+def render_post_cards(posts):
+    return mark_safe(''.join(render_fragments(POST_CARD_TEMPLATE, 'post', posts, post_card_cache_key)))
+
+
+def attach_comment_bodies(comments):
+    # 댓글 목록은 사용자마다 다른 수정/삭제 버튼이 섞여 있으므로 본문 부분만 comment.body_html로 붙여 둠.
+    # 뷰에서 템플릿 밖에서 렌더링하므로 걸린 시간을 템플릿 시간에 직접 더함
+    start = time.perf_counter()
+    comments = list(comments)
+    for comment, body in zip(comments, render_fragments(COMMENT_BODY_TEMPLATE, 'comment', comments, comment_cache_key)):
+        comment.body_html = body
+    record_template_time(time.perf_counter() - start)
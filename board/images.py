@@ -0,0 +1,104 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .caching import bump_board_version
+from .models import Post
+
+DERIVATIVE_WIDTHS = (400, 800, 1200)
+DERIVATIVE_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='board-images')
+
+
+def derivative_name(name, width, ext):
+    root, _ = os.path.splitext(name)
+    return f'{root}-{width}w.{ext}'
+
+
+def render_derivatives(image):
+    # EXIF 회전값을 적용한 이미지를 받아 EXIF 없이 다시 저장 (원본보다 큰 사이즈는 만들지 않음)
+    image = image.convert('RGB')
+    widths = [w for w in DERIVATIVE_WIDTHS if w < image.width] + [min(image.width, DERIVATIVE_WIDTHS[-1])]
+
+    for width in sorted(set(widths)):
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+        for ext, options in DERIVATIVE_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, **options)
+            yield width, height, ext, buffer.getvalue()
+
+
+def delete_derivatives(storage, derivatives):
+    for files in derivatives.get('formats', {}).values():
+        for name in files.values():
+            storage.delete(name)
+
+
+def generate_derivatives(post):
+    storage = post.head_image.storage
+    delete_derivatives(storage, post.head_image_derivatives)
+
+    derivatives = {'source': post.head_image.name, 'sizes': {}, 'formats': {}}
+    with post.head_image.open('rb') as f:
+        with Image.open(f) as original:
+            image = ImageOps.exif_transpose(original)
+            width, height = image.size
+            for derivative_width, derivative_height, ext, data in render_derivatives(image):
+                name = storage.save(derivative_name(post.head_image.name, derivative_width, ext), ContentFile(data))
+                derivatives['formats'].setdefault(ext, {})[str(derivative_width)] = name
+                derivatives['sizes'][str(derivative_width)] = derivative_height
+
+    # 카드 fragment가 (pk, updated_at)으로 캐시되므로 썸네일이 생기면 updated_at도 바꿈
+    post.updated_at = timezone.now()
+    Post.objects.filter(pk=post.pk).update(
+        head_image_derivatives=derivatives, head_image_width=width, head_image_height=height,
+        updated_at=post.updated_at,
+    )
+    post.head_image_derivatives = derivatives
+    post.head_image_width, post.head_image_height = width, height
+    bump_board_version()
+    return derivatives
+
+
+def clear_derivatives(post):
+    delete_derivatives(post.head_image.storage, post.head_image_derivatives)
+    Post.objects.filter(pk=post.pk).update(head_image_derivatives={}, head_image_width=None, head_image_height=None)
+    post.head_image_derivatives = {}
+    post.head_image_width = post.head_image_height = None
+
+
+def generate_derivatives_for_pk(pk):
+    try:
+        post = Post.objects.filter(pk=pk).only(
+            'pk', 'head_image', 'head_image_width', 'head_image_height', 'head_image_derivatives'
+        ).first()
+        if post and post.head_image and post.needs_head_image_derivatives():
+            generate_derivatives(post)
+    except Exception:
+        # executor.submit의 Future는 아무도 확인하지 않으므로 여기서 남기지 않으면 오류가 사라짐
+        logger.exception('Failed to generate head image derivatives for post %s', pk)
+    finally:
+        connections.close_all()
+
+
+def schedule_derivatives(post):
+    # 요청을 막지 않도록 커밋 후 백그라운드 스레드에서 처리 (테스트에서는 바로 실행)
+    if getattr(settings, 'BOARD_IMAGE_DERIVATIVES_SYNC', False):
+        generate_derivatives(post)
+    else:
+        pk = post.pk
+        transaction.on_commit(lambda: executor.submit(generate_derivatives_for_pk, pk))
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from board import benchmark
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'board-benchmark',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        '테스트 DB에 대량의 데이터(기본 포스트 1만, 댓글 10만, 태그 500)를 넣고 모든 URL의 '
+        '쿼리 수, 응답 시간(템플릿 렌더링 시간 포함), 메모리를 측정해 기준값(JSON)과 비교합니다. 기준보다 나빠지면 실패합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='데이터 양 배율 (빠르게 돌릴 때 0.1 등)')
+        parser.add_argument('--repeat', type=int, default=5, help='URL마다 반복 횟수 (시간은 가장 빠른 값)')
+        parser.add_argument(
+            '--baseline', default=os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json'),
+            help='기준값 JSON 파일 경로',
+        )
+        parser.add_argument('--save', action='store_true', help='비교하지 않고 결과를 기준값으로 저장합니다.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help='시간/메모리가 기준보다 이 비율 이상 늘면 실패 (기본 0.25 = 25%%). 쿼리 수는 하나라도 늘면 실패',
+        )
+        parser.add_argument('--only', action='append', help='이 이름의 URL만 측정합니다. 여러 번 지정할 수 있습니다.')
+
+    def handle(self, *args, **options):
+        if options['save'] and options['only']:
+            raise CommandError('--save는 모든 URL을 측정할 때만 쓸 수 있습니다.')
+
+        media_root = tempfile.mkdtemp(prefix='board-benchmark-')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, MEDIA_ROOT=media_root, BOARD_SERVER_TIMING=True):
+                start = time.perf_counter()
+                volumes = benchmark.seed(options['scale'])
+                self.stdout.write(f'Seeded {volumes} in {time.perf_counter() - start:.1f}s')
+                results = benchmark.run(options['repeat'], options['only'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        # tpl: 템플릿 렌더링 시간, warm: 페이지 캐시만 비우고 fragment 캐시는 남긴 상태
+        self.stdout.write(
+            f'{"url":<22}{"status":>7}{"queries":>9}{"ms":>10}{"tpl ms":>10}'
+            f'{"warm ms":>10}{"warm tpl":>10}{"KiB":>10}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22}{result["status"]:>7}{result["queries"]:>9}'
+                f'{result["time_ms"]:>10.2f}{result["template_ms"]:>10.2f}'
+                f'{result["warm_time_ms"]:>10.2f}{result["warm_template_ms"]:>10.2f}{result["memory_kb"]:>10.1f}'
+            )
+
+        if options['save']:
+            benchmark.save_baseline(options['baseline'], volumes, results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {options["baseline"]}'))
+            return
+
+        try:
+            baseline = benchmark.load_baseline(options['baseline'])
+        except FileNotFoundError:
+            raise CommandError(f'{options["baseline"]} 파일이 없습니다. 먼저 --save로 기준값을 만드세요.')
+        if baseline['volumes'] != volumes:
+            self.stdout.write(self.style.WARNING(f'Baseline was recorded with {baseline["volumes"]}'))
+
+        regressions = benchmark.compare(baseline['results'], results, options['threshold'])
+        for name, metric, before, after in regressions:
+            self.stdout.write(self.style.ERROR(f'{name}: {metric} {before} -> {after}'))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}.')
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from board.assets import outdated_bundles, write_bundles
+
+
+class Command(BaseCommand):
+    help = 'vendor 파일과 사이트 CSS를 묶어 board/static/board/dist 의 번들을 다시 만듭니다. (vendor/CSS를 고친 뒤 커밋 전에 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='번들을 쓰지 않고 소스와 다르면 실패합니다.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            outdated = outdated_bundles()
+            if outdated:
+                raise CommandError(f'outdated bundle(s): {", ".join(outdated)} (run build_assets)')
+            self.stdout.write(self.style.SUCCESS('bundles are up to date.'))
+            return
+
+        for name in write_bundles():
+            self.stdout.write(self.style.SUCCESS(f'{name} built.'))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from board.explain import explain_url
+from board.models import Post, Category, Tag
+from board.pagination import encode_cursor
+
+DEFAULT_PATHS = [
+    '/', '/board/', '/board/category/no_category/',
+    '/about_site/', '/about_site/?region=은평구&skill_tier=low&age_group=high_school', '/about_site/?age_group=worker',
+]
+
+
+def default_paths():
+    # 각 뷰마다 실제 데이터가 있는 URL 하나씩
+    paths = list(DEFAULT_PATHS)
+    post = Post.objects.only('pk').order_by('-pk').first()
+    if post:
+        paths += [f'/board/{post.pk}/', f'/board/{post.pk}/comments/', f'/board/?after={encode_cursor(post.pk)}']
+    category = Category.objects.first()
+    if category:
+        paths.append(f'/board/category/{category.slug}/')
+    tag = Tag.objects.first()
+    if tag:
+        paths.append(f'/board/tag/{tag.slug}/')
+    paths.append('/board/search/test/')
+    return paths
+
+
+class Command(BaseCommand):
+    help = '각 페이지에서 실행되는 쿼리를 EXPLAIN 해서 테이블 전체를 읽는 쿼리가 있으면 실패합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='확인할 경로 (기본: 게시판의 모든 읽기 페이지). 여러 번 지정할 수 있습니다.',
+        )
+
+    def handle(self, *args, **options):
+        client = Client()
+        failures = 0
+        for path in options['paths'] or default_paths():
+            response, problems = explain_url(path, client)
+            # 404는 확인할 쿼리가 실행되지 않은 것이므로 실패로 셈
+            failed = problems or response.status_code != 200
+            failures += response.status_code != 200
+            self.stdout.write(f'{"FAIL" if failed else "ok":<5}{response.status_code} {path}')
+            for sql, scans in problems:
+                failures += 1
+                self.stdout.write(f'      {"; ".join(scans)}')
+                self.stdout.write(f'      {sql}')
+
+        if failures:
+            raise CommandError(f'{failures} problem(s) found.')
+        self.stdout.write(self.style.SUCCESS('No full table scans.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from board.images import generate_derivatives
+from board.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Post.head_image의 리사이즈된 WebP/JPEG 파일을 만들고 이미지 크기를 기록합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='이미 만들어진 파일이 있어도 모든 이미지를 다시 만듭니다.',
+        )
+
+    def handle(self, *args, **options):
+        generated = failed = 0
+        for post in Post.objects.exclude(head_image='').only(
+            'pk', 'head_image', 'head_image_width', 'head_image_height', 'head_image_derivatives'
+        ).iterator():
+            # 예전에 올라온 이미지는 크기가 비어 있으므로 썸네일을 만들면서 채움
+            if options['all'] or post.needs_head_image_derivatives() or post.head_image_width is None:
+                try:
+                    generate_derivatives(post)
+                    generated += 1
+                except (OSError, ValueError) as e:
+                    # 파일이 없거나 이미지가 아닌 경우: 건너뛰고 계속 (목록에서는 원본 주소만 씀)
+                    failed += 1
+                    self.stderr.write(f'post {post.pk}: {post.head_image.name}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'{generated} image(s) processed.'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} image(s) failed.'))
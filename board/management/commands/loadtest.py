@@ -0,0 +1,87 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ['/', '/board/', '/board/1/', '/board/search/test/']
+
+
+def percentile(values, percent):
+    if not values:
+        return 0
+    values = sorted(values)
+    index = max(math.ceil(len(values) * percent / 100) - 1, 0)
+    return values[index]
+
+
+def fetch(url, timeout):
+    start = time.perf_counter()
+    try:
+        with urlopen(Request(url, headers={'User-Agent': 'board-loadtest'}), timeout=timeout) as response:
+            response.read()
+            ok = response.status < 400
+    except HTTPError as e:
+        ok = e.code < 400
+    except (URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run(base_url, paths, requests, concurrency, timeout):
+    urls = [base_url.rstrip('/') + paths[i % len(paths)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda url: fetch(url, timeout), urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, ok in results if ok]
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, ok in results if not ok),
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        '실행 중인 서버들(WSGI/ASGI 등)에 같은 요청을 보내 처리량과 p50/p99 지연 시간을 비교합니다. '
+        '예: manage.py loadtest --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True,
+            help='name=base_url 형식. 여러 번 지정할 수 있습니다.',
+        )
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help=f'요청할 경로 (기본: {" ".join(DEFAULT_PATHS)}). 여러 번 지정할 수 있습니다.',
+        )
+        parser.add_argument('--requests', type=int, default=1000, help='서버마다 보낼 요청 수')
+        parser.add_argument('--concurrency', type=int, default=32, help='동시에 보낼 요청 수')
+        parser.add_argument('--warmup', type=int, default=50, help='측정 전에 보낼 요청 수')
+        parser.add_argument('--timeout', type=float, default=10, help='요청 하나의 제한 시간(초)')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, sep, base_url = target.partition('=')
+            if not sep or not base_url:
+                raise CommandError(f'--target은 name=url 형식이어야 합니다: {target}')
+            targets.append((name, base_url))
+        paths = options['paths'] or DEFAULT_PATHS
+
+        self.stdout.write(f'{"target":<12}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}')
+        for name, base_url in targets:
+            if options['warmup']:
+                run(base_url, paths, options['warmup'], options['concurrency'], options['timeout'])
+            result = run(base_url, paths, options['requests'], options['concurrency'], options['timeout'])
+            self.stdout.write(
+                f'{name:<12}{result["throughput"]:>10.1f}{result["p50"]:>10.1f}'
+                f'{result["p99"]:>10.1f}{result["errors"]:>8}'
+            )
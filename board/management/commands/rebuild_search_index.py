@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from board.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = '모든 포스트의 검색 색인을 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{backend.__class__.__name__}: search index rebuilt.'))
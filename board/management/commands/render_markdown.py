@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from board.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Post.content의 Markdown을 미리 렌더링해서 content_html / excerpt_html에 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='hash가 같아도 모든 포스트를 다시 렌더링합니다.',
+        )
+
+    def handle(self, *args, **options):
+        rendered = 0
+        for post in Post.objects.only('pk', 'content', 'content_hash').iterator():
+            if options['all'] or post.is_markdown_stale():
+                post.refresh_markdown()
+                rendered += 1
+        self.stdout.write(self.style.SUCCESS(f'{rendered} post(s) rendered.'))
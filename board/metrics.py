@@ -0,0 +1,329 @@
+import asyncio
+import bisect
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates, Template
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('board.performance')
+
+# 초 단위 히스토그램 구간
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+current_metrics = ContextVar('board_request_metrics', default=None)
+rendering_template = ContextVar('board_rendering_template', default=False)
+
+MISSING = object()
+
+
+class RequestMetrics:
+    # 요청 하나 동안의 측정값. 값만 더하고, 정리는 요청이 끝난 뒤 한 번 함
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total = 0
+        self.sql_time = 0
+        self.queries = 0
+        self.statements = set()
+        self.duplicates = 0
+        self.template_time = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            key = (sql, repr(params))
+            if key in self.statements:
+                self.duplicates += 1
+            else:
+                self.statements.add(key)
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+        self.statements = None
+
+    def server_timing(self):
+        return ', '.join([
+            f'total;dur={self.total * 1000:.1f}',
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries, {self.duplicates} duplicate"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"',
+        ])
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total * 1000, 2),
+            'sql_ms': round(self.sql_time * 1000, 2),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates,
+            'template_ms': round(self.template_time * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    # 연결마다 한 번 붙여 두는 execute wrapper (board.signals). 실행 중인 요청의 측정값에 기록함.
+    # sync_to_async가 ContextVar를 복사해 가므로 async 뷰가 다른 스레드에서 실행한 쿼리도 요청에 들어감
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def record_template_time(seconds):
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.template_time += seconds
+
+
+def record_cache(hits, misses):
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    # 프로세스 안에서 view별로 모아 둠 (gunicorn 워커마다 따로 집계됨)
+    histograms = {
+        'board_request_duration_seconds': ('Total request time.', BUCKETS),
+        'board_db_duration_seconds': ('Time spent in SQL queries per request.', BUCKETS),
+        'board_template_duration_seconds': ('Time spent rendering templates per request.', BUCKETS),
+        'board_db_queries': ('SQL queries per request.', QUERY_BUCKETS),
+    }
+    counters = {
+        'board_requests_total': 'Requests by view and status.',
+        'board_db_duplicate_queries_total': 'Queries repeated with the same SQL and parameters.',
+        'board_cache_hits_total': 'Cache hits.',
+        'board_cache_misses_total': 'Cache misses.',
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.values = {name: {} for name in list(self.histograms) + list(self.counters)}
+
+    def histogram(self, name, labels):
+        series = self.values[name]
+        if labels not in series:
+            series[labels] = Histogram(self.histograms[name][1])
+        return series[labels]
+
+    def increment(self, name, labels, amount):
+        series = self.values[name]
+        series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, view, method, status, metrics):
+        labels = (('view', view), ('method', method))
+        with self.lock:
+            self.histogram('board_request_duration_seconds', labels).observe(metrics.total)
+            self.histogram('board_db_duration_seconds', labels).observe(metrics.sql_time)
+            self.histogram('board_template_duration_seconds', labels).observe(metrics.template_time)
+            self.histogram('board_db_queries', labels).observe(metrics.queries)
+            self.increment('board_requests_total', labels + (('status', str(status)),), 1)
+            self.increment('board_db_duplicate_queries_total', labels, metrics.duplicates)
+            self.increment('board_cache_hits_total', labels, metrics.cache_hits)
+            self.increment('board_cache_misses_total', labels, metrics.cache_misses)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, buckets) in self.histograms.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for labels, histogram in sorted(self.values[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{format_labels(labels + (("le", str(bound)),))} {cumulative}')
+                    lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum}')
+                    lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+            for name, help_text in self.counters.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for labels, value in sorted(self.values[name].items()):
+                    lines.append(f'{name}{format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels) + '}'
+
+
+registry = Registry()
+
+
+def get_view_name(request):
+    # URL 이름이 없으므로 view 함수/클래스 경로 (예: board.views.PostList)
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unresolved'
+
+
+class PerformanceMiddleware:
+    # 가장 바깥 미들웨어라 sync만 지원하면 ASGI에서도 체인 전체가 sync로 돌고 async 뷰가 async_to_sync로 감싸지므로
+    # 둘 다 지원함
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Django가 이 미들웨어를 coroutine 함수로 보게 함 (MiddlewareMixin과 같은 방법)
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    def process_response(self, request, response, metrics):
+        metrics.finish()
+        view = get_view_name(request)
+        registry.observe(view, request.method, response.status_code, metrics)
+        # 쿼리 수/시간은 내부 정보이므로 BOARD_SERVER_TIMING이 꺼져 있으면 /metrics를 볼 수 있는 주소에만 보냄
+        if getattr(settings, 'BOARD_SERVER_TIMING', False) or is_metrics_client(request):
+            response['Server-Timing'] = metrics.server_timing()
+        if logger.isEnabledFor(logging.INFO):
+            data = {'view': view, 'method': request.method, 'path': request.path,
+                    'status': response.status_code, **metrics.as_dict()}
+            logger.info(json.dumps(data), extra={'performance': data})
+        return response
+
+
+def get_client_ip(request):
+    # 리버스 프록시 뒤에서는 REMOTE_ADDR가 늘 프록시 주소이므로, BOARD_TRUSTED_PROXIES에서 온 요청만
+    # 프록시가 넣은 헤더(BOARD_CLIENT_IP_HEADER)를 믿음. X-Forwarded-For처럼 여러 주소가 있으면
+    # 프록시가 마지막에 붙인 주소를 씀 (앞쪽은 클라이언트가 보낸 값일 수 있음)
+    remote_addr = request.META.get('REMOTE_ADDR')
+    header = getattr(settings, 'BOARD_CLIENT_IP_HEADER', None)
+    if header and remote_addr in getattr(settings, 'BOARD_TRUSTED_PROXIES', []):
+        forwarded = request.META.get(header, '').split(',')[-1].strip()
+        if forwarded:
+            return forwarded
+    return remote_addr
+
+
+def is_metrics_client(request):
+    allowed = getattr(settings, 'BOARD_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    return '*' in allowed or get_client_ip(request) in allowed
+
+
+def metrics_view(request):
+    # Prometheus text format. BOARD_METRICS_ALLOWED_IPS에 있는 주소에서만 볼 수 있음
+    if not is_metrics_client(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        # crispy 폼처럼 렌더링 중에 다른 템플릿을 따로 렌더링하는 경우가 있으므로 가장 바깥 렌더링만 셈
+        if rendering_template.get():
+            return super().render(context, request)
+
+        token = rendering_template.set(True)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            rendering_template.reset(token)
+            record_template_time(time.perf_counter() - start)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    # TEMPLATES의 BACKEND로 지정하면 최상위 템플릿 렌더링 시간을 요청 측정값에 더함
+    # (include는 최상위 템플릿 안에서 렌더링되므로 중복해서 세지 않음)
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class InstrumentedCache:
+    # CACHES의 BACKEND로 지정하고 실제 백엔드는 OPTIONS['BACKEND']에 둠.
+    # 조회 결과로 hit/miss를 세고 나머지는 그대로 넘김
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS', {}))
+        backend = import_string(options.pop('BACKEND'))
+        self._cache = backend(location, dict(params, OPTIONS=options))
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def get(self, key, default=None, version=None):
+        value = self._cache.get(key, MISSING, version=version)
+        if value is MISSING:
+            record_cache(0, 1)
+            return default
+        record_cache(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self._cache.get_many(keys, version=version)
+        record_cache(len(values), len(keys) - len(values))
+        return values
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, MISSING, version=version)
+        if value is MISSING:
+            if callable(default):
+                default = default()
+            self._cache.add(key, default, timeout=timeout, version=version)
+            # 동시에 다른 요청이 넣었을 수 있으므로 다시 읽음
+            return self._cache.get(key, default, version=version)
+        return value
@@ -0,0 +1,26 @@
+import asyncio
+
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    # whitenoise 5.x의 미들웨어는 sync만 지원해서 ASGI에서는 그 아래 체인과 async 뷰가 sync로 바뀜.
+    # static 파일 조회는 미리 읽어 둔 목록에서 찾기만 하므로 (autorefresh가 아닐 때) 이벤트 루프에서 바로 함
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        response = self.process_request(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# 검색 백엔드(board.search)가 쓰는 색인 테이블. 나중에 백엔드가 바뀌어도 이 마이그레이션이 하는 일은
+# 바뀌지 않도록 SQL을 여기에 그대로 둠. 이미 있는 포스트는 manage.py rebuild_search_index로 색인함
+SEARCH_INDEX_SQL = {
+    'sqlite': (
+        [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS board_post_fts "
+            "USING fts5(title, hook_text, content, tags, tokenize='unicode61')",
+        ],
+        ['DROP TABLE IF EXISTS board_post_fts'],
+    ),
+    'postgresql': (
+        [
+            'CREATE TABLE IF NOT EXISTS board_post_search ('
+            'post_id bigint PRIMARY KEY REFERENCES board_post (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS board_post_search_document_gin ON board_post_search USING gin (document)',
+        ],
+        ['DROP TABLE IF EXISTS board_post_search'],
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    for sql in SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    for sql in SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0002_post_rendered_markdown'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
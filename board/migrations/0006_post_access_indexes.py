@@ -0,0 +1,31 @@
+# Generated by Django 3.2.6 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0005_post_head_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', '-id'], name='board_post_category_id'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('category__isnull', True)), fields=['-id'], name='board_post_no_category'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-created_at'], name='board_post_author_created'),
+        ),
+        # 자동 생성된 중간 테이블은 Meta.indexes를 쓸 수 없으므로 직접 만듦.
+        # 태그 페이지에서 중간 테이블 행을 읽지 않고 인덱스만으로 post_id를 찾음
+        migrations.RunSQL(
+            'CREATE INDEX board_post_tags_tag_post ON board_post_tags (tag_id, post_id)',
+            'DROP INDEX board_post_tags_tag_post',
+        ),
+    ]
@@ -1,12 +1,19 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdown
+from django.utils.text import Truncator
 
+from .avatars import get_avatar_url
+
+import hashlib
 import os
 
 # Create your models here.
 
+EXCERPT_WORDS = 45
+
 class Tag(models.Model):
     name = models.CharField(max_length=50)
     slug = models.SlugField(max_length=200, unique=True, allow_unicode=True)
@@ -30,12 +37,29 @@ class Category(models.Model):
     class Meta:
         verbose_name_plural = 'Categories'
 
+class PostQuerySet(models.QuerySet):
+    def for_list(self):
+        # 목록 카드에서 쓰는 category, author, tags를 한 번에 가져오고 본문은 읽지 않음
+        return self.select_related('author', 'category').prefetch_related('tags').defer('content', 'content_html')
+
+
 class Post(models.Model):
     title = models.CharField(max_length=30)
     hook_text = models.CharField(max_length=100, blank=True)
     content = MarkdownxField()
 
+    # content를 저장할 때 한 번만 렌더링해서 보관 (content_hash로 변경 여부 확인)
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=40, blank=True, editable=False)
+
     head_image = models.ImageField(upload_to='board/images/%Y/%m/%d/', blank=True)
+    # width_field/height_field를 쓰면 값이 비어 있을 때 포스트를 불러올 때마다 이미지 파일을 열게 되므로
+    # (파일이 없으면 목록 페이지가 500) 썸네일을 만들 때 board.images에서 채움
+    head_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    head_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    # 리사이즈된 WebP/JPEG 파일 목록 (board.images에서 생성)
+    head_image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     file_upload = models.FileField(upload_to='board/files/%Y/%m/%d/', blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -47,26 +71,96 @@ class Post(models.Model):
 
     tags = models.ManyToManyField(Tag, blank=True)
 
+    objects = PostQuerySet.as_manager()
+
     def __str__(self):
         return f'[{self.pk}]{self.title} :: {self.author}'
 
     def get_absolute_url(self):
         return f'/board/{self.pk}/'
 
+    def needs_head_image_derivatives(self):
+        return bool(self.head_image) and self.head_image_derivatives.get('source') != self.head_image.name
+
+    def get_head_image_srcset(self, ext):
+        if self.needs_head_image_derivatives():
+            return ''
+        files = self.head_image_derivatives.get('formats', {}).get(ext, {})
+        return ', '.join(
+            f'{self.head_image.storage.url(name)} {width}w'
+            for width, name in sorted(files.items(), key=lambda item: int(item[0]))
+        )
+
+    def get_head_image_webp_srcset(self):
+        return self.get_head_image_srcset('webp')
+
+    def get_head_image_jpeg_srcset(self):
+        return self.get_head_image_srcset('jpeg')
+
+    def get_head_image_src(self):
+        # srcset을 지원하지 않는 브라우저용: 800px 이하에서 가장 큰 JPEG, 없으면 원본
+        files = {} if self.needs_head_image_derivatives() else self.head_image_derivatives.get('formats', {}).get('jpeg', {})
+        widths = [int(width) for width in files if int(width) <= 800]
+        if widths:
+            return self.head_image.storage.url(files[str(max(widths))])
+        return self.head_image.url
+
     def get_file_name(self):
         return os.path.basename(self.file_upload.name)
 
     def get_file_ext(self):
         return self.get_file_name().split('.')[-1]
 
+    def save(self, *args, **kwargs):
+        if self.content_hash != self.get_content_hash():
+            self.render_markdown()
+        super(Post, self).save(*args, **kwargs)
+
+    def get_content_hash(self):
+        return hashlib.sha1(self.content.encode('utf-8')).hexdigest()
+
+    def render_markdown(self):
+        self.content_html = markdown(self.content)
+        self.excerpt_html = Truncator(self.content_html).words(EXCERPT_WORDS, html=True)
+        self.content_hash = self.get_content_hash()
+
+    def is_markdown_stale(self):
+        # content가 defer된 경우에는 content를 다시 읽지 않고 저장된 hash만 확인
+        if 'content' in self.get_deferred_fields():
+            return not self.content_hash
+        return self.content_hash != self.get_content_hash()
+
+    def refresh_markdown(self):
+        self.render_markdown()
+        if self.pk:
+            Post.objects.filter(pk=self.pk).update(
+                content_html=self.content_html,
+                excerpt_html=self.excerpt_html,
+                content_hash=self.content_hash,
+            )
+
     def get_content_markdown(self):
-        return markdown(self.content)
+        if self.is_markdown_stale():
+            self.refresh_markdown()
+        return self.content_html
+
+    def get_content_excerpt(self):
+        if self.is_markdown_stale():
+            self.refresh_markdown()
+        return self.excerpt_html
 
     def get_avatar_url(self):
-        if self.author.socialaccount_set.exists():
-            return self.author.socialaccount_set.first().get_avatar_url()
-        else:
-            return 'http://placehold.it/50x50&text={ self.author.username }'
+        return get_avatar_url(self.author)
+
+    class Meta:
+        indexes = [
+            # 카테고리별 목록 (category=?, ORDER BY id DESC)
+            models.Index(fields=['category', '-id'], name='board_post_category_id'),
+            # 미분류 목록 (category IS NULL, ORDER BY id DESC)
+            models.Index(fields=['-id'], condition=Q(category__isnull=True), name='board_post_no_category'),
+            # 작성자별 목록
+            models.Index(fields=['author', '-created_at'], name='board_post_author_created'),
+        ]
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
@@ -82,7 +176,9 @@ class Comment(models.Model):
         return f'{self.post.get_absolute_url()}#comment-{self.pk}'
 
     def get_avatar_url(self):
-        if self.author.socialaccount_set.exists():
-            return self.author.socialaccount_set.first().get_avatar_url()
-        else:
-            return 'http://placehold.it/50x50&text={ self.author.username }'
\ No newline at end of file
+        return get_avatar_url(self.author)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'created_at'], name='board_comment_post_created'),
+        ]
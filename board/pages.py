@@ -0,0 +1,138 @@
+from functools import partial
+
+from django.shortcuts import get_object_or_404, render
+
+from .comments import get_comment_page
+from .context import get_board_context
+from .forms import CommentForm
+from .models import Post, Category, Tag
+from .pagination import paginate
+from .sidebar import get_category_counts
+
+POSTS_PER_PAGE = 5
+SEARCH_RESULTS_PER_PAGE = 10
+
+
+class Page:
+    # 읽기 페이지 하나. 서로 관계없는 조회(queries)와, 그 결과로 템플릿 컨텍스트를 만드는 make_context.
+    # sync 뷰는 render_page로 차례로, async 뷰는 render_gathered로 실행함
+    def __init__(self, template_name, queries, make_context):
+        self.template_name = template_name
+        self.queries = queries
+        self.make_context = make_context
+
+
+def run_all(funcs):
+    return [func() for func in funcs]
+
+
+def render_page(request, page):
+    return render(request, page.template_name, page.make_context(*run_all(page.queries)))
+
+
+def sidebar_for(request):
+    # 같이 조회한 사이드바 값을 요청의 BoardContext에 넣어 템플릿에서 다시 읽지 않게 함
+    def load():
+        board = get_board_context(request)
+        board.sidebar = get_category_counts()
+        return board.sidebar
+    return load
+
+
+def page_context(page, **extra):
+    context = {
+        'post_list': page.object_list,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+    }
+    context.update(extra)
+    return context
+
+
+def post_list_page(request):
+    return Page(
+        'board/post_list.html',
+        [
+            partial(paginate, request, Post.objects.for_list().order_by('-pk'), POSTS_PER_PAGE),
+            sidebar_for(request),
+        ],
+        lambda page, _: page_context(page),
+    )
+
+
+def category_page(request, slug):
+    # 카테고리를 읽는 동안 slug로 바로 포스트 목록을 가져옴
+    if slug == 'no_category':
+        return Page(
+            'board/post_list.html',
+            [
+                partial(paginate, request, Post.objects.for_list().filter(category=None).order_by('-pk'),
+                        POSTS_PER_PAGE),
+                sidebar_for(request),
+            ],
+            lambda page, _: page_context(page, category='미분류'),
+        )
+
+    return Page(
+        'board/post_list.html',
+        [
+            partial(Category.objects.get, slug=slug),
+            partial(paginate, request, Post.objects.for_list().filter(category__slug=slug).order_by('-pk'),
+                    POSTS_PER_PAGE),
+            sidebar_for(request),
+        ],
+        lambda category, page, _: page_context(page, category=category),
+    )
+
+
+def tag_page(request, slug):
+    def make_context(tag, page, _):
+        get_board_context(request).tag = tag
+        return page_context(page, tag=tag)
+
+    return Page(
+        'board/post_list.html',
+        [
+            partial(Tag.objects.get, slug=slug),
+            partial(paginate, request, Post.objects.for_list().filter(tags__slug=slug).order_by('-pk'),
+                    POSTS_PER_PAGE),
+            sidebar_for(request),
+        ],
+        make_context,
+    )
+
+
+def post_detail_page(request, pk):
+    # 댓글은 pk만 있으면 되므로 포스트 조회를 기다리지 않음.
+    # ?after= 이면 그 커서부터 (새로 쓰거나 고친 댓글로 이동할 때)
+    def make_context(post, comment_page, _):
+        return {
+            'object': post,
+            'post': post,
+            'comment_page': comment_page,
+            'comment_form': CommentForm,
+        }
+
+    return Page(
+        'board/post_detail.html',
+        [
+            partial(get_object_or_404, Post.objects.select_related('author', 'category').prefetch_related('tags'),
+                    pk=pk),
+            partial(get_comment_page, Post(pk=pk), after=request.GET.get('after')),
+            sidebar_for(request),
+        ],
+        make_context,
+    )
+
+
+def search_page(request, q):
+    # 검색은 요청당 한 번만 실행하고, 결과 수도 여기서 재사용
+    def search():
+        results = get_board_context(request).search(q)
+        return results, paginate(request, results, SEARCH_RESULTS_PER_PAGE)
+
+    return Page(
+        'board/post_list.html',
+        [search, sidebar_for(request)],
+        lambda search, _: page_context(search[1], search_info=f'Search: {q} ({len(search[0])})'),
+    )
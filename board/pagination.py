@@ -0,0 +1,96 @@
+import base64
+import binascii
+
+from django.db.models import QuerySet
+from django.http import Http404
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(str(value).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, parse=int):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return parse(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404('잘못된 페이지입니다.')
+
+
+def pk_key(obj):
+    return obj.pk
+
+
+def older_than(object_list, pk):
+    if isinstance(object_list, QuerySet):
+        return object_list.filter(pk__lt=pk)
+    return object_list.after(pk)
+
+
+def newer_than(object_list, pk):
+    # 기준점에서 가까운 순서(오래된 것부터)로 돌려줌
+    if isinstance(object_list, QuerySet):
+        return object_list.filter(pk__gt=pk).reverse()
+    return object_list.before(pk)
+
+
+class CursorPage:
+    def __init__(self, object_list, has_next, has_previous, key=pk_key):
+        self.object_list = object_list
+        self.key = key
+        self.has_next_page = has_next and bool(object_list)
+        self.has_previous_page = has_previous and bool(object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    def next_cursor(self):
+        return encode_cursor(self.key(self.object_list[-1])) if self.has_next_page else ''
+
+    def previous_cursor(self):
+        return encode_cursor(self.key(self.object_list[0])) if self.has_previous_page else ''
+
+
+def paginate(request, object_list, page_size):
+    # object_list는 -pk 순서로 정렬되어 있어야 함. COUNT(*)와 OFFSET 없이
+    # 마지막으로 본 pk를 기준으로 다음/이전 페이지를 가져옴
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    page = request.GET.get('page')
+
+    if after:
+        objects = list(older_than(object_list, decode_cursor(after))[:page_size + 1])
+        return CursorPage(objects[:page_size], len(objects) > page_size, True)
+
+    if before:
+        objects = list(newer_than(object_list, decode_cursor(before))[:page_size + 1])
+        has_previous = len(objects) > page_size
+        objects = objects[:page_size]
+        objects.reverse()
+        return CursorPage(objects, True, has_previous)
+
+    # 예전 ?page=N 링크 호환
+    try:
+        number = int(page) if page else 1
+    except ValueError:
+        raise Http404('잘못된 페이지입니다.')
+    if number < 1:
+        raise Http404('잘못된 페이지입니다.')
+
+    offset = (number - 1) * page_size
+    objects = list(object_list[offset:offset + page_size + 1])
+    if number > 1 and not objects:
+        raise Http404('잘못된 페이지입니다.')
+    return CursorPage(objects[:page_size], len(objects) > page_size, number > 1)
@@ -0,0 +1,245 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, When, Q
+from django.utils.html import escape, strip_tags
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+SNIPPET_LENGTH = 160
+
+WORD_RE = re.compile(r'\w+')
+
+
+def ngram_tokens(text, n=2):
+    # 한글은 띄어쓰기만으로는 부분 검색이 안 되므로 단어를 글자 n-gram으로 쪼갬
+    # 예) '파이썬' -> ['파이', '이썬']
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def document_tokens(text, n=2):
+    # 색인할 토큰. n-gram 뒤에 단어의 마지막 글자를 하나 더 넣어서, 한 글자 검색어를 접두어 검색(팀*)으로
+    # 찾을 때 모든 글자가 어떤 토큰의 첫 글자가 되게 함. 예) '팀원' -> ['팀원', '원']
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        tokens.extend(ngram_tokens(word, n))
+        if len(word) >= n:
+            tokens.append(word[-1])
+    return tokens
+
+
+def ngram_text(text):
+    return ' '.join(document_tokens(text))
+
+
+def query_phrases(q):
+    # 검색어의 단어마다 n-gram 묶음(phrase)을 만들고, 모든 단어가 맞아야 검색됨.
+    # 한 글자 단어는 그 글자로 시작하는 토큰을 찾음 (is_prefix)
+    return [(ngram_tokens(word), len(word) == 1) for word in WORD_RE.findall(q.lower())]
+
+
+def get_search_document(post):
+    return {
+        'title': post.title,
+        'hook_text': post.hook_text,
+        'content': strip_tags(post.get_content_markdown()),
+        'tags': ' '.join(tag.name for tag in post.tags.all()),
+    }
+
+
+class BaseSearchBackend:
+    # 색인 테이블은 마이그레이션 0003이 만듦
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, pk):
+        pass
+
+    def search(self, q, limit=None):
+        raise NotImplementedError
+
+    def rebuild(self):
+        for post in Post.objects.iterator(chunk_size=200):
+            self.index_post(post)
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    # 전문 검색을 지원하지 않는 DB용: LIKE 검색 후 최신순
+    def search(self, q, limit=None):
+        condition = Q()
+        for word in WORD_RE.findall(q):
+            condition &= (
+                Q(title__icontains=word) | Q(hook_text__icontains=word) |
+                Q(content__icontains=word) | Q(tags__name__icontains=word)
+            )
+        return list(
+            Post.objects.filter(condition).order_by('-pk').values_list('pk', flat=True).distinct()[:limit]
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    table = 'board_post_fts'
+    # bm25 가중치: title, hook_text, content, tags
+    weights = (10.0, 4.0, 1.0, 6.0)
+
+    def index_post(self, post):
+        document = get_search_document(post)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, hook_text, content, tags) VALUES (%s, %s, %s, %s, %s)',
+                [post.pk] + [ngram_text(document[field]) for field in ('title', 'hook_text', 'content', 'tags')],
+            )
+
+    def remove_post(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [pk])
+
+    def search(self, q, limit=None):
+        phrases = [(tokens, is_prefix) for tokens, is_prefix in query_phrases(q) if tokens]
+        if not phrases:
+            return []
+        match = ' AND '.join(
+            '"' + ' '.join(tokens) + '"' + ('*' if is_prefix else '') for tokens, is_prefix in phrases
+        )
+        weights = ', '.join(str(w) for w in self.weights)
+        # 결과 수를 정확히 보여줘야 하므로 기본으로는 자르지 않음 (bm25 정렬은 어차피 모든 결과를 읽음)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, {weights}), rowid DESC LIMIT %s',
+                [match, -1 if limit is None else limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgreSQLSearchBackend(BaseSearchBackend):
+    table = 'board_post_search'
+    # setweight 등급: title(A), tags(B), hook_text(C), content(D)
+    weights = (('title', 'A'), ('tags', 'B'), ('hook_text', 'C'), ('content', 'D'))
+
+    def index_post(self, post):
+        document = get_search_document(post)
+        vector = ' || '.join(
+            f"setweight(to_tsvector('simple', %s), '{weight}')" for field, weight in self.weights
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table} (post_id, document) VALUES (%s, {vector}) '
+                f'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                [post.pk] + [ngram_text(document[field]) for field, weight in self.weights],
+            )
+
+    def remove_post(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE post_id = %s', [pk])
+
+    def search(self, q, limit=None):
+        phrases = [(tokens, is_prefix) for tokens, is_prefix in query_phrases(q) if tokens]
+        if not phrases:
+            return []
+        # n-gram은 \w 문자로만 이루어져 있으므로 따옴표로 감싸도 안전함
+        tsquery = ' & '.join(
+            '(' + ' <-> '.join(f"'{token}'" + (':*' if is_prefix else '') for token in tokens) + ')'
+            for tokens, is_prefix in phrases
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT post_id FROM {self.table}, to_tsquery('simple', %s) query "
+                f'WHERE document @@ query '
+                f'ORDER BY ts_rank(document, query) DESC, post_id DESC LIMIT %s',
+                [tsquery, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': 'board.search.SQLiteSearchBackend',
+    'postgresql': 'board.search.PostgreSQLSearchBackend',
+}
+
+
+def get_search_backend(vendor=None):
+    path = getattr(settings, 'BOARD_SEARCH_BACKEND', None)
+    if not path:
+        path = DEFAULT_BACKENDS.get(vendor or connection.vendor, 'board.search.BasicSearchBackend')
+    return import_string(path)()
+
+
+def highlight(text, q, length=SNIPPET_LENGTH):
+    words = [w for w in WORD_RE.findall(q) if w]
+    if not text or not words:
+        return ''
+
+    pattern = re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(first.start() - length // 4, 0) if first else 0
+    fragment = text[start:start + length]
+
+    html = ''
+    position = 0
+    for match in pattern.finditer(fragment):
+        html += escape(fragment[position:match.start()]) + f'<mark>{escape(match.group())}</mark>'
+        position = match.end()
+    html += escape(fragment[position:])
+
+    if start > 0:
+        html = '… ' + html
+    if start + length < len(text):
+        html += ' …'
+    return mark_safe(html)
+
+
+class SearchResults:
+    # 검색된 pk 목록만 들고 있다가, 페이지에 필요한 포스트만 읽어옴
+    def __init__(self, q, pks):
+        self.q = q
+        self.pks = pks
+
+    def __len__(self):
+        return len(self.pks)
+
+    def count(self):
+        return len(self.pks)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __bool__(self):
+        return bool(self.pks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.fetch(self.pks[index])
+        return self.fetch([self.pks[index]])[0]
+
+    def after(self, pk):
+        # 커서 페이지네이션용: 검색 순위에서 pk 다음에 오는 결과들
+        index = self.pks.index(pk) if pk in self.pks else len(self.pks)
+        return SearchResults(self.q, self.pks[index + 1:])
+
+    def before(self, pk):
+        index = self.pks.index(pk) if pk in self.pks else 0
+        return SearchResults(self.q, self.pks[:index][::-1])
+
+    def fetch(self, pks):
+        if not pks:
+            return []
+        order = Case(*[When(pk=pk, then=position) for position, pk in enumerate(pks)])
+        posts = list(Post.objects.for_list().defer(None).filter(pk__in=pks).order_by(order))
+        for post in posts:
+            post.search_snippet = highlight(strip_tags(post.get_content_markdown()), self.q)
+        return posts
+
+
+def search_posts(q):
+    return SearchResults(q, get_search_backend().search(q))
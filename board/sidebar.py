@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Post, Category
+
+CATEGORY_COUNTS_CACHE_KEY = 'board:category_counts'
+CATEGORY_COUNTS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_category_counts():
+    counts = cache.get(CATEGORY_COUNTS_CACHE_KEY)
+    if counts is None:
+        counts = build_category_counts()
+        cache.set(CATEGORY_COUNTS_CACHE_KEY, counts, CATEGORY_COUNTS_CACHE_TIMEOUT)
+    return counts
+
+
+def build_category_counts():
+    # 카테고리별 포스트 수를 GROUP BY 한 번으로 계산 (category=None은 미분류)
+    post_counts = dict(
+        Post.objects.order_by().values_list('category').annotate(count=Count('pk'))
+    )
+
+    categories = list(Category.objects.all())
+    for category in categories:
+        category.post_count = post_counts.get(category.pk, 0)
+
+    return {
+        'categories': categories,
+        'no_category_post_count': post_counts.get(None, 0),
+    }
+
+
+def invalidate_category_counts():
+    cache.delete(CATEGORY_COUNTS_CACHE_KEY)
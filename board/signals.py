@@ -0,0 +1,147 @@
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+from allauth.socialaccount.models import SocialAccount
+
+from .avatars import invalidate_avatar_url
+from .caching import bump_board_version, bump_fragment_version
+from .db import check_connection_health, configure_sqlite
+from .feeds import schedule_feed_refresh
+from .images import schedule_derivatives, clear_derivatives, delete_derivatives
+from .metrics import install_query_recorder
+from .models import Post, Category, Tag, Comment
+from .search import get_search_backend
+from .sidebar import invalidate_category_counts
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_category_counts(sender, **kwargs):
+    invalidate_category_counts()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    get_search_backend().index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_index(sender, instance, **kwargs):
+    get_search_backend().remove_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # tag.post_set.clear()는 pk_set을 넘겨주지 않으므로 지우기 전에 태그가 붙어 있던 포스트를 기억해 둠
+        instance._search_cleared_pks = set(instance.post_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    backend = get_search_backend()
+    if not reverse:
+        backend.index_post(instance)
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_search_cleared_pks', set())
+        instance._search_cleared_pks = set()
+    for post in Post.objects.filter(pk__in=pk_set):
+        backend.index_post(post)
+
+
+@receiver(post_save, sender=Tag)
+def index_tag_posts(sender, instance, created, **kwargs):
+    if created:
+        return
+    backend = get_search_backend()
+    for post in instance.post_set.all():
+        backend.index_post(post)
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def reset_avatar_url(sender, instance, **kwargs):
+    invalidate_avatar_url(instance.user_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Post.tags.through)
+def reset_page_cache(sender, **kwargs):
+    bump_board_version()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Post.tags.through)
+def reset_fragment_cache(sender, **kwargs):
+    # 포스트 카드에 나오는 태그/카테고리 이름과 포스트의 태그 목록은 updated_at을 바꾸지 않으므로 fragment를 모두 버림
+    bump_fragment_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_fragment_cache_for_user(sender, update_fields=None, **kwargs):
+    # 카드/댓글/피드에 나오는 사용자 이름이 바뀔 수 있을 때만 (로그인 때마다 last_login만 저장되는 경우는 제외)
+    if update_fields is None or 'username' in update_fields:
+        bump_fragment_version()
+        schedule_feed_refresh()
+
+
+@receiver(post_save, sender=Post)
+def refresh_post_feeds(sender, instance, **kwargs):
+    schedule_feed_refresh(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_post_tag_feeds(sender, instance, action, reverse, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        schedule_feed_refresh(None if reverse else instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_feeds_on_change(sender, **kwargs):
+    schedule_feed_refresh()
+
+
+@receiver(post_save, sender=Post)
+def update_head_image_derivatives(sender, instance, **kwargs):
+    if instance.needs_head_image_derivatives():
+        schedule_derivatives(instance)
+    elif not instance.head_image and instance.head_image_derivatives:
+        clear_derivatives(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_head_image_derivatives(sender, instance, **kwargs):
+    # 지운 포스트의 썸네일 파일도 지움 (DB 행은 이미 없으므로 파일만)
+    if instance.head_image_derivatives:
+        delete_derivatives(instance.head_image.storage, instance.head_image_derivatives)
+
+
+@receiver(connection_created)
+def setup_connection(sender, connection, **kwargs):
+    configure_sqlite(connection)
+    install_query_recorder(connection)
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    check_connection_health()
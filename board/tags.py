@@ -0,0 +1,80 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from .models import Tag
+
+TAG_NAME_MAX_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def parse_tags(tags_str):
+    # 'a; b, c' 형태의 문자열을 정리된 태그 이름 목록으로 (빈 값, 중복 제거, 순서 유지)
+    names = []
+    for token in re.split('[;,]', tags_str or ''):
+        name = ' '.join(token.split())[:TAG_NAME_MAX_LENGTH].strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def format_tags(post):
+    return '; '.join(tag.name for tag in post.tags.all())
+
+
+def unique_slugs(names):
+    # 새 태그들의 slug를 만들고, 이미 있는 slug와 겹치면 -2, -3 ... 을 붙임 (조회는 한 번)
+    bases = {name: slugify(name, allow_unicode=True) or 'tag' for name in names}
+    taken = set(
+        Tag.objects.filter(reduce(or_, [Q(slug__startswith=base) for base in set(bases.values())]))
+        .values_list('slug', flat=True)
+    )
+
+    slugs = {}
+    for name in names:
+        slug = base = bases[name]
+        number = 2
+        while slug in taken:
+            slug = f'{base}-{number}'
+            number += 1
+        taken.add(slug)
+        slugs[name] = slug
+    return slugs
+
+
+def get_or_create_tags(names):
+    if not names:
+        return []
+
+    existing = {}
+    for tag in Tag.objects.filter(name__in=names).order_by('pk'):
+        existing.setdefault(tag.name, tag)
+
+    missing = [name for name in names if name not in existing]
+    if missing:
+        slugs = unique_slugs(missing)
+        created = Tag.objects.bulk_create([Tag(name=name, slug=slugs[name]) for name in missing])
+        if any(tag.pk is None for tag in created):
+            # bulk_create가 pk를 돌려주지 않는 DB(SQLite 등)에서는 slug로 다시 읽음
+            created = Tag.objects.filter(slug__in=slugs.values())
+        existing.update((tag.name, tag) for tag in created)
+
+    return [existing[name] for name in names]
+
+
+def set_post_tags(post, tags_str):
+    # 바뀐 태그만 추가/삭제함
+    with transaction.atomic():
+        tags = get_or_create_tags(parse_tags(tags_str))
+        current = {tag.pk: tag for tag in post.tags.all()}
+        new = {tag.pk: tag for tag in tags}
+
+        to_remove = [tag for pk, tag in current.items() if pk not in new]
+        to_add = [tag for pk, tag in new.items() if pk not in current]
+        if to_remove:
+            post.tags.remove(*to_remove)
+        if to_add:
+            post.tags.add(*to_add)
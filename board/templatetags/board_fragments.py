@@ -0,0 +1,10 @@
+from django import template
+
+from ..fragments import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    return render_post_cards(posts)
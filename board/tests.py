@@ -1,10 +1,64 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from PIL import Image
+from io import BytesIO, StringIO
+import asyncio
+import importlib
+import json
+import logging
+import shutil
+import tempfile
+from xml.etree import ElementTree
+from django.db import connection
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from contextlib import contextmanager
 from bs4 import BeautifulSoup
 from django.contrib.auth.models import User
+from allauth.socialaccount.models import SocialAccount
 from .models import Post, Category, Tag, Comment
+from .sidebar import get_category_counts, invalidate_category_counts
+from .search import search_posts
+from .tags import parse_tags, set_post_tags
+from .async_views import gather_queries, parallel_queries_enabled
+from . import benchmark
+from .metrics import RequestMetrics, current_metrics, registry
+from .middleware import AsyncWhiteNoiseMiddleware
+from .context import BoardContext
+from .explain import explain_url, find_full_scans
+from .management.commands.check_query_plans import default_paths
+from .assets import STATIC_DIR, outdated_bundles
+from .caching import get_fragment_version
+from asgiref.sync import sync_to_async
+from . import urls as board_urls
+from single_pages import urls as single_pages_urls
+from django_project import urls as project_urls
 
 # Create your tests here.
 
+
+@contextmanager
+def async_page_urls():
+    # 읽기 페이지의 sync/async 뷰는 URL 모듈을 불러올 때 BOARD_ASYNC_VIEWS로 정해지므로 다시 불러옴
+    def reload_urls():
+        for module in (board_urls, single_pages_urls, project_urls):
+            importlib.reload(module)
+        clear_url_caches()
+
+    try:
+        with override_settings(BOARD_ASYNC_VIEWS=True):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
 class TestView(TestCase):
     def setUp(self):
         self.client = Client()
@@ -464,4 +518,848 @@ class TestView(TestCase):
         self.assertNotIn(self.post_001.title, main_area.text)
         self.assertNotIn(self.post_002.title, main_area.text)
         self.assertIn(self.post_003.title, main_area.text)
-        self.assertIn(post_about_python.title, main_area.text)
\ No newline at end of file
+        self.assertIn(post_about_python.title, main_area.text)
+
+    def test_content_markdown_cache(self):
+        # 저장할 때 렌더링된 HTML과 요약이 함께 저장됨
+        self.assertIn('Hello World', self.post_001.content_html)
+        self.assertEqual(self.post_001.content_hash, self.post_001.get_content_hash())
+
+        long_post = Post.objects.create(
+            title='긴 포스트',
+            content='**word** ' * 100,
+            author=self.user_kim,
+        )
+        self.assertIn('<strong>', long_post.excerpt_html)
+        self.assertLess(len(long_post.excerpt_html), len(long_post.content_html))
+
+        # 수정하면 hash가 바뀌면서 다시 렌더링됨
+        long_post.content = '# 새로운 내용'
+        long_post.save()
+        long_post.refresh_from_db()
+        self.assertIn('<h1>새로운 내용</h1>', long_post.content_html)
+        self.assertIn('<h1>새로운 내용</h1>', long_post.excerpt_html)
+
+        # 저장된 값이 없으면 읽을 때 렌더링해서 채워 넣음
+        Post.objects.filter(pk=long_post.pk).update(content_html='', excerpt_html='', content_hash='')
+        long_post = Post.objects.get(pk=long_post.pk)
+        self.assertIn('새로운 내용', long_post.get_content_excerpt())
+        long_post.refresh_from_db()
+        self.assertEqual(long_post.content_hash, long_post.get_content_hash())
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_post_list_query_count(self):
+        urls = [
+            '/board/',
+            self.category_programming.get_absolute_url(),
+            '/board/category/no_category/',
+            self.tag_python.get_absolute_url(),
+            '/board/search/포스트/',
+        ]
+        before = [self.count_queries(url) for url in urls]
+
+        # 포스트가 늘어나도 페이지당 쿼리 수는 그대로여야 함
+        for i in range(2):
+            for category in (self.category_programming, None):
+                post = Post.objects.create(
+                    title=f'추가 포스트 {i}',
+                    content='추가 포스트입니다.',
+                    category=category,
+                    author=self.user_kim,
+                )
+                post.tags.add(self.tag_python, self.tag_hello)
+
+        after = [self.count_queries(url) for url in urls]
+        self.assertEqual(before, after)
+
+    def test_category_counts(self):
+        invalidate_category_counts()
+        with self.assertNumQueries(2):
+            counts = get_category_counts()
+        self.assertEqual(
+            [(c.name, c.post_count) for c in counts['categories']],
+            [('programming', 1), ('music', 1)],
+        )
+        self.assertEqual(counts['no_category_post_count'], 1)
+
+        # 캐시에서 읽으므로 쿼리 없음
+        with self.assertNumQueries(0):
+            get_category_counts()
+
+        # 포스트 저장/삭제 시 캐시가 무효화됨
+        self.post_003.category = self.category_music
+        self.post_003.save()
+        counts = get_category_counts()
+        self.assertEqual(counts['categories'][1].post_count, 2)
+        self.assertEqual(counts['no_category_post_count'], 0)
+
+        self.post_001.delete()
+        counts = get_category_counts()
+        self.assertEqual(counts['categories'][0].post_count, 0)
+
+    def test_search_engine(self):
+        post_in_content = Post.objects.create(
+            title='풋살 경기 후기',
+            content='오늘은 축구장에서 파이썬 스터디 팀과 경기를 했습니다.',
+            author=self.user_kim,
+        )
+        post_in_title = Post.objects.create(
+            title='파이썬 스터디 모집',
+            content='함께 공부할 분을 찾습니다.',
+            author=self.user_kim,
+        )
+
+        # 본문, 제목, 태그를 모두 검색하고 제목에 있는 포스트가 먼저 나옴
+        results = search_posts('파이썬')
+        self.assertEqual(results.pks[0], post_in_title.pk)
+        self.assertEqual(
+            set(results.pks),
+            {post_in_title.pk, post_in_content.pk, self.post_003.pk},
+        )
+
+        # 한글 부분 검색 (n-gram)
+        self.assertEqual(search_posts('축구').pks, [post_in_content.pk])
+        self.assertEqual(search_posts('스터디 모집').pks, [post_in_title.pk])
+        self.assertEqual(search_posts('없는검색어').pks, [])
+
+        # 한 글자 검색어도 단어 안의 글자를 찾음 (단어의 첫/가운데/마지막 글자)
+        self.assertIn(post_in_content.pk, search_posts('팀').pks)
+        self.assertIn(post_in_content.pk, search_posts('구').pks)
+        self.assertEqual(set(search_posts('썬').pks), set(search_posts('파이썬').pks))
+        self.assertIn(post_in_title.pk, search_posts('모 파이썬').pks)
+
+        # 검색어 하이라이트
+        response = self.client.get('/board/search/축구/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        main_area = soup.find('div', id='main-area')
+        self.assertIn('Search: 축구 (1)', main_area.text)
+        self.assertEqual(main_area.find('mark').text, '축구')
+
+        # 수정/삭제하면 색인도 바뀜
+        post_in_content.content = '오늘은 농구를 했습니다.'
+        post_in_content.save()
+        self.assertEqual(search_posts('축구').pks, [])
+        post_in_title.delete()
+        self.assertEqual(search_posts('모집').pks, [])
+
+        # 태그 변경도 반영됨
+        self.post_001.tags.add(self.tag_python)
+        self.assertIn(self.post_001.pk, search_posts('python').pks)
+        # 태그 쪽에서 지우면 붙어 있던 포스트만 다시 색인함
+        self.tag_python.post_set.clear()
+        self.assertNotIn(self.post_001.pk, search_posts('python').pks)
+
+    def post_titles(self, response):
+        soup = BeautifulSoup(response.content, 'html.parser')
+        main_area = soup.find('div', id='main-area')
+        return [card.h2.text for card in main_area.find_all('div', class_='card')], soup
+
+    def test_cursor_pagination(self):
+        for i in range(4, 13):
+            Post.objects.create(
+                title=f'포스트 {i}',
+                content=f'{i}번째 포스트',
+                category=self.category_programming,
+                author=self.user_kim,
+            )
+
+        # 첫 페이지: 최신 5개, Newer 링크 없음
+        titles, soup = self.post_titles(self.client.get('/board/'))
+        self.assertEqual(titles, [f'포스트 {i}' for i in range(12, 7, -1)])
+        pagination = soup.find('ul', class_='pagination')
+        older_url = pagination.find('a', text='← Older').attrs['href']
+        self.assertTrue(older_url.startswith('?after='))
+        self.assertEqual(pagination.find('a', text='Newer →').attrs['href'], '#!')
+
+        # 두 번째 페이지는 COUNT 없이 커서로 가져옴
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/board/' + older_url)
+        self.assertFalse(any('OFFSET' in q['sql'] for q in context.captured_queries))
+        titles, soup = self.post_titles(response)
+        self.assertEqual(titles, ['포스트 7', '포스트 6', '포스트 5', '포스트 4', self.post_003.title])
+
+        # 이전 페이지(Newer)로 돌아가기
+        pagination = soup.find('ul', class_='pagination')
+        newer_url = pagination.find('a', text='Newer →').attrs['href']
+        titles, soup = self.post_titles(self.client.get('/board/' + newer_url))
+        self.assertEqual(titles, [f'포스트 {i}' for i in range(12, 7, -1)])
+
+        # 마지막 페이지
+        titles, soup = self.post_titles(self.client.get('/board/?page=3'))
+        self.assertEqual(titles, [self.post_002.title, self.post_001.title])
+        pagination = soup.find('ul', class_='pagination')
+        self.assertEqual(pagination.find('a', text='← Older').attrs['href'], '#!')
+
+        # 잘못된 페이지
+        self.assertEqual(self.client.get('/board/?page=10').status_code, 404)
+        self.assertEqual(self.client.get('/board/?after=!!!').status_code, 404)
+
+        # 카테고리 페이지도 페이지네이션 됨
+        titles, soup = self.post_titles(self.client.get(self.category_programming.get_absolute_url()))
+        self.assertEqual(len(titles), 5)
+        older_url = soup.find('ul', class_='pagination').find('a', text='← Older').attrs['href']
+        titles, soup = self.post_titles(self.client.get(self.category_programming.get_absolute_url() + older_url))
+        self.assertEqual(titles, ['포스트 7', '포스트 6', '포스트 5', '포스트 4', self.post_001.title])
+
+    def test_avatar_url(self):
+        cache.clear()
+
+        # 소셜 계정이 없으면 외부 서버 없이 기본 아바타를 만듦
+        self.assertTrue(self.comment_001.get_avatar_url().startswith('data:image/svg+xml'))
+
+        SocialAccount.objects.create(
+            user=self.user_park, provider='google', uid='park',
+            extra_data={'picture': 'https://example.com/park.png'},
+        )
+        Comment.objects.create(post=self.post_001, author=self.user_park, content='댓글 0')
+        cache.clear()
+        query_count = self.count_queries(self.post_001.get_absolute_url())
+
+        # 댓글 수와 관계없이 아바타 조회는 한 번의 prefetch로 끝남
+        for i in range(1, 4):
+            Comment.objects.create(post=self.post_001, author=self.user_park, content=f'댓글 {i}')
+        cache.clear()
+        self.assertEqual(self.count_queries(self.post_001.get_absolute_url()), query_count)
+
+        response = self.client.get(self.post_001.get_absolute_url())
+        soup = BeautifulSoup(response.content, 'html.parser')
+        comment_area = soup.find('div', id='comment-area')
+        self.assertEqual(len(comment_area.find_all('img', src='https://example.com/park.png')), 4)
+
+        # 캐시에 있으면 쿼리 없음
+        comment = Comment.objects.select_related('author').filter(author=self.user_park).first()
+        with self.assertNumQueries(0):
+            self.assertEqual(comment.get_avatar_url(), 'https://example.com/park.png')
+
+        # 소셜 계정 정보가 바뀌면 캐시가 무효화됨
+        account = SocialAccount.objects.get(user=self.user_park)
+        account.extra_data = {'picture': 'https://example.com/park2.png'}
+        account.save()
+        comment = Comment.objects.select_related('author').filter(author=self.user_park).first()
+        self.assertEqual(comment.get_avatar_url(), 'https://example.com/park2.png')
+
+    @override_settings(BOARD_COMMENTS_PER_PAGE=3)
+    def test_comment_pagination(self):
+        cache.clear()
+        query_count = self.count_queries(self.post_001.get_absolute_url())
+
+        for i in range(2, 9):
+            Comment.objects.create(post=self.post_001, author=self.user_park, content=f'{i}번째 댓글')
+
+        # 댓글이 늘어나도 상세 페이지의 쿼리 수는 같음
+        cache.clear()
+        self.assertEqual(self.count_queries(self.post_001.get_absolute_url()), query_count)
+
+        response = self.client.get(self.post_001.get_absolute_url())
+        soup = BeautifulSoup(response.content, 'html.parser')
+        comment_area = soup.find('div', id='comment-area')
+        self.assertEqual(len(comment_area.find_all('div', class_='media')), 3)
+        self.assertIn('첫 번째 댓글입니다.', comment_area.text)
+        self.assertNotIn('4번째 댓글', comment_area.text)
+
+        # 더 보기 버튼으로 다음 댓글들을 HTML 조각으로 받아옴
+        contents = []
+        more_button = comment_area.find('div', id='comment-more').button
+        while more_button:
+            response = self.client.get(more_button.attrs['data-url'])
+            self.assertEqual(response.status_code, 200)
+            fragment = BeautifulSoup(response.content, 'html.parser')
+            self.assertIsNone(fragment.find('html'))
+            contents += [div.find('p').text.strip() for div in fragment.find_all('div', class_='media')]
+            more = fragment.find('div', id='comment-more')
+            more_button = more.button if more else None
+        self.assertEqual(contents, [f'{i}번째 댓글' for i in range(4, 9)])
+
+    def test_comment_redirect(self):
+        # 댓글이 첫 댓글 페이지(20개)에 들어가지 않으면 그 댓글이 있는 페이지로 이동함
+        for i in range(2, 22):
+            Comment.objects.create(post=self.post_001, author=self.user_park, content=f'{i}번째 댓글')
+
+        self.client.login(username='kim', password='kimdjango')
+        response = self.client.post(self.post_001.get_absolute_url() + 'new_comment/', {'content': 'USER KIM의 새 댓글'})
+        new_comment = Comment.objects.last()
+        url = response['Location']
+        self.assertTrue(url.startswith(f'{self.post_001.get_absolute_url()}?after='))
+        self.assertTrue(url.endswith(f'#comment-{new_comment.pk}'))
+
+        response = self.client.get(url)
+        comment_area = BeautifulSoup(response.content, 'html.parser').find('div', id='comment-area')
+        comments = comment_area.find_all('div', class_='media')
+        self.assertEqual([div.attrs['id'] for div in comments][-1], f'comment-{new_comment.pk}')
+        self.assertEqual(len(comments), 2)
+        self.assertIn('21번째 댓글', comment_area.text)
+        self.assertTrue(comment_area.find('div', id='comment-first'))
+
+        # 수정한 뒤에도 같은 페이지로, 첫 페이지의 댓글이면 커서 없이
+        response = self.client.post(f'/board/update_comment/{new_comment.pk}/', {'content': '고친 댓글'})
+        self.assertEqual(response['Location'], url)
+        response = self.client.post(f'/board/update_comment/{self.comment_001.pk}/', {'content': '고친 첫 댓글'})
+        self.assertEqual(response['Location'], f'{self.post_001.get_absolute_url()}#comment-{self.comment_001.pk}')
+
+    def test_anonymous_page_cache(self):
+        urls = [
+            '/board/',
+            self.post_001.get_absolute_url(),
+            self.category_programming.get_absolute_url(),
+            self.tag_hello.get_absolute_url(),
+            '/',
+        ]
+        for url in urls:
+            first = self.client.get(url)
+            # 같은 버전에서는 DB를 읽지 않음 (상세 페이지는 Last-Modified 확인용 쿼리 하나)
+            with self.assertNumQueries(1 if url == self.post_001.get_absolute_url() else 0):
+                second = self.client.get(url)
+            self.assertEqual(first.content, second.content)
+
+        # 포스트/댓글/태그가 바뀌면 바로 새 내용이 보임
+        self.post_001.title = '제목을 수정했습니다.'
+        self.post_001.save()
+        self.assertIn('제목을 수정했습니다.', self.client.get('/board/').content.decode())
+
+        Comment.objects.create(post=self.post_001, author=self.user_park, content='새 댓글')
+        self.assertIn('새 댓글', self.client.get(self.post_001.get_absolute_url()).content.decode())
+
+        self.post_002.tags.add(self.tag_hello)
+        self.assertIn(self.post_002.title, self.client.get(self.tag_hello.get_absolute_url()).content.decode())
+
+        # 로그인한 사용자는 캐시하지 않음
+        self.client.login(username='park', password='parkdjango')
+        self.client.get('/board/')
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/board/')
+        self.assertGreater(len(context.captured_queries), 0)
+
+    def test_conditional_get(self):
+        # 목록 페이지: ETag가 같으면 304
+        response = self.client.get('/board/')
+        self.assertIn('public', response['Cache-Control'])
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/board/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        # 상세 페이지: 쿼리 하나로 검증
+        url = self.post_001.get_absolute_url()
+        response = self.client.get(url)
+        self.assertTrue(response.has_header('Last-Modified'))
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 댓글이 달리면 새로 받아옴
+        Comment.objects.create(post=self.post_001, author=self.user_park, content='새 댓글')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # 로그인한 사용자는 다른 ETag와 private 캐시
+        self.client.login(username='kim', password='kimdjango')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_set_post_tags(self):
+        # 빈 값과 중복은 무시하고 공백을 정리함
+        self.assertEqual(parse_tags(' a;; b ,a,  c   d ; '), ['a', 'b', 'c d'])
+
+        # 기존 태그 재사용 + 새 태그 생성, slug가 겹치면 번호를 붙임
+        with CaptureQueriesContext(connection) as few:
+            set_post_tags(self.post_002, 'python; Python!; new tag, new tag')
+        self.assertEqual(
+            sorted(self.post_002.tags.values_list('name', 'slug')),
+            [('Python!', 'python-2'), ('new tag', 'new-tag'), ('python', 'python')],
+        )
+
+        # 태그 수와 관계없이 쿼리 수는 같음
+        post = Post.objects.create(title='태그 많은 포스트', content='태그', author=self.user_kim)
+        many_tags = 'python; ' + '; '.join(f'tag {i}' for i in range(20))
+        with CaptureQueriesContext(connection) as many:
+            set_post_tags(post, many_tags)
+        self.assertEqual(post.tags.count(), 21)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+        # 바뀐 것이 없으면 읽기만 함
+        with CaptureQueriesContext(connection) as context:
+            set_post_tags(post, many_tags)
+        self.assertTrue(all(
+            q['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE')) for q in context.captured_queries
+        ))
+
+        # 일부만 바꾸면 바뀐 태그만 반영
+        set_post_tags(post, 'python; tag 0; 새 태그')
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['python', 'tag 0', '새 태그'])
+
+        set_post_tags(post, '')
+        self.assertEqual(post.tags.count(), 0)
+
+    def test_head_image_derivatives(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+
+        # EXIF가 들어간 큰 JPEG 업로드
+        image = Image.new('RGB', (1600, 900), 'green')
+        exif = Image.Exif()
+        exif[0x010F] = 'Phone Maker'
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', exif=exif)
+
+        with self.settings(MEDIA_ROOT=media_root, BOARD_IMAGE_DERIVATIVES_SYNC=True):
+            post = Post.objects.create(
+                title='사진 포스트',
+                content='사진',
+                author=self.user_kim,
+                head_image=SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg'),
+            )
+            post.refresh_from_db()
+
+            self.assertEqual((post.head_image_width, post.head_image_height), (1600, 900))
+            self.assertEqual(sorted(post.head_image_derivatives['formats']), ['jpeg', 'webp'])
+            self.assertEqual(sorted(post.head_image_derivatives['formats']['webp'], key=int), ['400', '800', '1200'])
+
+            with post.head_image.storage.open(post.head_image_derivatives['formats']['jpeg']['800']) as f:
+                derivative = Image.open(f)
+                self.assertEqual(derivative.size, (800, 450))
+                self.assertNotIn(0x010F, derivative.getexif())
+
+            response = self.client.get('/board/')
+            soup = BeautifulSoup(response.content, 'html.parser')
+            card = soup.find('div', id=f'post-{post.pk}')
+            self.assertIn('-400w.webp 400w', card.find('source').attrs['srcset'])
+            img = card.find('img')
+            self.assertEqual(img.attrs['loading'], 'lazy')
+            self.assertTrue(img.attrs['src'].endswith('-800w.jpeg'))
+
+            # 파일이 없는 이미지(크기를 채우기 전의 예전 포스트 등)가 있어도 목록은 열림
+            missing = Post.objects.create(title='파일 없음', content='사진', author=self.user_kim)
+            Post.objects.filter(pk=missing.pk).update(head_image='board/images/missing.jpg')
+            response = self.client.get('/board/')
+            self.assertEqual(response.status_code, 200)
+            img = BeautifulSoup(response.content, 'html.parser').find('div', id=f'post-{missing.pk}').find('img')
+            self.assertTrue(img.attrs['src'].endswith('/missing.jpg'))
+            self.assertNotIn('width', img.attrs)
+            out, err = StringIO(), StringIO()
+            call_command('generate_image_derivatives', stdout=out, stderr=err)
+            self.assertIn('1 image(s) failed.', out.getvalue())
+            self.assertIn('missing.jpg', err.getvalue())
+
+            # 이미지를 지우면 썸네일도 삭제
+            old_file = post.head_image_derivatives['formats']['webp']['400']
+            post.head_image = None
+            post.save()
+            post.refresh_from_db()
+            self.assertEqual(post.head_image_derivatives, {})
+            self.assertIsNone(post.head_image_width)
+            self.assertFalse(post.head_image.storage.exists(old_file))
+
+            # 포스트를 지워도 썸네일을 삭제
+            post.head_image = SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+            post.save()
+            post.refresh_from_db()
+            files = [name for files in post.head_image_derivatives['formats'].values() for name in files.values()]
+            self.assertTrue(all(default_storage.exists(name) for name in files))
+            post.delete()
+            self.assertFalse(any(default_storage.exists(name) for name in files))
+
+    def test_download_file(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+
+        with self.settings(MEDIA_ROOT=media_root):
+            data = bytes(range(256)) * 100
+            self.post_001.file_upload = SimpleUploadedFile('경기 규칙.pdf', data)
+            self.post_001.save()
+            url = f'/board/{self.post_001.pk}/download/'
+
+            response = self.client.get(self.post_001.get_absolute_url())
+            soup = BeautifulSoup(response.content, 'html.parser')
+            self.assertTrue(soup.find('a', href=url))
+
+            # 전체 파일 (권한 확인은 쿼리 하나)
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), data)
+            self.assertEqual(response['Content-Type'], 'application/pdf')
+            self.assertEqual(response['Accept-Ranges'], 'bytes')
+            self.assertIn("filename*=utf-8''", response['Content-Disposition'])
+            etag = response['ETag']
+
+            # Range 요청
+            response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(data)}')
+            self.assertEqual(b''.join(response.streaming_content), data[10:20])
+
+            response = self.client.get(url, HTTP_RANGE='bytes=-5')
+            self.assertEqual(b''.join(response.streaming_content), data[-5:])
+
+            response = self.client.get(url, HTTP_RANGE=f'bytes={len(data)}-')
+            self.assertEqual(response.status_code, 416)
+            self.assertEqual(response['Content-Range'], f'bytes */{len(data)}')
+
+            # 끝이 시작보다 앞인 잘못된 Range는 무시하고 전체 파일
+            response = self.client.get(url, HTTP_RANGE='bytes=5-3')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), data)
+
+            # If-Range가 맞지 않으면 전체 파일
+            response = self.client.get(url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"old"')
+            self.assertEqual(response.status_code, 200)
+
+            # 조건부 GET
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            # 웹서버로 넘기기
+            with self.settings(BOARD_ATTACHMENT_SENDFILE='x-accel-redirect'):
+                response = self.client.get(url)
+                self.assertEqual(response.content, b'')
+                self.assertTrue(response['X-Accel-Redirect'].startswith('/protected-media/board/files/'))
+
+            # 첨부파일이 없는 포스트, 저장소에서 지워진 파일
+            self.assertEqual(self.client.get(f'/board/{self.post_002.pk}/download/').status_code, 404)
+            self.post_001.file_upload.storage.delete(self.post_001.file_upload.name)
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    async def test_async_views(self):
+        # ASGI용 async 뷰도 sync 뷰와 같은 페이지를 만듦 (조회와 컨텍스트는 pages.py를 같이 씀)
+        self.assertFalse(asyncio.iscoroutinefunction(resolve('/board/').func))
+        await sync_to_async(cache.clear)()
+        with async_page_urls():
+            self.assertTrue(asyncio.iscoroutinefunction(resolve('/board/').func))
+            urls = [
+                '/board/',
+                f'/board/category/{self.category_programming.slug}/',
+                '/board/category/no_category/',
+                f'/board/tag/{self.tag_python.slug}/',
+                self.post_001.get_absolute_url(),
+                '/board/search/category/',
+                '/',
+            ]
+            for url in urls:
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200, url)
+                self.assertIn('public', response['Cache-Control'])
+                # 워커 스레드에서 실행한 쿼리도 요청 측정값에 들어감
+                self.assertRegex(response['Server-Timing'], r'[1-9]\d* queries', url)
+                self.assertTrue(response.has_header('ETag'))
+
+                # 두 번째 요청은 페이지 캐시에서, ETag가 같으면 304
+                # (Django 3.2의 AsyncClient는 추가 인자를 헤더 이름 그대로 보냄)
+                cached = await self.async_client.get(url)
+                self.assertEqual(cached.content, response.content)
+                response = await self.async_client.get(url, **{'if-none-match': response['ETag']})
+                self.assertEqual(response.status_code, 304)
+
+            response = await self.async_client.get(self.post_001.get_absolute_url())
+            self.assertIn(self.comment_001.content, response.content.decode())
+
+            response = await self.async_client.get('/board/category/no_category/')
+            titles, soup = self.post_titles(response)
+            self.assertEqual(titles, [self.post_003.title])
+            self.assertIn('미분류', soup.find('div', id='main-area').text)
+
+            response = await self.async_client.get('/board/search/category/')
+            self.assertIn('Search: category (1)', response.content.decode())
+
+            response = await self.async_client.get('/board/999/')
+            self.assertEqual(response.status_code, 404)
+
+        # 병렬 모드는 PostgreSQL에서만 켜지고, 아니면 sync 스레드 하나에서 차례로 실행해 순서대로 돌려줌
+        # (테스트 DB는 트랜잭션 안이라 다른 연결에서 보이지 않으므로 DB 없이 확인)
+        with self.settings(BOARD_ASYNC_PARALLEL_QUERIES=True):
+            self.assertEqual(parallel_queries_enabled(), connection.vendor == 'postgresql')
+            results = await gather_queries(lambda: 1, lambda: 2)
+        self.assertEqual(results, [1, 2])
+
+    def test_async_middleware(self):
+        # ASGI에서 미들웨어가 모두 async로 돌아야 async 뷰가 async_to_sync로 감싸지지 않음
+        middleware = list(settings.MIDDLEWARE)
+        if 'board.middleware.AsyncWhiteNoiseMiddleware' not in middleware:
+            middleware.insert(1, 'board.middleware.AsyncWhiteNoiseMiddleware')
+        with self.settings(DEBUG=True, MIDDLEWARE=middleware), self.assertLogs('django.request', 'DEBUG') as logs:
+            ASGIHandler()
+            logging.getLogger('django.request').debug('middleware loaded')
+        self.assertEqual([line for line in logs.output if 'adapted' in line], [])
+
+    def test_sqlite_pragmas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA foreign_keys')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_query_plans(self):
+        # 모든 읽기 페이지의 쿼리가 인덱스를 타는지 EXPLAIN으로 확인
+        for url in default_paths():
+            response, problems = explain_url(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(problems, [], url)
+
+        # 인덱스가 없는 조건은 LIMIT이 있어도 전체 스캔으로 잡아냄
+        for posts in [
+            Post.objects.filter(hook_text='x'),
+            Post.objects.filter(hook_text='x')[:5],
+            Post.objects.filter(hook_text='x').order_by('-pk')[:5],
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                list(posts)
+            self.assertTrue(find_full_scans(context.captured_queries[0]['sql']), context.captured_queries[0]['sql'])
+
+        # 조건 없이 pk 순서대로 읽다가 LIMIT에서 멈추는 것은 허용
+        with CaptureQueriesContext(connection) as context:
+            list(Post.objects.order_by('-pk')[:5])
+        self.assertEqual(find_full_scans(context.captured_queries[0]['sql']), [])
+
+    def test_benchmark(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+
+        with self.settings(MEDIA_ROOT=media_root):
+            volumes = benchmark.seed(scale=0.005)
+            self.assertEqual(Post.objects.filter(title__regex=r' \d+$').count(), volumes['posts'])
+            self.assertEqual(Comment.objects.count(), volumes['comments'] + 1)
+
+            results = benchmark.run(repeat=1, only=['post_list', 'post_detail', 'delete_comment'])
+        self.assertEqual(set(results), {'post_list', 'post_detail', 'delete_comment'})
+        self.assertEqual(results['post_list']['status'], 200)
+        self.assertEqual(results['post_list']['queries'], 4)
+        # 쓰기 요청은 되돌림
+        self.assertEqual(results['delete_comment']['status'], 302)
+        self.assertEqual(Comment.objects.count(), volumes['comments'] + 1)
+
+        # 쿼리 수가 늘거나 시간이 threshold 넘게 늘면 회귀
+        baseline = {'post_list': dict(results['post_list'], queries=3, time_ms=1)}
+        regressions = benchmark.compare(baseline, {'post_list': results['post_list']}, 0.25)
+        self.assertIn('queries', [metric for _, metric, _, _ in regressions])
+        self.assertEqual(benchmark.compare(results, results, 0.25), [])
+
+    def test_performance_metrics(self):
+        cache.clear()
+        registry.reset()
+
+        response = self.client.get('/board/')
+        timing = response['Server-Timing']
+        self.assertIn('total;dur=', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries, 0 duplicate"')
+        self.assertIn('tpl;dur=', timing)
+
+        # 두 번째 요청은 페이지 캐시에서 (쿼리 없음, cache hit)
+        response = self.client.get('/board/')
+        self.assertIn('0 queries', response['Server-Timing'])
+        self.assertNotIn('cache;desc="0 hit', response['Server-Timing'])
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn('board_request_duration_seconds_count{view="board.views.PostList",method="GET"} 2', text)
+        self.assertIn('board_requests_total{view="board.views.PostList",method="GET",status="200"} 2', text)
+        self.assertIn('board_request_duration_seconds_bucket{view="board.views.PostList",method="GET",le="+Inf"} 2',
+                      text)
+
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.1').status_code, 403)
+        # BOARD_SERVER_TIMING이 꺼져 있으면(운영 기본값) Server-Timing도 허용된 주소에만
+        with self.settings(BOARD_SERVER_TIMING=False):
+            self.assertFalse(self.client.get('/board/', REMOTE_ADDR='10.0.0.1').has_header('Server-Timing'))
+            self.assertTrue(self.client.get('/board/').has_header('Server-Timing'))
+        with self.settings(BOARD_SERVER_TIMING=True):
+            self.assertTrue(self.client.get('/board/', REMOTE_ADDR='10.0.0.1').has_header('Server-Timing'))
+
+        # 신뢰하는 프록시를 거친 요청은 프록시가 붙인 클라이언트 주소로 판단하고, 다른 곳에서 보낸 헤더는 무시함
+        with self.settings(BOARD_TRUSTED_PROXIES=['10.0.0.2'], BOARD_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR'):
+            proxied = {'REMOTE_ADDR': '10.0.0.2'}
+            self.assertEqual(self.client.get('/metrics', **proxied, HTTP_X_FORWARDED_FOR='127.0.0.1').status_code, 200)
+            self.assertEqual(
+                self.client.get('/metrics', **proxied, HTTP_X_FORWARDED_FOR='127.0.0.1, 10.0.0.1').status_code, 403
+            )
+            self.assertEqual(self.client.get('/metrics', **proxied).status_code, 403)
+            self.assertEqual(
+                self.client.get('/metrics', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='127.0.0.1').status_code, 403
+            )
+
+        # 같은 쿼리가 반복되면 duplicate로 셈
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            for _ in range(3):
+                list(Post.objects.filter(pk=self.post_001.pk))
+            list(Post.objects.filter(pk=self.post_002.pk))
+        finally:
+            current_metrics.reset(token)
+        self.assertEqual((metrics.queries, metrics.duplicates), (4, 2))
+
+    def test_board_context(self):
+        cache.clear()
+        response = self.client.get(f'/board/tag/{self.tag_python.slug}/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertIn(f'{self.tag_python} (1)', soup.h1.text)
+
+        # 요청 안에서는 같은 값을 한 번만 계산함
+        cache.clear()
+        board = BoardContext()
+        board.tag = self.tag_python
+        with self.assertNumQueries(3):
+            self.assertEqual(board.tag_post_count, 1)
+            self.assertEqual(board.tag_post_count, 1)
+            self.assertEqual([c.post_count for c in board.categories], [1, 1])
+            self.assertEqual(board.no_category_post_count, 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(board.search_count('category'), 1)
+            self.assertIs(board.search('category'), board.search('category'))
+
+    def test_static_assets(self):
+        # 커밋된 번들이 vendor/CSS 소스와 같아야 함 (다르면 build_assets)
+        self.assertEqual(outdated_bundles(), [])
+
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        static_dirs = [str(STATIC_DIR), str(STATIC_DIR.parent.parent / 'single_pages' / 'static')]
+
+        with self.settings(
+            STATIC_ROOT=static_root,
+            STATICFILES_DIRS=static_dirs,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STATICFILES_STORAGE='whitenoise.storage.CompressedManifestStaticFilesStorage',
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+            # 페이지는 해시 이름의 번들 두 개만 받고 외부 CDN을 쓰지 않음
+            cache.clear()
+            response = self.client.get('/board/')
+            soup = BeautifulSoup(response.content, 'html.parser')
+            stylesheets = [link.attrs['href'] for link in soup.find_all('link', rel='stylesheet')]
+            scripts = [script.attrs['src'] for script in soup.find_all('script', src=True)]
+            self.assertRegex(stylesheets[0], r'^/static/board/dist/site\.[0-9a-f]{12}\.css$')
+            self.assertEqual(len(stylesheets), 1)
+            self.assertRegex(scripts[0], r'^/static/board/dist/site\.[0-9a-f]{12}\.js$')
+            self.assertEqual(len(scripts), 1)
+
+            # 번들 안의 폰트 경로도 해시 이름으로 바뀜
+            css_path = stylesheets[0][len('/static/'):]
+            with open(f'{static_root}/{css_path}', encoding='utf-8') as f:
+                self.assertRegex(f.read(), r'url\("\.\./vendor/fontawesome/webfonts/fa-solid-900\.[0-9a-f]{12}\.woff2"\)')
+
+            # 미리 압축한 파일을 보내고, 해시 이름 파일은 오래 캐시함
+            whitenoise = AsyncWhiteNoiseMiddleware(lambda request: HttpResponse())
+            request = RequestFactory().get(scripts[0], HTTP_ACCEPT_ENCODING='gzip, br')
+            response = whitenoise(request)
+            response.close()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertIn('max-age=315360000', response['Cache-Control'])
+
+    def test_template_fragments(self):
+        cache.clear()
+        with self.assertTemplateUsed('board/post_card.html'):
+            self.client.get('/board/')
+
+        # 목록에서 렌더링한 카드를 카테고리 페이지가 그대로 씀
+        with self.assertTemplateNotUsed('board/post_card.html'):
+            response = self.client.get(f'/board/category/{self.category_programming.slug}/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertIn(self.post_001.title, soup.find('div', id=f'post-{self.post_001.pk}').text)
+
+        # 댓글이 달리면 페이지 캐시만 바뀌고 카드는 다시 렌더링하지 않음
+        version = get_fragment_version()
+        Comment.objects.create(post=self.post_002, author=self.user_kim, content='카드와 관계없는 댓글')
+        with self.assertTemplateNotUsed('board/post_card.html'):
+            self.client.get('/board/')
+        self.assertEqual(get_fragment_version(), version)
+
+        # 포스트를 고치면 updated_at이 바뀌어 새 카드가 만들어짐
+        self.post_001.title = '고친 포스트'
+        self.post_001.save()
+        response = self.client.get('/board/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertIn('고친 포스트', soup.find('div', id=f'post-{self.post_001.pk}').text)
+
+        # 태그 이름은 updated_at을 바꾸지 않으므로 fragment를 모두 버림
+        self.tag_hello.name = 'hello world'
+        self.tag_hello.save()
+        self.assertNotEqual(get_fragment_version(), version)
+        response = self.client.get('/board/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertIn('hello world', soup.find('div', id=f'post-{self.post_001.pk}').text)
+
+        # 댓글 본문은 캐시해서 쓰고, 수정/삭제 버튼은 사용자마다 따로 그림
+        version = get_fragment_version()
+        self.client.login(username='park', password='parkdjango')
+        with self.assertTemplateUsed('board/comment_body.html'):
+            response = self.client.get(self.post_001.get_absolute_url())
+        self.assertFalse(BeautifulSoup(response.content, 'html.parser').find('a', id=f'comment-{self.comment_001.pk}-update-btn'))
+
+        self.client.login(username='kim', password='kimdjango')
+        with self.assertTemplateNotUsed('board/comment_body.html'):
+            response = self.client.get(self.post_001.get_absolute_url())
+        comment_div = BeautifulSoup(response.content, 'html.parser').find('div', id=f'comment-{self.comment_001.pk}')
+        self.assertIn(self.comment_001.content, comment_div.text)
+        self.assertTrue(comment_div.find('a', id=f'comment-{self.comment_001.pk}-update-btn'))
+        # 로그인(last_login 저장)으로는 fragment를 버리지 않음
+        self.assertEqual(get_fragment_version(), version)
+
+    def test_feeds(self):
+        atom = '{http://www.w3.org/2005/Atom}'
+        cache.clear()
+
+        response = self.client.get('/board/feed/atom/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/atom+xml; charset=utf-8')
+        entries = ElementTree.fromstring(response.content).findall(f'{atom}entry')
+        self.assertEqual(
+            [entry.find(f'{atom}title').text for entry in entries],
+            [self.post_003.title, self.post_002.title, self.post_001.title],
+        )
+        self.assertEqual(entries[2].find(f'{atom}link').get('href'), f'http://example.com{self.post_001.get_absolute_url()}')
+
+        # 바뀐 것이 없으면 스냅샷만 확인하고 304 (DB를 읽지 않음)
+        with self.assertNumQueries(0):
+            response = self.client.get('/board/feed/atom/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # 카테고리/태그 피드, 본문은 저장된 Markdown 요약
+        response = self.client.get(f'/board/category/{self.category_programming.slug}/feed/json/')
+        self.assertEqual(response['Content-Type'], 'application/feed+json; charset=utf-8')
+        items = json.loads(response.content)['items']
+        self.assertEqual([item['title'] for item in items], [self.post_001.title])
+        self.assertEqual(items[0]['content_html'], Post.objects.get(pk=self.post_001.pk).excerpt_html)
+        self.assertEqual(items[0]['tags'], ['hello'])
+        response = self.client.get(f'/board/tag/{self.tag_python.slug}/feed/json/')
+        self.assertEqual([item['title'] for item in json.loads(response.content)['items']], [self.post_003.title])
+        response = self.client.get('/board/category/no_category/feed/json/')
+        self.assertEqual([item['title'] for item in json.loads(response.content)['items']], [self.post_003.title])
+        self.assertEqual(self.client.get('/board/tag/no-such-tag/feed/atom/').status_code, 404)
+        self.assertEqual(self.client.get('/board/feed/rss/').status_code, 404)
+
+        # 저장하면 전체 피드와 그 포스트의 카테고리/태그 피드를 바로 다시 만들어 둠
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title='새 포스트', content='새 글', category=self.category_programming, author=self.user_kim)
+            post.tags.add(self.tag_hello)
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/board/category/{self.category_programming.slug}/feed/json/')
+            self.client.get(f'/board/tag/{self.tag_hello.slug}/feed/json/')
+        self.assertEqual([item['title'] for item in json.loads(response.content)['items']], ['새 포스트', self.post_001.title])
+
+        # 최근 N개만
+        with self.settings(BOARD_FEED_ENTRIES=2):
+            cache.clear()
+            response = self.client.get('/board/feed/json/')
+        self.assertEqual([item['title'] for item in json.loads(response.content)['items']], ['새 포스트', self.post_003.title])
+
+        # 목록 페이지에 피드 주소가 있음
+        response = self.client.get(f'/board/tag/{self.tag_hello.slug}/')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        feeds = [link.attrs['href'] for link in soup.find_all('link', rel='alternate')]
+        self.assertIn(f'/board/tag/{self.tag_hello.slug}/feed/atom/', feeds)
+        self.assertIn('/board/feed/json/', feeds)
@@ -1,17 +1,23 @@
 from django.urls import path
-from . import views
+from . import async_views, views
+from .async_views import page_view
 
 urlpatterns = [
-    path('search/<str:q>/', views.PostSearch.as_view()),
+    path('search/<str:q>/', page_view(views.PostSearch.as_view(), async_views.post_search)),
     path('delete_comment/<int:pk>/', views.delete_comment),
     path('update_comment/<int:pk>/', views.CommentUpdate.as_view()),
     path('update_post/<int:pk>/', views.PostUpdate.as_view()),
     path('create_post/', views.PostCreate.as_view()),
-    path('tag/<str:slug>/', views.tag_page),
-    path('category/<str:slug>/', views.category_page),
+    path('tag/<str:slug>/feed/<str:feed_format>/', views.feed, {'kind': 'tag'}),
+    path('category/<str:slug>/feed/<str:feed_format>/', views.feed, {'kind': 'category'}),
+    path('feed/<str:feed_format>/', views.feed),
+    path('tag/<str:slug>/', page_view(views.tag_page, async_views.tag_page)),
+    path('category/<str:slug>/', page_view(views.category_page, async_views.category_page)),
     path('<int:pk>/new_comment/', views.new_comment),
-    path('<int:pk>/', views.PostDetail.as_view()),
-    path('', views.PostList.as_view()),
+    path('<int:pk>/comments/', views.comment_page),
+    path('<int:pk>/download/', views.download_file),
+    path('<int:pk>/', page_view(views.PostDetail.as_view(), async_views.post_detail)),
+    path('', page_view(views.PostList.as_view(), async_views.post_list)),
     # path('<int:pk>/', views.single_post_page),
     #path('', views.index),
 ]
@@ -1,69 +1,45 @@
 from django.shortcuts import render, redirect
-from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.views.generic import View, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import get_object_or_404
-from .models import Post, Category, Tag, Comment
+from .models import Post, Comment
 from .forms import CommentForm
 from django.core.exceptions import PermissionDenied
-from django.utils.text import slugify
-from django.db.models import Q
-
-class PostList(ListView):
-    model = Post
-    ordering = '-pk'
-    paginate_by = 5
-
-
-    def get_context_data(self, **kwargs):
-        context = super(PostList, self).get_context_data()
-        context['categories'] = Category.objects.all()
-        context['no_category_post_count'] = Post.objects.filter(category=None).count()
-        return context
-
+from . import pages
+from .pages import render_page
+from .comments import get_comment_page, get_comment_url
+from .tags import set_post_tags, format_tags
+from .downloads import serve_attachment
+from django.http import Http404
+from .caching import cache_anonymous_page, board_page_condition, post_page_condition, conditional_page
+from .feeds import FEED_CONTENT_TYPES, get_feed_snapshot
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+
+# 읽기 페이지의 조회와 컨텍스트는 pages.py에 있고 ASGI용 async 뷰(async_views.py)와 같이 씀
+@method_decorator(board_page_condition, name='dispatch')
+@method_decorator(cache_anonymous_page, name='dispatch')
+class PostList(View):
+    def get(self, request):
+        return render_page(request, pages.post_list_page(request))
+
+
+@board_page_condition
+@cache_anonymous_page
 def category_page(request, slug):
-    if slug == 'no_category':
-        category = '미분류'
-        post_list = Post.objects.filter(category=None)
-    else:
-        category = Category.objects.get(slug=slug)
-        post_list = Post.objects.filter(category=category)
+    return render_page(request, pages.category_page(request, slug))
 
-    return render(
-        request,
-        'board/post_list.html',
-        {
-            'post_list' : post_list,
-            'categories' : Category.objects.all(),
-            'no_category_post_count': Post.objects.filter(category=None).count(),
-            'category': category,
-        }
-    )
-
-
-class PostDetail(DetailView):
-    model = Post
 
-    def get_context_data(self, **kwargs):
-        context = super(PostDetail, self).get_context_data()
-        context['categories'] = Category.objects.all()
-        context['no_category_post_count'] = Post.objects.filter(category=None).count()
-        context['comment_form'] = CommentForm
-        return context
+@method_decorator(post_page_condition, name='dispatch')
+@method_decorator(cache_anonymous_page, name='dispatch')
+class PostDetail(View):
+    def get(self, request, pk):
+        return render_page(request, pages.post_detail_page(request, pk))
 
+@board_page_condition
+@cache_anonymous_page
 def tag_page(request, slug):
-    tag = Tag.objects.get(slug=slug)
-    post_list = tag.post_set.all()
-
-    return render(
-        request,
-        'board/post_list.html',
-        {
-            'post_list': post_list,
-            'categories': Category.objects.all(),
-            'no_category_post_count': Post.objects.filter(category=None).count(),
-            'tag': tag,
-        }
-    )
+    return render_page(request, pages.tag_page(request, slug))
 
 class PostCreate(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     model = Post
@@ -77,22 +53,7 @@ class PostCreate(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         if current_user.is_authenticated and (current_user.is_staff or current_user.is_superuser):
             form.instance.author = current_user
             response = super(PostCreate, self).form_valid(form)
-
-            tags_str = self.request.POST.get('tags_str')
-            if tags_str:
-                tags_str = tags_str.strip()
-
-                tags_str = tags_str.replace(',', ';')
-                tags_list = tags_str.split(';')
-
-                for t in tags_list:
-                    t = t.strip()
-                    tag, is_tag_created = Tag.objects.get_or_create(name=t)
-                    if is_tag_created:
-                        tag.slug = slugify(t, allow_unicode=True)
-                        tag.save()
-                    self.object.tags.add(tag)
-
+            set_post_tags(self.object, self.request.POST.get('tags_str'))
             return response
 
         else:
@@ -106,34 +67,14 @@ class PostUpdate(LoginRequiredMixin, UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super(PostUpdate, self).get_context_data()
-        if self.object.tags.exists():
-            tags_str_list = list()
-            for t in self.object.tags.all():
-                tags_str_list.append(t.name)
-            context['tags_str_default'] = '; '.join(tags_str_list)
-
+        context['tags_str_default'] = format_tags(self.object)
         return context
 
 
     def form_valid(self, form):
         response = super(PostUpdate, self).form_valid(form)
-        self.object.tags.clear()
-
-        tags_str = self.request.POST.get('tags_str')
-        if tags_str:
-            tags_str = tags_str.strip()
-            tags_str = tags_str.replace(',', ';')
-            tags_list = tags_str.split(';')
-
-            for t in tags_list:
-                t = t.strip()
-                tag, is_tag_created = Tag.objects.get_or_create(name=t)
-                if is_tag_created:
-                    tag.slug = slugify(t, allow_unicode=True)
-                    tag.save()
-                self.object.tags.add(tag)
-
-            return response
+        set_post_tags(self.object, self.request.POST.get('tags_str'))
+        return response
 
     def dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated and request.user == self.get_object().author:
@@ -152,16 +93,36 @@ def new_comment(request, pk):
                 comment.post = post
                 comment.author = request.user
                 comment.save()
-                return redirect(comment.get_absolute_url())
+                return redirect(get_comment_url(comment))
         else:
             return redirect(post.get_absolute_url())
     else:
         raise PermissionDenied
 
+def download_file(request, pk):
+    post = get_object_or_404(Post.objects.only('pk', 'file_upload'), pk=pk)
+    if not post.file_upload:
+        raise Http404('첨부파일이 없습니다.')
+    return serve_attachment(request, post.file_upload, post.get_file_name())
+
+def comment_page(request, pk):
+    post = get_object_or_404(Post.objects.only('pk'), pk=pk)
+    return render(
+        request,
+        'board/comment_page.html',
+        {
+            'post': post,
+            'comment_page': get_comment_page(post, after=request.GET.get('after')),
+        }
+    )
+
 class CommentUpdate(LoginRequiredMixin, UpdateView):
     model = Comment
     form_class = CommentForm
 
+    def get_success_url(self):
+        return get_comment_url(self.object)
+
     def dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated and request.user == self.get_object().author:
             return super(CommentUpdate, self).dispatch(request, *args, **kwargs)
@@ -177,22 +138,34 @@ def delete_comment(request, pk):
     else:
         raise PermissionDenied
 
-class PostSearch(PostList):
-    paginate_by = None
+def get_request_feed(request, feed_format, kind=None, slug=None):
+    # 검증값 계산과 응답이 같은 스냅샷을 쓰도록 요청에 둠
+    if feed_format not in FEED_CONTENT_TYPES:
+        raise Http404
+    if not hasattr(request, '_feed_snapshot'):
+        request._feed_snapshot = get_feed_snapshot(kind, slug)
+    return request._feed_snapshot
 
-    def get_queryset(self):
-        q = self.kwargs['q']
-        post_list = Post.objects.filter(
-            Q(title__contains=q) | Q(tags__name__contains=q)
-        ).distinct()
-        return post_list
 
-    def get_context_data(self, **kwargs):
-        context = super(PostSearch, self).get_context_data()
-        q = self.kwargs['q']
-        context['search_info'] = f'Search: {q} ({self.get_queryset().count()})'
+def get_feed_etag(request, feed_format, kind=None, slug=None):
+    return get_request_feed(request, feed_format, kind, slug)['etags'][feed_format]
 
-        return context
+
+def get_feed_last_modified(request, feed_format, kind=None, slug=None):
+    return get_request_feed(request, feed_format, kind, slug)['updated']
+
+
+@conditional_page(get_feed_etag, get_feed_last_modified)
+def feed(request, feed_format, kind=None, slug=None):
+    # 전체/카테고리/태그 피드 (Atom, JSON Feed). 저장할 때 만들어 둔 스냅샷을 그대로 보냄
+    snapshot = get_request_feed(request, feed_format, kind, slug)
+    return HttpResponse(snapshot[feed_format], content_type=FEED_CONTENT_TYPES[feed_format])
+
+@method_decorator(board_page_condition, name='dispatch')
+@method_decorator(cache_anonymous_page, name='dispatch')
+class PostSearch(View):
+    def get(self, request, q):
+        return render_page(request, pages.search_page(request, q))
 
 
 
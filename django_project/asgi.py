@@ -2,6 +2,13 @@
 ASGI config for django_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The read-only board and landing pages are routed to async views
+(BOARD_ASYNC_VIEWS, picked in the app urls.py modules).
+On SQLite this path is not faster than WSGI with gthread workers: rendering is
+CPU-bound and runs on one sync thread per worker. Concurrent queries
+(BOARD_ASYNC_PARALLEL_QUERIES) are only used on PostgreSQL.
+
+Production: gunicorn -c django_project/gunicorn.conf.py django_project.asgi:application
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
@@ -12,5 +19,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_project.settings')
+os.environ.setdefault('BOARD_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,16 @@
+# gunicorn 설정
+#   ASGI: gunicorn -c django_project/gunicorn.conf.py django_project.asgi:application
+#   WSGI: GUNICORN_WORKER_CLASS=gthread gunicorn -c django_project/gunicorn.conf.py django_project.wsgi:application
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+# 메모리 누수 대비로 일정 요청마다 워커를 다시 띄움
+max_requests = 1000
+max_requests_jitter = 100
+accesslog = '-'
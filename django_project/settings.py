@@ -55,6 +55,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 요청 전체 시간을 재야 하므로 가장 바깥에 둠
+    'board.metrics.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,19 +66,36 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if not DEBUG:
+    # static 파일은 여기서 바로 응답함 (해시가 들어간 파일은 오래 캐시, .br/.gz가 있으면 그것을 보냄).
+    # DEBUG에서는 runserver가 finder로 찾아 서빙함
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'board.middleware.AsyncWhiteNoiseMiddleware',
+    )
+
 ROOT_URLCONF = 'django_project.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates와 같고 렌더링 시간을 board.metrics에 기록함
+        'BACKEND': 'board.metrics.TimedDjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # 운영에서는 한 번 컴파일한 템플릿을 프로세스 안에서 재사용함 (DEBUG에서는 고친 템플릿이 바로 반영되도록 끔)
+            'loaders': TEMPLATE_LOADERS if DEBUG else [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'board.context_processors.board',
+                'board.context_processors.board_version',
             ],
         },
     },
@@ -88,11 +107,73 @@ WSGI_APPLICATION = 'django_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE: sqlite(기본, 소규모 배포용) / postgresql
+# SQLite 연결에는 board.db.SQLITE_PRAGMAS(WAL, busy_timeout, synchronous, mmap_size)가 적용됨
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    # DB_PGBOUNCER=1: PgBouncer(transaction pooling)를 거칠 때. 연결 유지는 PgBouncer에 맡기고
+    # 트랜잭션을 넘나드는 서버 사이드 커서를 쓰지 않음
+    DB_PGBOUNCER = bool(int(os.environ.get('DB_PGBOUNCER', 0)))
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'django_project'),
+            'USER': os.environ.get('DB_USER', 'django_project'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('DB_PORT', '6432' if DB_PGBOUNCER else '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0 if DB_PGBOUNCER else 60)),
+            # 재사용하는 연결은 요청 시작 때 살아 있는지 확인 (board.db.check_connection_health)
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+                'sslmode': os.environ.get('DB_SSLMODE', 'prefer'),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
+
+# Cache
+# CACHE_BACKEND: locmem(기본, 테스트용) / file / redis
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(BASE_DIR, '_cache')),
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 요청별 cache hit/miss를 세기 위해 실제 백엔드를 board.metrics.InstrumentedCache로 감쌈
+CACHES['default'] = {
+    **CACHES['default'],
+    'BACKEND': 'board.metrics.InstrumentedCache',
+    'OPTIONS': {**CACHES['default'].get('OPTIONS', {}), 'BACKEND': CACHES['default']['BACKEND']},
 }
 
 
@@ -133,6 +214,15 @@ USE_TZ = False
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
 STATIC_URL = '/static/'
+# collectstatic으로 모으는 곳. 운영에서는 WhiteNoise가 여기서 바로 서빙함
+STATIC_ROOT = os.environ.get('STATIC_ROOT', os.path.join(BASE_DIR, '_static'))
+# 운영(DEBUG=0)에서는 collectstatic이 내용 해시가 들어간 파일 이름과 미리 압축한 .gz/.br 파일을 만듦.
+# 해시 이름 파일은 WhiteNoise가 10년짜리 immutable Cache-Control로 보냄 (템플릿은 board/dist 번들을 씀, board.assets 참고)
+STATICFILES_STORAGE = os.environ.get(
+    'STATICFILES_STORAGE',
+    'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+    else 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+)
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, '_media')
@@ -152,4 +242,57 @@ SITE_ID = 1
 
 ACCOUNT_EMAIL_REQUIRED = True
 ACCOUNT_EMAIL_VERIFICATION = 'none'
-LOGIN_REDIRECT_URL = '/board/'
\ No newline at end of file
+LOGIN_REDIRECT_URL = '/board/'
+
+# Board
+BOARD_COMMENTS_PER_PAGE = int(os.environ.get('BOARD_COMMENTS_PER_PAGE', 20))
+BOARD_PAGE_CACHE_TIMEOUT = int(os.environ.get('BOARD_PAGE_CACHE_TIMEOUT', 60 * 5))
+# True이면 업로드 요청 안에서 바로 썸네일을 만듦 (기본은 백그라운드 스레드)
+BOARD_IMAGE_DERIVATIVES_SYNC = bool(int(os.environ.get('BOARD_IMAGE_DERIVATIVES_SYNC', 0)))
+# 첨부파일 전송을 웹서버에 넘길 때: 'x-accel-redirect'(nginx) / 'x-sendfile'(apache)
+BOARD_ATTACHMENT_SENDFILE = os.environ.get('BOARD_ATTACHMENT_SENDFILE') or None
+BOARD_ATTACHMENT_ACCEL_PREFIX = os.environ.get('BOARD_ATTACHMENT_ACCEL_PREFIX', '/protected-media/')
+# 모든 응답에 Server-Timing 헤더를 붙임 (기본은 DEBUG에서만). 꺼져 있어도 BOARD_METRICS_ALLOWED_IPS에는 붙임.
+# /metrics는 BOARD_METRICS_ALLOWED_IPS에서만 볼 수 있음 ('*'는 모두)
+BOARD_SERVER_TIMING = bool(int(os.environ.get('BOARD_SERVER_TIMING', DEBUG)))
+BOARD_METRICS_ALLOWED_IPS = os.environ.get('BOARD_METRICS_ALLOWED_IPS', '127.0.0.1 ::1').split()
+# 리버스 프록시(nginx 등) 뒤에서 실행할 때: 프록시 주소를 BOARD_TRUSTED_PROXIES에 넣고, 프록시가 클라이언트 주소를
+# 넣는 헤더를 BOARD_CLIENT_IP_HEADER에 지정함 (예: HTTP_X_FORWARDED_FOR, HTTP_X_REAL_IP).
+# 지정하지 않으면 REMOTE_ADDR(프록시 뒤에서는 프록시 주소)로 허용 여부를 정함
+BOARD_TRUSTED_PROXIES = os.environ.get('BOARD_TRUSTED_PROXIES', '').split()
+BOARD_CLIENT_IP_HEADER = os.environ.get('BOARD_CLIENT_IP_HEADER') or None
+# True이면 읽기 페이지를 async 뷰로 연결함 (URL 모듈을 불러올 때 정해짐). asgi.py가 기본으로 켬
+BOARD_ASYNC_VIEWS = bool(int(os.environ.get('BOARD_ASYNC_VIEWS', 0)))
+# True이면 async 뷰의 독립적인 조회를 각자의 DB 연결로 동시에 실행함. PostgreSQL에서만 적용됨
+# (조회마다 연결을 새로 여므로 PgBouncer 뒤에서 쓰는 것을 권장)
+BOARD_ASYNC_PARALLEL_QUERIES = bool(int(os.environ.get('BOARD_ASYNC_PARALLEL_QUERIES', 0)))
+# 피드(/board/feed/atom/ 등)에 넣는 최근 포스트 수. 피드 안의 절대 주소는 Sites 도메인으로 만들고 BOARD_FEED_SECURE이면 https
+BOARD_FEED_ENTRIES = int(os.environ.get('BOARD_FEED_ENTRIES', 20))
+BOARD_FEED_SECURE = bool(int(os.environ.get('BOARD_FEED_SECURE', 0 if DEBUG else 1)))
+
+
+# Logging
+# board.performance: 요청마다 측정값을 JSON 한 줄로 남김 (INFO)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'board.performance': {
+            'handlers': ['console'],
+            'level': os.environ.get('BOARD_PERFORMANCE_LOG_LEVEL', 'WARNING' if DEBUG else 'INFO'),
+            'propagate': False,
+        },
+        # 백그라운드 스레드에서 썸네일을 만들다 난 오류
+        'board.images': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -19,11 +19,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from board.metrics import metrics_view
+
 urlpatterns = [
     path('board/', include('board.urls')),
     path('admin/', admin.site.urls),
     path('markdownx/', include('markdownx.urls')),
     path('accounts/', include('allauth.urls')),
+    path('metrics', metrics_view),
     path('', include('single_pages.urls')),
 ]
 
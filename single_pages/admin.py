@@ -1,3 +1,63 @@
 from django.contrib import admin
-
 # Register your models here.
+
+from .models import Team, Venue, MatchSlot, Reservation, MatchResult
+from .standings import record_result, rebuild_standings
+
+
+class MatchSlotInline(admin.TabularInline):
+    model = MatchSlot
+    extra = 1
+
+
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ('name', 'region', 'skill_tier', 'age_group')
+    list_filter = ('region', 'skill_tier', 'age_group')
+    search_fields = ('name',)
+    filter_horizontal = ('managers',)
+    inlines = [MatchSlotInline]
+
+
+class VenueAdmin(admin.ModelAdmin):
+    list_display = ('name', 'region', 'address')
+    list_filter = ('region',)
+
+
+class MatchSlotAdmin(admin.ModelAdmin):
+    list_display = ('team', 'venue', 'starts_at', 'ends_at')
+    list_filter = ('venue',)
+    date_hierarchy = 'starts_at'
+
+
+class ReservationAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'starts_at', 'ends_at', 'team', 'opponent')
+    list_filter = ('venue',)
+    date_hierarchy = 'starts_at'
+
+
+class MatchResultAdmin(admin.ModelAdmin):
+    # 새 결과는 순위표에 바로 더하고, 고치거나 지운 결과는 순위표를 다시 계산함
+    list_display = ('played_at', 'home', 'home_goals', 'away_goals', 'away')
+    date_hierarchy = 'played_at'
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            super().save_model(request, obj, form, change)
+            rebuild_standings()
+        else:
+            record_result(obj)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rebuild_standings()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        rebuild_standings()
+
+
+admin.site.register(Team, TeamAdmin)
+admin.site.register(Venue, VenueAdmin)
+admin.site.register(MatchSlot, MatchSlotAdmin)
+admin.site.register(Reservation, ReservationAdmin)
+admin.site.register(MatchResult, MatchResultAdmin)
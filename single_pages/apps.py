@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SinglePagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'single_pages'
+
+    def ready(self):
+        from . import signals  # noqa: F401
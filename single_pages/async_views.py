@@ -0,0 +1,10 @@
+from board.async_views import render_gathered
+from board.caching import cache_anonymous_page, board_page_condition
+
+from .pages import landing_page
+
+
+@board_page_condition
+@cache_anonymous_page
+async def landing(request):
+    return await render_gathered(request, landing_page(request))
@@ -0,0 +1,32 @@
+from django import forms
+
+from .models import REGIONS, SKILL_TIERS, AGE_GROUPS, Team, Reservation
+
+
+class TeamFilterForm(forms.Form):
+    # 팀 목록의 구/실력/그룹 필터 (GET). 비워 둔 항목은 거르지 않음
+    region = forms.ChoiceField(label='지역', choices=[('', '전체')] + REGIONS, required=False)
+    skill_tier = forms.ChoiceField(label='실력수준', choices=[('', '전체')] + SKILL_TIERS, required=False)
+    age_group = forms.ChoiceField(label='그룹', choices=[('', '전체')] + AGE_GROUPS, required=False)
+
+    def filter(self, queryset):
+        # 잘못된 값이 들어온 항목은 cleaned_data에 없으므로 무시됨
+        self.is_valid()
+        conditions = {name: value for name, value in self.cleaned_data.items() if value}
+        return queryset.filter(**conditions)
+
+
+class ReservationForm(forms.ModelForm):
+    # 예약하는 팀은 사용자가 관리하는 팀 중에서만 고름 (예약 권한이 있는 운영자는 모든 팀)
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if user is not None and not user.has_perm('single_pages.add_reservation'):
+            self.fields['team'].queryset = user.managed_teams.all() if user.is_authenticated else Team.objects.none()
+
+    class Meta:
+        model = Reservation
+        fields = ('team', 'opponent', 'starts_at', 'ends_at')
+        widgets = {
+            'starts_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+            'ends_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+        }
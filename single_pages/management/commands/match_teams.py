@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from single_pages.matching import find_matches
+from single_pages.models import Team
+
+
+class Command(BaseCommand):
+    help = '등록된 팀의 일정, 지역, 실력을 비교해 매칭 후보를 점수가 높은 순서로 보여줍니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--team', help='이 이름의 팀의 상대 후보만 보여줍니다.')
+        parser.add_argument('--limit', type=int, default=20, help='보여줄 후보 수 (기본 20)')
+
+    def handle(self, *args, **options):
+        team = None
+        if options['team']:
+            try:
+                team = Team.objects.get(name=options['team'])
+            except Team.DoesNotExist:
+                raise CommandError(f'{options["team"]} 팀이 없습니다.')
+
+        start = time.perf_counter()
+        candidates, changed = find_matches(team.pk if team else None, limit=options['limit'])
+        elapsed = (time.perf_counter() - start) * 1000
+
+        names = dict(Team.objects.values_list('pk', 'name'))
+        for match in candidates:
+            self.stdout.write(
+                f'{match.score:>6.2f}  {names[match.team_id]} vs {names[match.opponent_id]}  '
+                f'{match.start:%Y-%m-%d %H:%M}~{match.end:%H:%M}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(candidates)} candidate(s), {changed} team(s) evaluated in {elapsed:.1f}ms.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from single_pages.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = '모든 경기 결과로 팀 순위표(승/무/패, 득실, 레이팅)를 다시 계산합니다. 결과를 고치거나 지운 뒤에 씁니다.'
+
+    def handle(self, *args, **options):
+        count = rebuild_standings()
+        self.stdout.write(self.style.SUCCESS(f'{count} team standing(s) rebuilt.'))
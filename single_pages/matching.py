@@ -0,0 +1,293 @@
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Team, MatchSlot, ScheduleChange
+
+SKILL_LEVELS = {'low': 0, 'mid': 1, 'high': 2}
+
+# 서울시 5개 생활권. 같은 권역 안의 팀끼리만 매칭함
+AREAS = {
+    '도심권': ['종로구', '중구', '용산구'],
+    '동북권': ['성동구', '광진구', '동대문구', '중랑구', '성북구', '강북구', '도봉구', '노원구'],
+    '서북권': ['은평구', '서대문구', '마포구'],
+    '서남권': ['양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구'],
+    '동남권': ['서초구', '강남구', '송파구', '강동구'],
+}
+AREA_OF_REGION = {region: area for area, regions in AREAS.items() for region in regions}
+
+# 함께 뛸 수 있는 최소 시간과 허용하는 실력 차이 (하-중, 중-상까지)
+MIN_OVERLAP = timedelta(hours=1)
+MAX_SKILL_GAP = 1
+
+# 점수 가중치
+SKILL_WEIGHT = 1.0
+REGION_WEIGHT = 1.0
+AGE_GROUP_WEIGHT = 0.5
+OVERLAP_WEIGHT = 0.5
+FULL_OVERLAP = timedelta(hours=2)
+
+# 변경 기록 보관 기간. 이보다 오래 동기화하지 않은 엔진은 전체를 다시 읽음
+CHANGE_LOG_RETENTION = timedelta(days=1)
+# 먼저 pk를 받고 늦게 커밋된 기록을 놓치지 않도록 마지막으로 읽은 기록보다 조금 앞부터 다시 읽음
+CHANGE_LOG_GRACE = timedelta(seconds=5)
+
+
+class TeamInfo(NamedTuple):
+    pk: int
+    name: str
+    region: str
+    skill_tier: str
+    age_group: str
+
+
+class Slot(NamedTuple):
+    # 시작 시각이 맨 앞이어서 정렬하면 시작 순서가 됨
+    start: datetime
+    end: datetime
+    pk: int
+    team_id: int
+    venue_id: Optional[int]
+
+
+class Match(NamedTuple):
+    score: float
+    team_id: int
+    opponent_id: int
+    start: datetime
+    end: datetime
+    venue_id: Optional[int]
+
+    def for_team(self, team_id):
+        # team_id 쪽에서 본 결과 (team_id가 앞)
+        if self.team_id == team_id:
+            return self
+        return self._replace(team_id=self.opponent_id, opponent_id=self.team_id)
+
+
+class IntervalIndex:
+    # 시작 시각 순으로 정렬된 구간 목록. [start, end)와 겹치는 구간은 시작 시각이
+    # (start - 가장 긴 구간 길이, end) 사이에 있으므로 그 범위만 이진 탐색으로 잘라 봄
+    def __init__(self):
+        self.items = []
+        self.max_length = timedelta(0)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, slot):
+        bisect.insort(self.items, slot)
+        self.max_length = max(self.max_length, slot.end - slot.start)
+
+    def remove(self, slot):
+        i = bisect.bisect_left(self.items, slot)
+        if i < len(self.items) and self.items[i] == slot:
+            del self.items[i]
+
+    def overlapping(self, start, end):
+        lo = bisect.bisect_left(self.items, (start - self.max_length,))
+        hi = bisect.bisect_left(self.items, (end,))
+        return [slot for slot in self.items[lo:hi] if slot.end > start]
+
+
+def index_key(team):
+    return AREA_OF_REGION[team.region], team.skill_tier
+
+
+def team_score(team, opponent):
+    # 실력이 같을수록, 같은 구/같은 그룹일수록 높음
+    gap = abs(SKILL_LEVELS[team.skill_tier] - SKILL_LEVELS[opponent.skill_tier])
+    value = SKILL_WEIGHT * (1 - gap / (MAX_SKILL_GAP + 1))
+    if team.region == opponent.region:
+        value += REGION_WEIGHT
+    if team.age_group == opponent.age_group:
+        value += AGE_GROUP_WEIGHT
+    return value
+
+
+def overlap_score(overlap):
+    # 함께 뛸 수 있는 시간이 길수록 높음 (FULL_OVERLAP 이상은 같음)
+    return OVERLAP_WEIGHT * min(overlap / FULL_OVERLAP, 1)
+
+
+def score(team, opponent, overlap):
+    return round(team_score(team, opponent) + overlap_score(overlap), 4)
+
+
+def ordering_key(match):
+    return -match.score, match.start, match.team_id, match.opponent_id
+
+
+class MatchEngine:
+    # 팀/일정이 바뀐 팀만 다시 계산함 (update가 바뀐 팀을 찾아냄).
+    # 일정은 (권역, 실력) 별 IntervalIndex에 나눠 두어 매칭될 수 없는 팀은 보지 않고,
+    # 후보는 두 팀 사이에서 점수가 가장 높은 일정 하나씩 pairs에 (작은 pk, 큰 pk) 키로 둠
+    def __init__(self, min_overlap=MIN_OVERLAP, max_skill_gap=MAX_SKILL_GAP):
+        self.min_overlap = min_overlap
+        self.max_skill_gap = max_skill_gap
+        self.teams = {}
+        self.slots = {}
+        self.indexes = defaultdict(IntervalIndex)
+        self.pairs = {}
+        self.team_pairs = defaultdict(set)
+        # 일정이 끝나는 순서로 (끝나는 시각, 팀 pk). 끝난 일정이 있는 팀은 다시 불러옴
+        self.expiry = []
+        # 마지막으로 읽은 변경 기록 (pk, changed_at). None이면 아직 전체를 읽지 않음
+        self.last_change = None
+
+    def update(self, teams, slots, team_ids=None):
+        # teams: TeamInfo 목록, slots: Slot 목록. team_ids가 없으면 지금 시점의 전체 상태이고,
+        # 있으면 그 팀들의 상태만 들어 있음 (teams에 없는 팀은 지워진 팀). 바뀐 팀의 pk 집합을 돌려줌
+        teams = {team.pk: team for team in teams}
+        slots_by_team = defaultdict(list)
+        for slot in slots:
+            slots_by_team[slot.team_id].append(slot)
+        for team_slots in slots_by_team.values():
+            team_slots.sort()
+
+        if team_ids is None:
+            team_ids = teams.keys() | self.teams.keys()
+        changed = {
+            pk for pk in team_ids
+            if teams.get(pk) != self.teams.get(pk) or slots_by_team.get(pk, []) != self.slots.get(pk, [])
+        }
+        for pk in changed:
+            self.remove_team(pk)
+        for pk in changed & teams.keys():
+            self.teams[pk] = teams[pk]
+            self.slots[pk] = slots_by_team.get(pk, [])
+            index = self.indexes[index_key(teams[pk])]
+            for slot in self.slots[pk]:
+                index.add(slot)
+                heapq.heappush(self.expiry, (slot.end, pk))
+
+        # 바뀐 팀끼리는 한쪽에서만 계산
+        done = set()
+        for pk in sorted(changed & teams.keys()):
+            self.evaluate(pk, skip=done)
+            done.add(pk)
+        return changed
+
+    def expired_teams(self, now):
+        # now까지 끝난 일정이 있는 팀 (이미 바뀌어 없어진 일정이면 다시 불러와도 바뀌지 않음)
+        teams = set()
+        while self.expiry and self.expiry[0][0] <= now:
+            teams.add(heapq.heappop(self.expiry)[1])
+        return teams
+
+    def remove_team(self, pk):
+        team = self.teams.pop(pk, None)
+        for slot in self.slots.pop(pk, []):
+            self.indexes[index_key(team)].remove(slot)
+        for key in self.team_pairs.pop(pk, set()):
+            del self.pairs[key]
+            other = key[0] if key[1] == pk else key[1]
+            self.team_pairs[other].discard(key)
+
+    def evaluate(self, pk, skip=()):
+        team = self.teams[pk]
+        level = SKILL_LEVELS[team.skill_tier]
+        area = AREA_OF_REGION[team.region]
+        indexes = [
+            self.indexes[(area, tier)] for tier, other_level in SKILL_LEVELS.items()
+            if abs(level - other_level) <= self.max_skill_gap
+        ]
+
+        # 팀끼리의 점수는 상대 팀마다 한 번만 계산하고, 일정마다 겹치는 시간 점수만 더함
+        team_scores = {}
+        best = {}
+        for slot in self.slots[pk]:
+            for index in indexes:
+                for other in index.overlapping(slot.start, slot.end):
+                    opponent = other.team_id
+                    if opponent == pk or opponent in skip:
+                        continue
+                    start = other.start if other.start > slot.start else slot.start
+                    end = other.end if other.end < slot.end else slot.end
+                    overlap = end - start
+                    if overlap < self.min_overlap:
+                        continue
+                    value = team_scores.get(opponent)
+                    if value is None:
+                        value = team_scores[opponent] = team_score(team, self.teams[opponent])
+                    value += OVERLAP_WEIGHT if overlap >= FULL_OVERLAP else overlap_score(overlap)
+                    # 점수가 같으면 이른 일정
+                    current = best.get(opponent)
+                    if current is None or value > current[0] or (value == current[0] and start < current[1]):
+                        best[opponent] = (value, start, end, slot.venue_id or other.venue_id)
+
+        for opponent, (value, start, end, venue_id) in best.items():
+            key = (pk, opponent) if pk < opponent else (opponent, pk)
+            self.pairs[key] = Match(round(value, 4), pk, opponent, start, end, venue_id)
+            self.team_pairs[pk].add(key)
+            self.team_pairs[opponent].add(key)
+
+    def candidates(self, team_id=None, limit=None):
+        # team_id가 있으면 그 팀의 후보, 없으면 전체 후보를 점수 순으로
+        if team_id is None:
+            matches = self.pairs.values()
+        else:
+            matches = [self.pairs[key].for_team(team_id) for key in self.team_pairs.get(team_id, ())]
+        key = ordering_key
+        return heapq.nsmallest(limit, matches, key=key) if limit else sorted(matches, key=key)
+
+
+def load_state(now=None, team_ids=None):
+    # 끝나지 않은 일정만 봄. team_ids가 있으면 그 팀들만 (팀은 pk, 일정은 (team, starts_at) 인덱스로),
+    # 없으면 인덱스 없이 전체를 읽지만 컬럼 몇 개만 가져옴
+    now = now or timezone.now()
+    teams = Team.objects.all()
+    slots = MatchSlot.objects.filter(ends_at__gt=now).order_by()
+    if team_ids is not None:
+        teams = teams.filter(pk__in=team_ids)
+        slots = slots.filter(team_id__in=team_ids)
+    teams = [TeamInfo(*row) for row in teams.values_list('pk', 'name', 'region', 'skill_tier', 'age_group')]
+    slots = [Slot(*row) for row in slots.values_list('starts_at', 'ends_at', 'pk', 'team_id', 'venue_id')]
+    return teams, slots
+
+
+def mark_teams_changed(team_ids):
+    # 매칭 엔진이 이 팀들을 다시 불러오게 함. signals가 부르고, bulk_create/update처럼 signal이 없는
+    # 변경 뒤에는 직접 부름. 데이터와 같은 트랜잭션에 남으므로 커밋된 뒤에야 다른 워커에 보임
+    now = timezone.now()
+    ScheduleChange.objects.bulk_create([ScheduleChange(team_id=pk) for pk in set(team_ids)])
+    ScheduleChange.objects.filter(changed_at__lt=now - CHANGE_LOG_RETENTION).delete()
+
+
+def sync_engine(engine, now=None):
+    # 엔진을 DB 상태에 맞춤. 처음이거나 마지막으로 읽은 변경 기록이 정리되었으면 전체를 읽고,
+    # 아니면 그 뒤에 바뀐 팀과 일정이 끝난 팀만 불러옴. 바뀐 팀의 pk 집합을 돌려줌
+    now = now or timezone.now()
+    latest = ScheduleChange.objects.order_by('-pk').values_list('pk', 'changed_at').first()
+    last = engine.last_change
+    if last is None or (last[0] and not ScheduleChange.objects.filter(pk=last[0], changed_at=last[1]).exists()):
+        changed = engine.update(*load_state(now))
+    else:
+        team_ids = engine.expired_teams(now)
+        if last[0]:
+            team_ids.update(ScheduleChange.objects.filter(
+                Q(pk__gt=last[0]) | Q(changed_at__gte=last[1] - CHANGE_LOG_GRACE)
+            ).values_list('team_id', flat=True))
+        else:
+            team_ids.update(ScheduleChange.objects.values_list('team_id', flat=True))
+        changed = engine.update(*load_state(now, team_ids), team_ids) if team_ids else set()
+    engine.last_change = latest or (0, None)
+    return changed
+
+
+_engine = MatchEngine()
+_lock = threading.Lock()
+
+
+def find_matches(team_id=None, limit=None, now=None):
+    # 프로세스마다 엔진 하나를 두고, 부를 때마다 다른 워커나 admin에서 바뀐 팀만 DB에서 다시 읽어
+    # 계산함. (후보 목록, 다시 계산한 팀 수)를 돌려줌
+    with _lock:
+        changed = sync_engine(_engine, now)
+        return _engine.candidates(team_id, limit), len(changed)
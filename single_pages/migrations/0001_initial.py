@@ -0,0 +1,100 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['starts_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('region', models.CharField(choices=[('강남구', '강남구'), ('강동구', '강동구'), ('강북구', '강북구'), ('강서구', '강서구'), ('관악구', '관악구'), ('광진구', '광진구'), ('구로구', '구로구'), ('금천구', '금천구'), ('노원구', '노원구'), ('도봉구', '도봉구'), ('동대문구', '동대문구'), ('동작구', '동작구'), ('마포구', '마포구'), ('서대문구', '서대문구'), ('서초구', '서초구'), ('성동구', '성동구'), ('성북구', '성북구'), ('송파구', '송파구'), ('양천구', '양천구'), ('영등포구', '영등포구'), ('용산구', '용산구'), ('은평구', '은평구'), ('종로구', '종로구'), ('중구', '중구'), ('중랑구', '중랑구')], max_length=10)),
+                ('skill_tier', models.CharField(choices=[('low', '하(0%~35%)'), ('mid', '중(36%~70%)'), ('high', '상(71%~100%)')], max_length=10)),
+                ('age_group', models.CharField(choices=[('high_school', '고등학생'), ('university', '대학생'), ('worker', '직장인')], max_length=20)),
+                ('description', models.TextField(blank=True)),
+                ('image', models.ImageField(blank=True, upload_to='single_pages/teams/%Y/%m/%d/')),
+                ('detail_image', models.ImageField(blank=True, upload_to='single_pages/teams/%Y/%m/%d/')),
+                ('static_image', models.CharField(blank=True, editable=False, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Venue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('region', models.CharField(choices=[('강남구', '강남구'), ('강동구', '강동구'), ('강북구', '강북구'), ('강서구', '강서구'), ('관악구', '관악구'), ('광진구', '광진구'), ('구로구', '구로구'), ('금천구', '금천구'), ('노원구', '노원구'), ('도봉구', '도봉구'), ('동대문구', '동대문구'), ('동작구', '동작구'), ('마포구', '마포구'), ('서대문구', '서대문구'), ('서초구', '서초구'), ('성동구', '성동구'), ('성북구', '성북구'), ('송파구', '송파구'), ('양천구', '양천구'), ('영등포구', '영등포구'), ('용산구', '용산구'), ('은평구', '은평구'), ('종로구', '종로구'), ('중구', '중구'), ('중랑구', '중랑구')], max_length=10)),
+                ('address', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'ordering': ['region', 'name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['region', 'name'], name='venue_region_name'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['region', 'skill_tier', 'age_group', 'name'], name='team_region_skill_group'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['skill_tier', 'age_group', 'name'], name='team_skill_group'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['age_group', 'name'], name='team_group'),
+        ),
+        migrations.AddField(
+            model_name='matchslot',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='single_pages.team'),
+        ),
+        migrations.AddField(
+            model_name='matchslot',
+            name='venue',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='slots', to='single_pages.venue'),
+        ),
+        migrations.AddIndex(
+            model_name='matchslot',
+            index=models.Index(fields=['team', 'starts_at'], name='slot_team_starts'),
+        ),
+        migrations.AddIndex(
+            model_name='matchslot',
+            index=models.Index(fields=['venue', 'starts_at'], name='slot_venue_starts'),
+        ),
+        migrations.AddIndex(
+            model_name='matchslot',
+            index=models.Index(fields=['starts_at'], name='slot_starts'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchslot',
+            constraint=models.CheckConstraint(check=models.Q(('ends_at__gt', django.db.models.expressions.F('starts_at'))), name='slot_ends_after_starts'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:07
+
+from django.db import migrations
+
+# 예전 about_site.html에 직접 적혀 있던 팀들
+TEAMS = [
+    ('A.F.C', '은평구', 'low', 'high_school'),
+    ('ALL.IS.ONE', '송파구', 'mid', 'university'),
+    ('B.S.F', '강남구', 'mid', 'university'),
+    ('COMET', '종로구', 'high', 'worker'),
+    ('gyn&n', '성동구', 'high', 'university'),
+    ('lovepink', '광진구', 'high', 'high_school'),
+    ('mbk', '도봉구', 'mid', 'worker'),
+    ('sg.fc', '강북구', 'high', 'university'),
+    ('suyday', '마포구', 'low', 'worker'),
+    ('tong', '양천구', 'low', 'high_school'),
+]
+
+
+def create_teams(apps, schema_editor):
+    Team = apps.get_model('single_pages', 'Team')
+    Team.objects.bulk_create([
+        Team(
+            name=name,
+            region=region,
+            skill_tier=skill_tier,
+            age_group=age_group,
+            static_image=f'single_pages/images/team{i:02d}',
+        )
+        for i, (name, region, skill_tier, age_group) in enumerate(TEAMS, start=1)
+    ])
+
+
+def delete_teams(apps, schema_editor):
+    Team = apps.get_model('single_pages', 'Team')
+    Team.objects.filter(name__in=[team[0] for team in TEAMS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_teams, delete_teams),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0002_initial_teams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='reservation_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('opponent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='opponent_reservations', to='single_pages.team')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='single_pages.team')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='single_pages.venue')),
+            ],
+            options={
+                'ordering': ['starts_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['venue', 'starts_at', 'ends_at'], name='reservation_venue_time'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['team', 'starts_at'], name='reservation_team_starts'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.CheckConstraint(check=models.Q(('ends_at__gt', django.db.models.expressions.F('starts_at'))), name='reservation_ends_after_starts'),
+        ),
+    ]
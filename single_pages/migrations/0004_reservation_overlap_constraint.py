@@ -0,0 +1,58 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:52
+
+from django.db import migrations
+
+# 같은 구장에서 시간이 겹치는 예약을 막는 DB 제약. 14400초는 예약 한 건의 최대 길이(4시간).
+# PostgreSQL은 btree_gist 확장이 필요함 (CREATE EXTENSION 권한이 없으면 DBA가 먼저 만들어 둬야 함)
+OVERLAP_CONSTRAINT_SQL = {
+    'postgresql': (
+        [
+            'CREATE EXTENSION IF NOT EXISTS btree_gist',
+            'ALTER TABLE single_pages_reservation ADD CONSTRAINT reservation_no_overlap '
+            'EXCLUDE USING gist (venue_id WITH =, tsrange(starts_at, ends_at) WITH &&)',
+        ],
+        ['ALTER TABLE single_pages_reservation DROP CONSTRAINT reservation_no_overlap'],
+    ),
+    'sqlite': (
+        [
+            f'''
+            CREATE TRIGGER reservation_no_overlap_{event.lower()} BEFORE {event} ON single_pages_reservation
+            WHEN EXISTS (
+                SELECT 1 FROM single_pages_reservation r
+                WHERE r.venue_id = NEW.venue_id AND r.id IS NOT NEW.id
+                AND r.starts_at > datetime(NEW.starts_at, '-14400 seconds')
+                AND r.starts_at < NEW.ends_at AND r.ends_at > NEW.starts_at
+            )
+            BEGIN
+                SELECT RAISE(ABORT, 'reservation_no_overlap');
+            END
+            '''
+            for event in ('INSERT', 'UPDATE')
+        ],
+        [
+            'DROP TRIGGER reservation_no_overlap_insert',
+            'DROP TRIGGER reservation_no_overlap_update',
+        ],
+    ),
+}
+
+
+def create_overlap_constraint(apps, schema_editor):
+    for sql in OVERLAP_CONSTRAINT_SQL.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    for sql in OVERLAP_CONSTRAINT_SQL.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0003_reservations'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_overlap_constraint, drop_overlap_constraint),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0004_reservation_overlap_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('home_goals', models.PositiveSmallIntegerField()),
+                ('away_goals', models.PositiveSmallIntegerField()),
+                ('played_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-played_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamStanding',
+            fields=[
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='standing', serialize=False, to='single_pages.team')),
+                ('region', models.CharField(choices=[('강남구', '강남구'), ('강동구', '강동구'), ('강북구', '강북구'), ('강서구', '강서구'), ('관악구', '관악구'), ('광진구', '광진구'), ('구로구', '구로구'), ('금천구', '금천구'), ('노원구', '노원구'), ('도봉구', '도봉구'), ('동대문구', '동대문구'), ('동작구', '동작구'), ('마포구', '마포구'), ('서대문구', '서대문구'), ('서초구', '서초구'), ('성동구', '성동구'), ('성북구', '성북구'), ('송파구', '송파구'), ('양천구', '양천구'), ('영등포구', '영등포구'), ('용산구', '용산구'), ('은평구', '은평구'), ('종로구', '종로구'), ('중구', '중구'), ('중랑구', '중랑구')], max_length=10)),
+                ('skill_tier', models.CharField(choices=[('low', '하'), ('mid', '중'), ('high', '상')], max_length=10)),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('goals_for', models.PositiveIntegerField(default=0)),
+                ('goals_against', models.PositiveIntegerField(default=0)),
+                ('goal_difference', models.IntegerField(default=0)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('rating', models.FloatField(default=1500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-rating'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='skill_tier',
+            field=models.CharField(choices=[('low', '하'), ('mid', '중'), ('high', '상')], max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['region', 'skill_tier', '-rating', 'team'], name='standing_region_skill_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['region', '-rating', 'team'], name='standing_region_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['skill_tier', '-rating', 'team'], name='standing_skill_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['-rating', 'team'], name='standing_rating'),
+        ),
+        migrations.AddField(
+            model_name='matchresult',
+            name='away',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='away_results', to='single_pages.team'),
+        ),
+        migrations.AddField(
+            model_name='matchresult',
+            name='home',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='home_results', to='single_pages.team'),
+        ),
+        migrations.AddField(
+            model_name='matchresult',
+            name='reservation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='single_pages.reservation'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchresult',
+            constraint=models.CheckConstraint(check=models.Q(('home', django.db.models.expressions.F('away')), _negated=True), name='result_different_teams'),
+        ),
+    ]
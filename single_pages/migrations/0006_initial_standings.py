@@ -0,0 +1,23 @@
+# Generated by Django 3.2.6 on 2026-10-18 16:19
+
+from django.db import migrations
+
+
+def create_standings(apps, schema_editor):
+    Team = apps.get_model('single_pages', 'Team')
+    TeamStanding = apps.get_model('single_pages', 'TeamStanding')
+    TeamStanding.objects.bulk_create([
+        TeamStanding(team=team, region=team.region, skill_tier=team.skill_tier)
+        for team in Team.objects.filter(standing__isnull=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0005_standings'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_standings, migrations.RunPython.noop),
+    ]
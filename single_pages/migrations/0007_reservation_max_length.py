@@ -0,0 +1,48 @@
+# Generated by Django 3.2.6 on 2026-10-18 17:26
+
+import datetime
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+# SQLite는 CHECK 제약을 더할 때 테이블을 새로 만들면서 0004의 trigger를 지우므로 다시 만듦 (0004와 같은 SQL)
+SQLITE_OVERLAP_TRIGGER = '''
+CREATE TRIGGER reservation_no_overlap_{name} BEFORE {event} ON single_pages_reservation
+WHEN EXISTS (
+    SELECT 1 FROM single_pages_reservation r
+    WHERE r.venue_id = NEW.venue_id AND r.id IS NOT NEW.id
+    AND r.starts_at > datetime(NEW.starts_at, '-14400 seconds')
+    AND r.starts_at < NEW.ends_at AND r.ends_at > NEW.starts_at
+)
+BEGIN
+    SELECT RAISE(ABORT, 'reservation_no_overlap');
+END
+'''
+
+
+def drop_sqlite_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for event in ('insert', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS reservation_no_overlap_{event}')
+
+
+def create_sqlite_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for event in ('INSERT', 'UPDATE'):
+            schema_editor.execute(SQLITE_OVERLAP_TRIGGER.format(name=event.lower(), event=event))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0006_initial_standings'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_sqlite_triggers, create_sqlite_triggers),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.CheckConstraint(check=models.Q(('ends_at__lte', django.db.models.expressions.CombinedExpression(django.db.models.expressions.F('starts_at'), '+', django.db.models.expressions.Value(datetime.timedelta(seconds=14400))))), name='reservation_max_length'),
+        ),
+        migrations.RunPython(create_sqlite_triggers, drop_sqlite_triggers),
+    ]
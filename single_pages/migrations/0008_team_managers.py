@@ -0,0 +1,20 @@
+# Generated by Django 3.2.6 on 2026-10-18 17:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('single_pages', '0007_reservation_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='managers',
+            field=models.ManyToManyField(blank=True, related_name='managed_teams', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.6 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_pages', '0008_team_managers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_id', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
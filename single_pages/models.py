@@ -1,3 +1,224 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.templatetags.static import static
 
 # Create your models here.
+
+REGIONS = [
+    (name, name) for name in [
+        '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', '노원구',
+        '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구', '성북구', '송파구',
+        '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구',
+    ]
+]
+
+SKILL_TIERS = [
+    ('low', '하'),
+    ('mid', '중'),
+    ('high', '상'),
+]
+
+AGE_GROUPS = [
+    ('high_school', '고등학생'),
+    ('university', '대학생'),
+    ('worker', '직장인'),
+]
+
+
+class Team(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    region = models.CharField(max_length=10, choices=REGIONS)
+    skill_tier = models.CharField(max_length=10, choices=SKILL_TIERS)
+    age_group = models.CharField(max_length=20, choices=AGE_GROUPS)
+    description = models.TextField(blank=True)
+
+    image = models.ImageField(upload_to='single_pages/teams/%Y/%m/%d/', blank=True)
+    detail_image = models.ImageField(upload_to='single_pages/teams/%Y/%m/%d/', blank=True)
+    # 처음 등록된 팀들은 이미지가 static 파일로 들어 있음 (예: single_pages/images/team01)
+    static_image = models.CharField(max_length=100, blank=True, editable=False)
+    # 이 팀 이름으로 구장을 예약할 수 있는 사용자
+    managers = models.ManyToManyField(User, blank=True, related_name='managed_teams')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    def get_image_url(self):
+        if self.image:
+            return self.image.url
+        if self.static_image:
+            return static(f'{self.static_image}_1.png')
+        return static('single_pages/images/Football2.jpg')
+
+    def get_detail_image_url(self):
+        if self.detail_image:
+            return self.detail_image.url
+        if self.static_image:
+            return static(f'{self.static_image}_2.png')
+        return ''
+
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            # 구/실력/그룹 필터는 앞쪽 컬럼부터 쓰는 조합이 많으므로 세 가지 순서로 둠
+            models.Index(fields=['region', 'skill_tier', 'age_group', 'name'], name='team_region_skill_group'),
+            models.Index(fields=['skill_tier', 'age_group', 'name'], name='team_skill_group'),
+            models.Index(fields=['age_group', 'name'], name='team_group'),
+        ]
+
+
+class Venue(models.Model):
+    name = models.CharField(max_length=50)
+    region = models.CharField(max_length=10, choices=REGIONS)
+    address = models.CharField(max_length=200, blank=True)
+    # 예약이 바뀔 때마다 올림. 예약할 때 이 행을 UPDATE 해서 구장 단위로 잠금
+    reservation_version = models.PositiveIntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return f'{self.name} ({self.region})'
+
+    class Meta:
+        ordering = ['region', 'name']
+        indexes = [
+            models.Index(fields=['region', 'name'], name='venue_region_name'),
+        ]
+
+
+class MatchSlot(models.Model):
+    # 팀이 경기를 할 수 있는 시간대
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='slots')
+    venue = models.ForeignKey(Venue, null=True, blank=True, on_delete=models.SET_NULL, related_name='slots')
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.team} {self.starts_at:%Y-%m-%d %H:%M}~{self.ends_at:%H:%M}'
+
+    class Meta:
+        ordering = ['starts_at']
+        indexes = [
+            models.Index(fields=['team', 'starts_at'], name='slot_team_starts'),
+            models.Index(fields=['venue', 'starts_at'], name='slot_venue_starts'),
+            models.Index(fields=['starts_at'], name='slot_starts'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(ends_at__gt=models.F('starts_at')), name='slot_ends_after_starts'),
+        ]
+
+
+# 예약 한 건의 최대 길이. 겹침 확인에서 시작 시각의 하한으로 쓰므로 DB 제약으로도 막음
+MAX_RESERVATION_LENGTH = timedelta(hours=4)
+
+
+class Reservation(models.Model):
+    # 구장 예약. 같은 구장에서 시간이 겹치는 예약은 DB 제약으로 막음
+    # (PostgreSQL은 exclusion constraint, SQLite는 trigger - 마이그레이션 0004, 0007 참고)
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='reservations')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='reservations')
+    opponent = models.ForeignKey(
+        Team, null=True, blank=True, on_delete=models.SET_NULL, related_name='opponent_reservations'
+    )
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.venue.name} {self.starts_at:%Y-%m-%d %H:%M}~{self.ends_at:%H:%M} {self.team}'
+
+    def clean(self):
+        # admin 등에서 저장하기 전에 미리 확인 (동시에 들어온 예약은 DB 제약이 막음)
+        from .reservations import CONFLICT_MESSAGE, overlapping, validate_times
+        if self.starts_at is None or self.ends_at is None:
+            return
+        validate_times(self.starts_at, self.ends_at)
+        if self.venue_id and overlapping(self.venue_id, self.starts_at, self.ends_at).exclude(pk=self.pk).exists():
+            raise ValidationError(CONFLICT_MESSAGE)
+
+    class Meta:
+        ordering = ['starts_at']
+        indexes = [
+            # 구장의 기간별 예약 조회 (ends_at까지 넣어 테이블을 읽지 않음)
+            models.Index(fields=['venue', 'starts_at', 'ends_at'], name='reservation_venue_time'),
+            models.Index(fields=['team', 'starts_at'], name='reservation_team_starts'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(ends_at__gt=models.F('starts_at')), name='reservation_ends_after_starts'),
+            models.CheckConstraint(
+                check=models.Q(ends_at__lte=models.F('starts_at') + MAX_RESERVATION_LENGTH),
+                name='reservation_max_length',
+            ),
+        ]
+
+
+class MatchResult(models.Model):
+    home = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='home_results')
+    away = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_results')
+    home_goals = models.PositiveSmallIntegerField()
+    away_goals = models.PositiveSmallIntegerField()
+    reservation = models.ForeignKey(Reservation, null=True, blank=True, on_delete=models.SET_NULL)
+    played_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.home} {self.home_goals}:{self.away_goals} {self.away}'
+
+    def clean(self):
+        if self.home_id and self.home_id == self.away_id:
+            raise ValidationError('같은 팀끼리는 경기 결과를 기록할 수 없습니다.')
+
+    class Meta:
+        ordering = ['-played_at']
+        constraints = [
+            models.CheckConstraint(check=~models.Q(home=models.F('away')), name='result_different_teams'),
+        ]
+
+
+class TeamStanding(models.Model):
+    # 경기 결과가 기록될 때마다 갱신하는 팀별 집계 (single_pages.standings 참고).
+    # 순위표를 (구, 실력) 안에서 레이팅 순으로 바로 읽을 수 있도록 region, skill_tier를 복사해 둠
+    team = models.OneToOneField(Team, primary_key=True, on_delete=models.CASCADE, related_name='standing')
+    region = models.CharField(max_length=10, choices=REGIONS)
+    skill_tier = models.CharField(max_length=10, choices=SKILL_TIERS)
+
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    goals_for = models.PositiveIntegerField(default=0)
+    goals_against = models.PositiveIntegerField(default=0)
+    goal_difference = models.IntegerField(default=0)
+    points = models.PositiveIntegerField(default=0)
+    rating = models.FloatField(default=1500)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.team} ({self.rating:.0f})'
+
+    class Meta:
+        ordering = ['-rating']
+        indexes = [
+            # 구/실력 필터 조합마다 레이팅 순서(같으면 팀 순서) 그대로 읽는 인덱스
+            models.Index(fields=['region', 'skill_tier', '-rating', 'team'], name='standing_region_skill_rating'),
+            models.Index(fields=['region', '-rating', 'team'], name='standing_region_rating'),
+            models.Index(fields=['skill_tier', '-rating', 'team'], name='standing_skill_rating'),
+            models.Index(fields=['-rating', 'team'], name='standing_rating'),
+        ]
+
+
+class ScheduleChange(models.Model):
+    # 팀 정보나 일정이 바뀐 팀 (single_pages.signals에서 남김). 매칭 엔진은 워커마다 마지막으로 읽은 뒤의
+    # 기록만 읽어 그 팀들만 다시 불러옴. 지워진 팀도 남아야 하므로 팀 pk를 외래 키 없이 둠
+    team_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.team_id} {self.changed_at:%Y-%m-%d %H:%M:%S}'
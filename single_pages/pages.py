@@ -0,0 +1,17 @@
+from board.avatars import prefetch_avatar_urls
+from board.models import Post
+from board.pages import Page
+
+
+def get_recent_posts():
+    recent_posts = list(Post.objects.select_related('author').order_by('-pk')[:3])
+    prefetch_avatar_urls([post.author for post in recent_posts])
+    return recent_posts
+
+
+def landing_page(request):
+    return Page(
+        'single_pages/landing.html',
+        [get_recent_posts],
+        lambda recent_posts: {'recent_posts': recent_posts},
+    )
@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F
+
+from .models import MAX_RESERVATION_LENGTH, Venue, Reservation
+
+# 구장 운영 시간 (빈 시간 계산용)
+OPEN_HOUR = 6
+CLOSE_HOUR = 24
+
+# SQLite에서 다른 연결이 쓰기 잠금을 오래 잡고 있을 때 다시 시도하는 횟수
+LOCK_RETRIES = 20
+LOCK_RETRY_DELAY = 0.05
+
+CONFLICT_MESSAGE = '이미 예약된 시간입니다.'
+
+
+def overlapping(venue, start, end):
+    # (venue, starts_at, ends_at) 인덱스의 범위 조회. 예약 길이의 상한은 DB 제약(reservation_max_length)으로
+    # 지켜지므로 start보다 MAX_RESERVATION_LENGTH 이전에 시작한 예약은 볼 필요가 없음
+    return Reservation.objects.filter(
+        venue=venue,
+        starts_at__gt=start - MAX_RESERVATION_LENGTH,
+        starts_at__lt=end,
+        ends_at__gt=start,
+    )
+
+
+def validate_times(starts_at, ends_at):
+    if ends_at <= starts_at:
+        raise ValidationError('끝나는 시각은 시작 시각보다 늦어야 합니다.')
+    if ends_at - starts_at > MAX_RESERVATION_LENGTH:
+        raise ValidationError(f'한 번에 {MAX_RESERVATION_LENGTH.seconds // 3600}시간까지 예약할 수 있습니다.')
+
+
+def is_locked(error):
+    return 'locked' in str(error)
+
+
+def reserve(venue, team, starts_at, ends_at, opponent=None):
+    # 구장 행을 UPDATE 해서 잠근 뒤(PostgreSQL은 행 잠금, SQLite는 DB 쓰기 잠금)
+    # 겹치는 예약이 없을 때만 저장함. 잠금 없이 들어온 예약(admin 등)은 DB 제약이 막음.
+    # 겹치면 ValidationError
+    validate_times(starts_at, ends_at)
+    venue_pk = venue.pk if isinstance(venue, Venue) else venue
+
+    for attempt in range(LOCK_RETRIES):
+        try:
+            with transaction.atomic():
+                Venue.objects.filter(pk=venue_pk).update(reservation_version=F('reservation_version') + 1)
+                if overlapping(venue_pk, starts_at, ends_at).exists():
+                    raise ValidationError(CONFLICT_MESSAGE)
+                return Reservation.objects.create(
+                    venue_id=venue_pk, team=team, opponent=opponent, starts_at=starts_at, ends_at=ends_at,
+                )
+        except IntegrityError as e:
+            if 'reservation_no_overlap' not in str(e):
+                raise
+            raise ValidationError(CONFLICT_MESSAGE)
+        except OperationalError as e:
+            if not is_locked(e) or attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(LOCK_RETRY_DELAY * (attempt + 1))
+
+
+def week_range(day):
+    # day가 속한 주 (월요일 0시 ~ 다음 주 월요일 0시)
+    start = datetime.combine(day - timedelta(days=day.weekday()), datetime.min.time())
+    return start, start + timedelta(days=7)
+
+
+def free_slots(venue, start, end, min_length=timedelta(hours=1)):
+    # 기간 안에서 운영 시간 중 예약되지 않은 구간 (start, end) 목록.
+    # 예약은 인덱스로 시작 시각 순으로 한 번에 가져옴
+    reservations = list(
+        overlapping(venue, start, end).order_by('starts_at').values_list('starts_at', 'ends_at')
+    )
+
+    slots = []
+    day = start.date()
+    while datetime.combine(day, datetime.min.time()) < end:
+        midnight = datetime.combine(day, datetime.min.time())
+        cursor = max(midnight + timedelta(hours=OPEN_HOUR), start)
+        closing = min(midnight + timedelta(hours=CLOSE_HOUR), end)
+        for booked_start, booked_end in reservations:
+            if booked_end <= cursor or booked_start >= closing:
+                continue
+            if booked_start - cursor >= min_length:
+                slots.append((cursor, booked_start))
+            cursor = max(cursor, booked_end)
+        if closing - cursor >= min_length:
+            slots.append((cursor, closing))
+        day += timedelta(days=1)
+    return slots
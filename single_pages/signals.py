@@ -0,0 +1,39 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .matching import mark_teams_changed
+from .models import Team, MatchSlot
+from .standings import sync_team, rebuild_standings
+
+
+@receiver(post_save, sender=Team)
+def sync_team_standing(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_team(instance)
+
+
+@receiver(post_delete, sender=Team)
+def rebuild_standings_on_team_delete(sender, instance, **kwargs):
+    # 팀을 지우면 그 팀의 경기 결과도 같이 지워지므로 상대 팀들의 집계와 레이팅을 다시 계산함
+    rebuild_standings()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def mark_team_changed(sender, instance, **kwargs):
+    # 매칭 엔진이 이 팀을 다시 불러오게 함
+    mark_teams_changed([instance.pk])
+
+
+@receiver(pre_save, sender=MatchSlot)
+def remember_slot_team(sender, instance, raw=False, **kwargs):
+    # admin에서 일정의 팀을 바꾸면 원래 팀도 다시 계산해야 함
+    if instance.pk and not raw:
+        instance._previous_team_id = MatchSlot.objects.filter(pk=instance.pk).values_list('team_id', flat=True).first()
+
+
+@receiver(post_save, sender=MatchSlot)
+@receiver(post_delete, sender=MatchSlot)
+def mark_slot_team_changed(sender, instance, **kwargs):
+    team_ids = {instance.team_id, getattr(instance, '_previous_team_id', None)} - {None}
+    mark_teams_changed(team_ids)
@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models import Func, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import Team, MatchResult, TeamStanding
+
+INITIAL_RATING = 1500
+ELO_K = 32
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+
+def expected_score(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def apply_result(home, away, home_goals, away_goals):
+    # home, away: TeamStanding. 저장은 하지 않음
+    for standing, goals_for, goals_against in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+        standing.played += 1
+        standing.goals_for += goals_for
+        standing.goals_against += goals_against
+        standing.goal_difference = standing.goals_for - standing.goals_against
+        if goals_for > goals_against:
+            standing.wins += 1
+            standing.points += POINTS_FOR_WIN
+        elif goals_for == goals_against:
+            standing.draws += 1
+            standing.points += POINTS_FOR_DRAW
+        else:
+            standing.losses += 1
+
+    score = 1 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0
+    change = ELO_K * (score - expected_score(home.rating, away.rating))
+    home.rating += change
+    away.rating -= change
+
+
+def new_standing(team):
+    return TeamStanding(team=team, region=team.region, skill_tier=team.skill_tier, rating=INITIAL_RATING)
+
+
+def record_result(result):
+    # result: 저장하지 않은 MatchResult. 결과 저장과 두 팀의 집계 갱신을 한 트랜잭션에서 함.
+    # 두 팀의 집계 행은 pk 순서로 잠가서 같은 팀의 결과가 동시에 들어와도 갱신이 섞이거나 교착되지 않음.
+    # 레이팅은 결과가 기록된 순서대로 계산됨 (rebuild_standings도 같은 순서)
+    with transaction.atomic():
+        if result.played_at is None:
+            result.played_at = timezone.now()
+        result.full_clean()
+        result.save()
+
+        home, away = result.home, result.away
+        for team in sorted((home, away), key=lambda team: team.pk):
+            TeamStanding.objects.get_or_create(
+                team=team, defaults={'region': team.region, 'skill_tier': team.skill_tier}
+            )
+        standings = TeamStanding.objects.select_for_update().in_bulk([home.pk, away.pk])
+        apply_result(standings[home.pk], standings[away.pk], result.home_goals, result.away_goals)
+        for standing in standings.values():
+            standing.save()
+    return result
+
+
+def rebuild_standings():
+    # 모든 결과를 기록된 순서대로 다시 계산해 집계 테이블을 통째로 바꿈 (결과를 고치거나 지운 뒤)
+    with transaction.atomic():
+        standings = {team.pk: new_standing(team) for team in Team.objects.all()}
+        results = MatchResult.objects.order_by('pk').values_list('home_id', 'away_id', 'home_goals', 'away_goals')
+        for home_id, away_id, home_goals, away_goals in results.iterator():
+            apply_result(standings[home_id], standings[away_id], home_goals, away_goals)
+
+        TeamStanding.objects.all().delete()
+        TeamStanding.objects.bulk_create(standings.values(), batch_size=500)
+    return len(standings)
+
+
+def sync_team(team):
+    # 팀의 구/실력이 바뀌면 집계 행에 복사해 둔 값도 바꿈 (새 팀이면 집계 행을 만듦)
+    updated = TeamStanding.objects.filter(team=team).update(region=team.region, skill_tier=team.skill_tier)
+    if not updated:
+        TeamStanding.objects.get_or_create(team=team, defaults={'region': team.region, 'skill_tier': team.skill_tier})
+
+
+def get_standings(region=None, skill_tier=None):
+    # 구/실력 안에서 레이팅 순서. 조건 조합마다 맞는 인덱스가 있음
+    conditions = {name: value for name, value in (('region', region), ('skill_tier', skill_tier)) if value}
+    return TeamStanding.objects.filter(**conditions).select_related('team').order_by('-rating', 'team_id')
+
+
+def get_top_percents(standings):
+    # 전체 팀 중 레이팅 상위 몇 %인지 (예전 카드에 손으로 적던 실력수준 %를 대신함).
+    # 전체 레이팅을 읽지 않고, 보여줄 팀마다 자기보다 레이팅이 높은 팀 수를 레이팅 인덱스로 세서 한 쿼리로 가져옴
+    pks = [standing.pk for standing in standings if standing is not None]
+    if not pks:
+        return {}
+    counts = TeamStanding.objects.order_by().annotate(count=Func('pk', function='COUNT')).values('count')
+    rows = TeamStanding.objects.filter(pk__in=pks).order_by().annotate(
+        above=Subquery(counts.filter(rating__gt=OuterRef('rating'))),
+        total=Subquery(counts),
+    ).values_list('pk', 'above', 'total')
+    return {pk: max(round((above + 1) * 100 / total), 1) for pk, above, total in rows}
@@ -1,7 +1,21 @@
-from django.test import TestCase, Client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.test import TestCase, TransactionTestCase, Client
 from django.contrib.auth.models import User
 from bs4 import BeautifulSoup
+from datetime import datetime, timedelta
+from io import StringIO
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from board.explain import find_full_scans
+from django.utils import timezone
 from board.models import Post
+from .matching import MatchEngine, find_matches, load_state, sync_engine
+from .models import Team, Venue, MatchSlot, Reservation, MatchResult, TeamStanding
+from .reservations import reserve, free_slots, week_range
+from .standings import record_result, get_standings
 
 class TestView(TestCase):
     def setUp(self):
@@ -41,4 +55,315 @@ class TestView(TestCase):
         self.assertNotIn(post_001.title, body.text)
         self.assertIn(post_002.title, body.text)
         self.assertIn(post_003.title, body.text)
-        self.assertIn(post_004.title, body.text)
\ No newline at end of file
+        self.assertIn(post_004.title, body.text)
+
+    def test_about_site(self):
+        # 마이그레이션으로 등록된 팀 10개
+        self.assertEqual(Team.objects.count(), 10)
+        venue = Venue.objects.create(name='은평 풋살장', region='은평구')
+        afc = Team.objects.get(name='A.F.C')
+        MatchSlot.objects.create(
+            team=afc, venue=venue,
+            starts_at=timezone.now() + timedelta(days=1),
+            ends_at=timezone.now() + timedelta(days=1, hours=2),
+        )
+        MatchSlot.objects.create(
+            team=afc,
+            starts_at=timezone.now() - timedelta(days=1),
+            ends_at=timezone.now() - timedelta(days=1) + timedelta(hours=2),
+        )
+
+        # 팀 목록(개수, 페이지), 다가오는 일정, 레이팅 분포, 순위표
+        with self.assertNumQueries(5):
+            response = self.client.get('/about_site/')
+        self.assertEqual(response.status_code, 200)
+        soup = BeautifulSoup(response.content, 'html.parser')
+        cards = soup.find_all('h5', class_='card-title')
+        self.assertEqual(len(cards), 9)
+        self.assertEqual(cards[0].text, 'A.F.C')
+        modal = soup.find('div', id=f'team-{afc.pk}')
+        self.assertEqual(len(modal.find('ul', class_='team-slots').find_all('li')), 1)
+        self.assertIn('은평 풋살장', modal.text)
+        self.assertIn('page=2', soup.find('ul', class_='pagination').decode())
+
+        response = self.client.get('/about_site/?page=2')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertEqual([card.text for card in soup.find_all('h5', class_='card-title')], ['tong'])
+
+        # 구/실력/그룹으로 거르고, 페이지 링크에 필터가 남아 있어야 함
+        response = self.client.get('/about_site/?skill_tier=high&age_group=university')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertEqual([card.text for card in soup.find_all('h5', class_='card-title')], ['gyn&n', 'sg.fc'])
+        self.assertIsNone(soup.find('ul', class_='pagination'))
+        self.assertEqual(soup.find('option', selected=True).text, '상')
+
+        Team.objects.create(name='new team', region='은평구', skill_tier='low', age_group='high_school')
+        response = self.client.get('/about_site/?region=은평구')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertEqual([card.text for card in soup.find_all('h5', class_='card-title')], ['A.F.C', 'new team'])
+
+        # 잘못된 값은 무시
+        response = self.client.get('/about_site/?region=없는구&page=99')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertEqual(len(soup.find_all('h5', class_='card-title')), 2)
+
+    def test_matching(self):
+        tomorrow = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        teams = {team.name: team for team in Team.objects.all()}
+        venue = Venue.objects.create(name='강북 풋살장', region='강북구')
+
+        def add_slot(name, start, end, venue=None):
+            return MatchSlot.objects.create(
+                team=teams[name], venue=venue,
+                starts_at=tomorrow + timedelta(hours=start), ends_at=tomorrow + timedelta(hours=end),
+            )
+
+        add_slot('A.F.C', 18, 20)
+        add_slot('suyday', 18.5, 20.5)
+        add_slot('tong', 18, 20)  # 다른 권역
+        add_slot('sg.fc', 18, 20, venue)
+        moved = add_slot('gyn&n', 19, 21)
+        add_slot('mbk', 18, 20)
+        add_slot('lovepink', 19.5, 21)
+        add_slot('COMET', 10, 12)  # 겹치는 일정 없음
+
+        candidates, _ = find_matches()
+        self.assertEqual(
+            [(match.team_id, match.opponent_id, match.score) for match in candidates],
+            [
+                (teams['gyn&n'].pk, teams['sg.fc'].pk, 1.75),
+                # 점수가 같으면 이른 일정부터
+                (teams['A.F.C'].pk, teams['suyday'].pk, 1.375),
+                (teams['gyn&n'].pk, teams['lovepink'].pk, 1.375),
+                (teams['mbk'].pk, teams['sg.fc'].pk, 1.0),
+                (teams['gyn&n'].pk, teams['mbk'].pk, 0.75),
+            ],
+        )
+
+        candidates, _ = find_matches(teams['sg.fc'].pk)
+        self.assertEqual([match.opponent_id for match in candidates], [teams['gyn&n'].pk, teams['mbk'].pk])
+        self.assertEqual(candidates[0].team_id, teams['sg.fc'].pk)
+        self.assertEqual(candidates[0].start, tomorrow + timedelta(hours=19))
+        self.assertEqual(candidates[0].venue_id, venue.pk)
+
+        # 바뀌지 않았으면 다시 계산하지 않고, 일정이 바뀐 팀만 다시 계산함
+        self.assertEqual(find_matches()[1], 0)
+        moved.starts_at += timedelta(days=7)
+        moved.ends_at += timedelta(days=7)
+        moved.save()
+        candidates, changed = find_matches(teams['sg.fc'].pk)
+        self.assertEqual(changed, 1)
+        self.assertEqual([match.opponent_id for match in candidates], [teams['mbk'].pk])
+
+        # 바뀐 팀만 다시 계산한 결과는 처음부터 계산한 결과와 같아야 함
+        engine = MatchEngine()
+        engine.update(*load_state())
+        self.assertEqual(engine.candidates(), find_matches()[0])
+
+        # 다른 워커의 엔진도 변경 기록으로 바뀐 팀만 불러오고, 팀/일정 테이블 전체는 다시 읽지 않음
+        engine = MatchEngine()
+        sync_engine(engine)
+        add_slot('COMET', 11, 13)
+        tong = teams['tong'].pk
+        teams['tong'].delete()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(sync_engine(engine), {teams['COMET'].pk, tong})
+        for query in context.captured_queries:
+            if 'FROM "single_pages_team"' in query['sql'] or 'FROM "single_pages_matchslot"' in query['sql']:
+                self.assertIn('WHERE', query['sql'])
+        self.assertNotIn(tong, engine.teams)
+        self.assertEqual(sync_engine(engine), set())
+        self.assertEqual(engine.candidates(), find_matches()[0])
+
+        # 일정이 끝난 팀도 다시 불러옴 (다음 주로 옮긴 일정만 남음)
+        later = tomorrow + timedelta(hours=22)
+        self.assertEqual(sync_engine(engine, later), {teams[name].pk for name in [
+            'A.F.C', 'suyday', 'sg.fc', 'mbk', 'lovepink', 'COMET',
+        ]})
+        self.assertEqual(engine.candidates(), [])
+
+        response = self.client.get(f'/matches/?team={teams["sg.fc"].pk}')
+        self.assertEqual(response.status_code, 200)
+        soup = BeautifulSoup(response.content, 'html.parser')
+        rows = soup.find('table', id='match-list').tbody.find_all('tr')
+        self.assertEqual(len(rows), 1)
+        self.assertIn('mbk', rows[0].text)
+        self.assertIn('강북 풋살장', rows[0].text)
+        self.assertEqual(self.client.get('/matches/?team=999').status_code, 404)
+
+        out = StringIO()
+        call_command('match_teams', '--team', 'A.F.C', stdout=out)
+        self.assertIn('A.F.C vs suyday', out.getvalue())
+
+    def test_reservation(self):
+        venue = Venue.objects.create(name='강북 풋살장', region='강북구')
+        other_venue = Venue.objects.create(name='도봉 풋살장', region='도봉구')
+        team, opponent = Team.objects.get(name='sg.fc'), Team.objects.get(name='mbk')
+        monday = datetime(2026, 10, 19)
+
+        reservation = reserve(venue, team, monday + timedelta(hours=18), monday + timedelta(hours=20), opponent)
+        self.assertEqual(reservation.opponent, opponent)
+        reserve(venue, team, monday + timedelta(hours=20), monday + timedelta(hours=21))
+        reserve(other_venue, team, monday + timedelta(hours=19), monday + timedelta(hours=20))
+        for start, end in [(17, 19), (19, 19.5), (17, 22)]:
+            with self.assertRaises(ValidationError):
+                reserve(venue, team, monday + timedelta(hours=start), monday + timedelta(hours=end))
+        with self.assertRaises(ValidationError):
+            reserve(venue, team, monday + timedelta(hours=10), monday + timedelta(hours=15))
+
+        # 잠금 없이 저장해도 DB 제약이 겹치는 예약을 막음
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Reservation.objects.create(
+                venue=venue, team=team, starts_at=monday + timedelta(hours=19), ends_at=monday + timedelta(hours=22),
+            )
+        # 겹침 확인이 기대는 예약 길이 상한도 DB 제약으로 막음 (bulk_create는 clean을 거치지 않음)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Reservation.objects.bulk_create([Reservation(
+                venue=venue, team=team, starts_at=monday + timedelta(hours=6), ends_at=monday + timedelta(hours=11),
+            )])
+
+        # 빈 시간은 (venue, starts_at, ends_at) 인덱스로 한 번에 조회
+        start, end = week_range(monday.date() + timedelta(days=3))
+        self.assertEqual(start, monday)
+        with CaptureQueriesContext(connection) as context:
+            slots = free_slots(venue, start, end)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(find_full_scans(context.captured_queries[0]['sql']), [])
+        self.assertEqual(slots[:2], [
+            (monday + timedelta(hours=6), monday + timedelta(hours=18)),
+            (monday + timedelta(hours=21), monday + timedelta(hours=24)),
+        ])
+        self.assertEqual(len(slots), 8)
+
+        response = self.client.get(f'/venues/{venue.pk}/?week=2026-10-21')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        self.assertEqual(len(soup.find('ul', id='reservations').find_all('li')), 2)
+        self.assertEqual(len(soup.find('ul', id='free-slots').find_all('li')), 8)
+        self.assertIsNone(soup.find('form', id='reservation-form'))
+
+        # 날짜 범위 끝의 주도 열림
+        for week in ['0001-01-01', '9999-12-31']:
+            self.assertEqual(self.client.get(f'/venues/{venue.pk}/?week={week}').status_code, 200, week)
+
+        self.client.login(username='park', password='parkdjango')
+        data = {'team': team.pk, 'starts_at': '2026-10-20T18:00', 'ends_at': '2026-10-20T20:00'}
+
+        # 관리하지 않는 팀 이름으로는 예약할 수 없음
+        response = self.client.post(f'/venues/{venue.pk}/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('team', response.context['form'].errors)
+        self.assertEqual(Reservation.objects.filter(venue=venue).count(), 2)
+
+        team.managers.add(self.user_park)
+        response = self.client.post(f'/venues/{venue.pk}/', data)
+        self.assertRedirects(response, f'/venues/{venue.pk}/?week=2026-10-20')
+        response = self.client.post(f'/venues/{venue.pk}/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('이미 예약된 시간입니다.', response.content.decode())
+        self.assertEqual(Reservation.objects.filter(venue=venue).count(), 3)
+
+    def test_standings(self):
+        teams = {team.name: team for team in Team.objects.all()}
+
+        def play(home, away, home_goals, away_goals):
+            return record_result(MatchResult(
+                home=teams[home], away=teams[away], home_goals=home_goals, away_goals=away_goals,
+            ))
+
+        play('sg.fc', 'gyn&n', 3, 1)
+        sg_fc = TeamStanding.objects.get(team=teams['sg.fc'])
+        self.assertEqual((sg_fc.played, sg_fc.wins, sg_fc.points, sg_fc.goal_difference), (1, 1, 3, 2))
+        self.assertEqual(sg_fc.rating, 1516)
+        self.assertEqual(TeamStanding.objects.get(team=teams['gyn&n']).rating, 1484)
+
+        play('gyn&n', 'lovepink', 2, 2)
+        play('sg.fc', 'lovepink', 0, 1)
+        play('A.F.C', 'tong', 4, 0)
+        with self.assertRaises(ValidationError):
+            play('mbk', 'mbk', 1, 0)
+        self.assertEqual(MatchResult.objects.count(), 4)
+
+        # 다시 계산해도 결과가 기록될 때마다 갱신한 값과 같아야 함
+        fields = ('team_id', 'played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'points', 'rating')
+        incremental = list(TeamStanding.objects.order_by('team_id').values_list(*fields))
+        out = StringIO()
+        call_command('rebuild_standings', stdout=out)
+        self.assertIn('10 team standing(s) rebuilt.', out.getvalue())
+        self.assertEqual(list(TeamStanding.objects.order_by('team_id').values_list(*fields)), incremental)
+
+        # 구/실력 안에서 레이팅 순서, 인덱스만으로 정렬
+        self.assertEqual(
+            [standing.team.name for standing in get_standings(skill_tier='high')],
+            ['lovepink', 'COMET', 'sg.fc', 'gyn&n'],
+        )
+        for conditions, index in [
+            ({}, 'standing_rating'),
+            ({'region': '광진구'}, 'standing_region_rating'),
+            ({'skill_tier': 'high'}, 'standing_skill_rating'),
+            ({'region': '광진구', 'skill_tier': 'high'}, 'standing_region_skill_rating'),
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                list(get_standings(**conditions)[:10])
+            sql = context.captured_queries[0]['sql']
+            self.assertEqual(find_full_scans(sql), [], conditions)
+            if connection.vendor == 'sqlite':
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    details = [row[3] for row in cursor.fetchall()]
+                self.assertTrue(any(f'USING INDEX {index} ' in f'{d} ' for d in details), (conditions, details))
+                self.assertFalse(any('TEMP B-TREE' in d for d in details), (conditions, details))
+
+        # 팀의 구/실력을 바꾸면 순위표의 값도 바뀜
+        teams['tong'].region = '광진구'
+        teams['tong'].save()
+        self.assertEqual([standing.team.name for standing in get_standings(region='광진구')], ['lovepink', 'tong'])
+        Team.objects.create(name='new team', region='은평구', skill_tier='low', age_group='worker')
+        self.assertEqual(TeamStanding.objects.count(), 11)
+
+        response = self.client.get('/about_site/?skill_tier=high')
+        soup = BeautifulSoup(response.content, 'html.parser')
+        rows = soup.find('table', id='standings').tbody.find_all('tr')
+        self.assertEqual([row.find_all('td')[1].text for row in rows], ['lovepink', 'COMET', 'sg.fc', 'gyn&n'])
+        # lovepink는 11팀 중 레이팅 1위
+        self.assertIn('상(상위 9%)', soup.find('div', id=f'team-{teams["lovepink"].pk}').text)
+
+        # 팀을 지우면 그 팀과의 경기가 빠진 순위표로 다시 계산함
+        teams['sg.fc'].delete()
+        lovepink = TeamStanding.objects.get(team=teams['lovepink'])
+        self.assertEqual((lovepink.played, lovepink.wins, lovepink.draws, lovepink.points), (1, 0, 1, 1))
+        self.assertEqual(TeamStanding.objects.get(team=teams['gyn&n']).rating, 1500)
+        self.assertEqual(TeamStanding.objects.count(), 10)
+
+
+class TestReservationConcurrency(TransactionTestCase):
+    # 여러 연결에서 동시에 같은 시간을 예약해도 하나만 성공해야 함
+    serialized_rollback = True
+
+    def test_concurrent_reservations(self):
+        venue = Venue.objects.create(name='강북 풋살장', region='강북구')
+        teams = list(Team.objects.all())
+        starts_at = datetime(2026, 10, 19, 18)
+        attempts = 200
+        barrier = threading.Barrier(20)
+
+        def attempt(i):
+            try:
+                if i < barrier.parties:
+                    barrier.wait()
+                # 절반은 같은 시간, 나머지는 30분씩 어긋난 시간
+                offset = timedelta(minutes=30 * (i % 4)) if i % 2 else timedelta(0)
+                reserve(venue, teams[i % len(teams)], starts_at + offset, starts_at + offset + timedelta(hours=2))
+                return True
+            except ValidationError:
+                return False
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=barrier.parties) as executor:
+            results = list(executor.map(attempt, range(attempts)))
+
+        reservations = list(Reservation.objects.filter(venue=venue).order_by('starts_at'))
+        self.assertEqual(results.count(True), len(reservations))
+        self.assertGreaterEqual(len(reservations), 1)
+        for previous, current in zip(reservations, reservations[1:]):
+            self.assertLessEqual(previous.ends_at, current.starts_at)
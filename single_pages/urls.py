@@ -1,7 +1,10 @@
 from django.urls import path
-from . import views
+from board.async_views import page_view
+from . import async_views, views
 
 urlpatterns = [
     path('about_site/', views.about_site),
-    path('',views.landing),
+    path('matches/', views.matches),
+    path('venues/<int:pk>/', views.venue_schedule),
+    path('', page_view(views.landing, async_views.landing)),
 ]
\ No newline at end of file
@@ -1,19 +1,122 @@
-from django.shortcuts import render
-from board.models import Post
+from datetime import date, timedelta
+
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Prefetch
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from board.caching import cache_anonymous_page, board_page_condition
+from board.pages import render_page
+from .forms import TeamFilterForm, ReservationForm
+from .matching import find_matches
+from .models import Team, Venue, MatchSlot
+from .pages import landing_page
+from .reservations import reserve, free_slots, overlapping, week_range
+from .standings import get_standings, get_top_percents
 # Create your views here.
 
+TEAMS_PER_PAGE = 9
+MATCHES_PER_PAGE = 30
+STANDINGS_LIMIT = 10
+
+@board_page_condition
+@cache_anonymous_page
 def landing(request):
-    recent_posts = Post.objects.order_by('-pk')[:3]
+    return render_page(request, landing_page(request))
+
+def about_site(request):
+    # 팀 목록은 DB에서 구/실력/그룹으로 걸러 한 페이지씩 가져오고,
+    # 각 팀의 다가오는 일정은 한 번의 쿼리로 모아 옴
+    filter_form = TeamFilterForm(request.GET)
+    upcoming_slots = MatchSlot.objects.filter(starts_at__gte=timezone.now()).select_related('venue')
+    teams = filter_form.filter(Team.objects.select_related('standing')).prefetch_related(
+        Prefetch('slots', queryset=upcoming_slots, to_attr='upcoming_slots')
+    )
+    page = Paginator(teams, TEAMS_PER_PAGE).get_page(request.GET.get('page'))
+    top_percents = get_top_percents([getattr(team, 'standing', None) for team in page.object_list])
+    for team in page.object_list:
+        team.top_percent = top_percents.get(team.pk)
+
+    # 순위표는 같은 구/실력 조건으로 (그룹은 순위표 인덱스에 없으므로 쓰지 않음)
+    conditions = filter_form.cleaned_data
+    standing_list = get_standings(conditions.get('region'), conditions.get('skill_tier'))[:STANDINGS_LIMIT]
+
+    query = request.GET.copy()
+    query.pop('page', None)
     return render(
         request,
-        'single_pages/landing.html',
+        'single_pages/about_site.html',
         {
-            'recent_posts': recent_posts,
+            'filter_form': filter_form,
+            'page_obj': page,
+            'team_list': page.object_list,
+            'filter_query': query.urlencode(),
+            'standing_list': standing_list,
         }
     )
 
-def about_site(request):
+def matches(request):
+    # 매칭 후보. ?team=<pk>이면 그 팀의 상대 후보, 없으면 전체에서 점수가 높은 순
+    team = None
+    if request.GET.get('team', '').isdigit():
+        team = get_object_or_404(Team, pk=request.GET['team'])
+    candidates, _ = find_matches(team.pk if team else None, limit=MATCHES_PER_PAGE)
+
+    teams = Team.objects.in_bulk({pk for match in candidates for pk in (match.team_id, match.opponent_id)})
+    venues = Venue.objects.in_bulk({match.venue_id for match in candidates if match.venue_id})
+    match_list = [
+        {
+            'team': teams[match.team_id],
+            'opponent': teams[match.opponent_id],
+            'venue': venues.get(match.venue_id),
+            'starts_at': match.start,
+            'ends_at': match.end,
+            'score': match.score,
+        }
+        for match in candidates
+    ]
     return render(
         request,
-        'single_pages/about_site.html'
+        'single_pages/matches.html',
+        {
+            'team': team,
+            'match_list': match_list,
+        }
+    )
+
+def venue_schedule(request, pk):
+    # 구장의 한 주 예약 현황과 빈 시간. 로그인한 사용자는 POST로 예약함
+    venue = get_object_or_404(Venue, pk=pk)
+    try:
+        day = date.fromisoformat(request.GET.get('week', ''))
+    except ValueError:
+        day = timezone.now().date()
+    # 지난주/다음 주 링크를 만들 때 날짜 범위를 넘지 않도록 (예: ?week=0001-01-01)
+    day = min(max(day, date.min + timedelta(days=7)), date.max - timedelta(days=14))
+    start, end = week_range(day)
+
+    form = ReservationForm(user=request.user)
+    if request.method == 'POST':
+        if not request.user.is_authenticated:
+            raise PermissionDenied
+        form = ReservationForm(request.POST, user=request.user)
+        if form.is_valid():
+            try:
+                reserve(venue, **form.cleaned_data)
+                return redirect(f'/venues/{venue.pk}/?week={form.cleaned_data["starts_at"].date()}')
+            except ValidationError as e:
+                form.add_error(None, e)
+
+    return render(
+        request,
+        'single_pages/venue_schedule.html',
+        {
+            'venue': venue,
+            'week_start': start,
+            'previous_week': (start - timedelta(days=7)).date(),
+            'next_week': end.date(),
+            'reservation_list': overlapping(venue, start, end).select_related('team', 'opponent').order_by('starts_at'),
+            'free_slots': free_slots(venue, start, end),
+            'form': form,
+        }
     )